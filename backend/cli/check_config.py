@@ -0,0 +1,344 @@
+"""
+Configuration Validation Script
+
+Checks backend configuration and environment variables.
+
+Usage:
+    python -m backend.cli.check_config
+    python scripts/check_config.py
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Tuple
+
+# Project root (where .env / .env.backend live)
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Environment variables shown in the HuggingFace section
+HF_ENV_VARS = ("HF_HOME", "HF_HUB_CACHE", "HF_ENDPOINT", "MINERU_MODEL_SOURCE")
+
+# Providers that need an API key, per model section
+API_KEY_PROVIDERS = {
+    "llm": ("openai", "azure", "anthropic"),
+    "embedding": ("openai", "azure"),
+}
+
+
+def _is_local_gpu_embedding(config: Any) -> bool:
+    """Local GPU embedding providers may omit embedding_dim."""
+    embedding = config.embedding
+    return embedding.provider.value == "local_gpu" or (
+        embedding.provider.value == "local"
+        and embedding.base_url is None
+        and str(embedding.extra_params.get("device", "")).startswith("cuda")
+    )
+
+
+def _reranker_mode(config: Any) -> str:
+    """Return "api", "local_gpu", "local" or "disabled" for the reranker."""
+    reranker = config.reranker
+    if not (reranker and reranker.enabled):
+        return "disabled"
+    if reranker.provider == "api":
+        return "api"
+    if reranker.device and reranker.device.startswith("cuda"):
+        return "local_gpu"
+    return "local"
+
+
+def _missing_api_key(section: str) -> Callable[[Any], bool]:
+    """Rule predicate: ``section`` uses an API provider but has no key."""
+
+    def violated(config: Any) -> bool:
+        model = getattr(config, section)
+        return model.provider.value in API_KEY_PROVIDERS[section] and not model.api_key
+
+    return violated
+
+
+# Declarative validation rules: (severity, message, violated). A rule fires
+# when violated(config) is true; messages are formatted with ``config=``.
+VALIDATION_RULES: Tuple[Tuple[str, str, Callable[[Any], bool]], ...] = (
+    ("issue", "LLM model name not set", lambda c: not c.llm.model_name),
+    ("issue", "Embedding model name not set", lambda c: not c.embedding.model_name),
+    (
+        "issue",
+        "Embedding dimension not set",
+        lambda c: not _is_local_gpu_embedding(c) and not c.embedding.embedding_dim,
+    ),
+    (
+        "warning",
+        "LLM API key not set for {config.llm.provider.value}",
+        _missing_api_key("llm"),
+    ),
+    (
+        "warning",
+        "Embedding API key not set for {config.embedding.provider.value}",
+        _missing_api_key("embedding"),
+    ),
+    (
+        "warning",
+        "Reranker API key not set",
+        lambda c: _reranker_mode(c) == "api" and not c.reranker.api_key,
+    ),
+    (
+        "issue",
+        "Reranker model name not set",
+        lambda c: _reranker_mode(c) == "api" and not c.reranker.model_name,
+    ),
+    (
+        "issue",
+        "Local GPU reranker model name not set",
+        lambda c: _reranker_mode(c) == "local_gpu" and not c.reranker.model_name,
+    ),
+    (
+        "issue",
+        "Local reranker model path not set",
+        lambda c: _reranker_mode(c) == "local" and not c.reranker.model_path,
+    ),
+    (
+        "issue",
+        "Invalid parser: {config.parser}",
+        lambda c: c.parser not in ("mineru", "docling"),
+    ),
+)
+
+
+def validate_config(config: Any) -> Tuple[List[str], List[str]]:
+    """
+    Apply VALIDATION_RULES to a loaded BackendConfig.
+
+    Returns:
+        (issues, warnings) message lists, each in rule order
+    """
+    issues: List[str] = []
+    warnings: List[str] = []
+    for severity, message, violated in VALIDATION_RULES:
+        if violated(config):
+            target = issues if severity == "issue" else warnings
+            target.append(message.format(config=config))
+    return issues, warnings
+
+
+def load_env() -> bool:
+    """
+    Load environment from .env (preferred) or .env.backend (legacy).
+
+    Returns:
+        False if python-dotenv is not installed, True otherwise
+    """
+    if importlib.util.find_spec("dotenv") is None:
+        print("❌ python-dotenv is not installed (pip install python-dotenv)")
+        return False
+
+    from dotenv import load_dotenv
+
+    env_file = None
+    for env_name in (".env", ".env.backend"):
+        candidate = PROJECT_ROOT / env_name
+        if candidate.exists():
+            env_file = candidate
+            break
+
+    if env_file is not None:
+        load_dotenv(dotenv_path=env_file, override=False)
+        print(f"✓ Loaded environment from {env_file}\n")
+    else:
+        print("⚠ Warning: No .env or .env.backend found; using current environment\n")
+    return True
+
+
+def print_section(title: str, lines: Iterable[str] = ()):
+    """Print a section header followed by its body in a single write."""
+    bar = "=" * 60
+    sys.stdout.write("\n".join([f"\n{bar}", f"  {title}", bar, *lines]) + "\n")
+
+
+def check_config():
+    """Validate and display backend configuration."""
+    if not load_env():
+        return False
+
+    # Reason: imported here so --help/--version never pay for the backend import
+    from backend.config import BackendConfig
+
+    try:
+        config = BackendConfig.from_env()
+    except Exception as e:
+        print(f"❌ Error loading configuration: {e}")
+        return False
+
+    # LLM Configuration
+    print_section(
+        "LLM Configuration",
+        [
+            f"Provider:    {config.llm.provider.value}",
+            f"Model:       {config.llm.model_name}",
+            f"Base URL:    {config.llm.base_url or 'Default'}",
+            f"API Key:     {'Set' if config.llm.api_key else 'Not set'}",
+            f"Temperature: {config.llm.temperature}",
+            f"Max Tokens:  {config.llm.max_tokens or 'Default'}",
+        ],
+    )
+
+    # Embedding Configuration
+    print_section(
+        "Embedding Configuration",
+        [
+            f"Provider:    {config.embedding.provider.value}",
+            f"Model:       {config.embedding.model_name}",
+            f"Base URL:    {config.embedding.base_url or 'Default'}",
+            f"API Key:     {'Set' if config.embedding.api_key else 'Not set'}",
+            f"Dimension:   {config.embedding.embedding_dim}",
+        ],
+    )
+
+    # Vision Configuration
+    if config.vision:
+        lines = [
+            f"Provider:    {config.vision.provider.value}",
+            f"Model:       {config.vision.model_name}",
+            f"Base URL:    {config.vision.base_url or 'Default'}",
+            f"API Key:     {'Set' if config.vision.api_key else 'Not set'}",
+        ]
+    else:
+        lines = ["Not configured (optional)"]
+    print_section("Vision Configuration", lines)
+
+    # Reranker Configuration
+    if config.reranker and config.reranker.enabled:
+        lines = ["Enabled:     Yes", f"Provider:    {config.reranker.provider}"]
+
+        if config.reranker.provider == "api":
+            lines += [
+                f"Model:       {config.reranker.model_name or 'Not set'}",
+                f"Base URL:    {config.reranker.base_url or 'Auto-detected'}",
+                f"API Key:     {'Set' if config.reranker.api_key else 'Not set'}",
+                f"Batch Size:  {config.reranker.batch_size}",
+            ]
+        else:
+            # local CPU or local GPU (device=cuda:*)
+            lines += [
+                f"Model:       {config.reranker.model_name or 'Not set'}",
+                f"Model Path:  {config.reranker.model_path or 'Not set'}",
+                f"Device:      {config.reranker.device or 'cpu'}",
+                f"DType:       {config.reranker.dtype}",
+                f"Batch Size:  {config.reranker.batch_size}",
+                f"Max Length:  {config.reranker.max_length}",
+            ]
+    else:
+        lines = ["Disabled"]
+    print_section("Reranker Configuration", lines)
+
+    # Storage Configuration
+    print_section(
+        "Storage Configuration",
+        [
+            f"Working Dir: {config.working_dir}",
+            f"Upload Dir:  {config.upload_dir}",
+            "  ✓ Working directory exists"
+            if Path(config.working_dir).exists()
+            else "  ⚠ Working directory will be created on startup",
+            "  ✓ Upload directory exists"
+            if Path(config.upload_dir).exists()
+            else "  ⚠ Upload directory will be created on startup",
+        ],
+    )
+
+    # RAGAnything Configuration
+    print_section(
+        "RAGAnything Configuration",
+        [
+            f"Parser:              {config.parser}",
+            f"Image Processing:    {config.enable_image_processing}",
+            f"Table Processing:    {config.enable_table_processing}",
+            f"Equation Processing: {config.enable_equation_processing}",
+        ],
+    )
+
+    # API Server Configuration
+    print_section(
+        "API Server Configuration",
+        [
+            f"Host:         {config.host}",
+            f"Port:         {config.port}",
+            f"CORS Origins: {', '.join(config.cors_origins)}",
+        ],
+    )
+
+    # HuggingFace Environment
+    env = os.environ
+    lines = [
+        f"{name + ':':<20} {env.get(name) or 'Not set (will use default)'}"
+        for name in HF_ENV_VARS
+    ]
+    hf_home = env.get("HF_HOME")
+    if hf_home:
+        if Path(hf_home).exists():
+            lines.append("  ✓ HF_HOME directory exists")
+        else:
+            lines.append(f"  ⚠ HF_HOME directory does not exist: {hf_home}")
+    print_section("HuggingFace Environment", lines)
+
+    # Validation Summary
+    issues, warnings = validate_config(config)
+
+    # Print results
+    lines = []
+    if issues:
+        lines.append("\n❌ Critical Issues:")
+        lines.extend(f"  - {issue}" for issue in issues)
+
+    if warnings:
+        lines.append("\n⚠ Warnings:")
+        lines.extend(f"  - {warning}" for warning in warnings)
+
+    if not issues and not warnings:
+        lines.append("\n✓ Configuration is valid!")
+    elif not issues:
+        lines.append("\n⚠ Configuration has warnings but should work")
+    else:
+        lines.append("\n❌ Configuration has critical issues")
+    print_section("Validation Summary", lines)
+
+    return not issues
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Validate backend configuration and environment variables."
+    )
+    parser.add_argument(
+        "--version", action="store_true", help="Show backend version and exit"
+    )
+    args = parser.parse_args()
+
+    if args.version:
+        from backend import __version__
+
+        print(f"RAG-Anything backend {__version__}")
+        sys.exit(0)
+
+    print("RAG-Anything Configuration Checker")
+    print("=" * 60)
+
+    success = check_config()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("✓ Configuration check completed successfully")
+        sys.exit(0)
+    else:
+        print("❌ Configuration check failed")
+        print("\nPlease fix the issues above and try again.")
+        print("See docs/TROUBLESHOOTING.md for help.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
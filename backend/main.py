@@ -133,6 +133,14 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error shutting down RAG service: {e}", exc_info=True)
 
+    # Close the HTTP clients API rerankers share on this event loop
+    try:
+        from raganything.rerankers.api_reranker import APIReranker
+
+        await APIReranker.shutdown_all()
+    except Exception as e:
+        logger.error(f"Error closing API reranker clients: {e}", exc_info=True)
+
 
 # Create FastAPI app
 app = FastAPI(
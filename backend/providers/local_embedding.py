@@ -35,11 +35,16 @@ class BatchRequest:
         texts: List of texts to embed
         future: asyncio.Future to return the result
         timestamp: Request arrival time (for timeout calculation)
+        num_tokens: Cached token count (filled on first use when a token
+            budget is enabled, so deferred requests are not re-tokenized)
+        to_numpy: Return a host numpy array (True) or the on-device tensor
     """
 
     texts: List[str]
     future: asyncio.Future
     timestamp: float
+    num_tokens: Optional[int] = None
+    to_numpy: bool = True
 
 
 class BatchProcessor:
@@ -63,6 +68,7 @@ class BatchProcessor:
         device: str = "cuda:0",
         max_batch_tokens: Optional[int] = None,
         encode_batch_size: int = 128,
+        cuda_events: bool = False,
     ):
         """
         Initialize batch processor.
@@ -73,6 +79,8 @@ class BatchProcessor:
             max_wait_time: Maximum wait time in seconds (default: 0.1 = 100ms)
             device: Device for inference (e.g., "cuda:0")
             encode_batch_size: Batch size for sentence-transformers encode() (default: 128)
+            cuda_events: Time each encode() with CUDA events and accumulate the
+                device time in ``device_time_ms`` (default: False)
         """
         self.model = model
         self.max_batch_size = max_batch_size
@@ -80,6 +88,10 @@ class BatchProcessor:
         self.device = device
         self.max_batch_tokens = max_batch_tokens
         self.encode_batch_size = encode_batch_size
+        self.cuda_events = cuda_events
+
+        # Total GPU time spent in encode() (only updated when cuda_events=True)
+        self.device_time_ms = 0.0
 
         # Request queue (unbounded to avoid blocking)
         self.queue: asyncio.Queue[Optional[BatchRequest]] = asyncio.Queue()
@@ -145,15 +157,20 @@ class BatchProcessor:
 
         logger.info("BatchProcessor shutdown complete")
 
-    async def embed(self, texts: List[str]) -> np.ndarray:
+    async def embed(
+        self, texts: List[str], to_numpy: bool = True
+    ) -> Union[np.ndarray, torch.Tensor]:
         """
         Submit an embedding request and wait for the result.
 
         Args:
             texts: List of texts to embed
+            to_numpy: If False, return the on-device tensor and skip the
+                device-to-host copy
 
         Returns:
-            numpy array of embeddings with shape (len(texts), embedding_dim)
+            numpy array (or tensor) of embeddings with shape
+            (len(texts), embedding_dim)
 
         Raises:
             RuntimeError: If embedding generation fails
@@ -173,7 +190,9 @@ class BatchProcessor:
         future: asyncio.Future = loop.create_future()
 
         # Create batch request
-        request = BatchRequest(texts=texts, future=future, timestamp=time.time())
+        request = BatchRequest(
+            texts=texts, future=future, timestamp=time.time(), to_numpy=to_numpy
+        )
 
         # Add to queue
         await self.queue.put(request)
@@ -370,15 +389,34 @@ class BatchProcessor:
 
             # Perform batch inference in thread pool to avoid blocking event loop
             loop = asyncio.get_event_loop()
-            all_embeddings = await loop.run_in_executor(
-                None, self._encode_sync, all_texts
-            )
+            device_requested = any(not request.to_numpy for request in batch)
+            if not device_requested:
+                all_embeddings = await loop.run_in_executor(
+                    None, self._encode_sync, all_texts
+                )
+                device_embeddings = None
+            else:
+                # Reason: keep the tensor on device for callers that asked for
+                # it; copy to host only if some request in the batch needs numpy.
+                device_embeddings = await loop.run_in_executor(
+                    None, self._encode_sync, all_texts, False
+                )
+                all_embeddings = (
+                    await loop.run_in_executor(
+                        None, self._tensor_to_numpy, device_embeddings
+                    )
+                    if any(request.to_numpy for request in batch)
+                    else None
+                )
 
             # Distribute results to individual futures
             for request, (start, end) in zip(batch, request_indices):
                 try:
                     # Extract embeddings for this request
-                    result = all_embeddings[start:end]
+                    if request.to_numpy:
+                        result = all_embeddings[start:end]
+                    else:
+                        result = device_embeddings[start:end]
 
                     # Set result on the future
                     request.future.set_result(result)
@@ -402,17 +440,26 @@ class BatchProcessor:
                         RuntimeError(f"Batch embedding generation failed: {e}")
                     )
 
-    def _encode_sync(self, texts: List[str]) -> np.ndarray:
+    def _encode_sync(
+        self, texts: List[str], to_numpy: bool = True
+    ) -> Union[np.ndarray, torch.Tensor]:
         """
         Synchronous encoding method for thread pool execution.
 
         Args:
             texts: List of texts to embed
+            to_numpy: If False, return the on-device tensor without copying
 
         Returns:
-            numpy array of embeddings
+            numpy array of embeddings (or the device tensor)
         """
         with torch.no_grad():
+            if self.cuda_events:
+                start_event = torch.cuda.Event(enable_timing=True)
+                end_event = torch.cuda.Event(enable_timing=True)
+                stream = torch.cuda.current_stream(self.device)
+                start_event.record(stream)
+
             # Encode texts to tensor
             embeddings_tensor = self.model.encode(
                 texts,
@@ -421,10 +468,24 @@ class BatchProcessor:
                 batch_size=self.encode_batch_size,  # Use configurable batch size
             )
 
-            # Convert to numpy
-            embeddings_np = embeddings_tensor.cpu().numpy()
+            if self.cuda_events:
+                end_event.record(stream)
+                end_event.synchronize()
+                self.device_time_ms += start_event.elapsed_time(end_event)
+
+            if not to_numpy:
+                return embeddings_tensor
 
-            return embeddings_np.astype(np.float32)
+            return self._tensor_to_numpy(embeddings_tensor)
+
+    @staticmethod
+    def _tensor_to_numpy(embeddings_tensor) -> np.ndarray:
+        """Copy an embeddings tensor to a float32 host array.
+
+        Upcasts on device first: numpy has no bfloat16 type, so calling
+        ``.numpy()`` on a bf16 tensor raises.
+        """
+        return embeddings_tensor.to(torch.float32).cpu().numpy()
 
     # -------------------------
     # Token counting utilities
@@ -433,9 +494,12 @@ class BatchProcessor:
         """
         Estimate token count for all texts in a request using the model tokenizer.
 
-        Falls back to character count if tokenizer is not available.
+        Falls back to character count if tokenizer is not available. The
+        result is cached on the request.
         """
-        return self._count_texts_tokens(request.texts)
+        if request.num_tokens is None:
+            request.num_tokens = self._count_texts_tokens(request.texts)
+        return request.num_tokens
 
     def _count_texts_tokens(self, texts: List[str]) -> int:
         try:
@@ -478,7 +542,15 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
         attn_impl = config.extra_params.get("attn_implementation", "sdpa")
 
         # Convert dtype string to torch dtype
-        self.dtype = torch.float16 if dtype_str == "float16" else torch.float32
+        if dtype_str == "float16":
+            self.dtype = torch.float16
+        elif dtype_str == "bfloat16":
+            self.dtype = torch.bfloat16
+        else:
+            self.dtype = torch.float32
+
+        # Optional 8-bit weights (requires bitsandbytes); compute stays in self.dtype
+        load_in_8bit = bool(config.extra_params.get("load_in_8bit", False))
 
         logger.info(
             f"Loading local embedding model: {self.model_name} "
@@ -493,6 +565,12 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
                 "attn_implementation": attn_impl,
                 "trust_remote_code": True,
             }
+            if load_in_8bit:
+                from transformers import BitsAndBytesConfig
+
+                model_kwargs["quantization_config"] = BitsAndBytesConfig(
+                    load_in_8bit=True
+                )
 
             # Get model path from config or use model_name for HF download
             model_path = config.extra_params.get("model_path", self.model_name)
@@ -525,8 +603,8 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
                     f"Configured embedding_dim ({self._embedding_dim}) does not match model dimension ({model_dim})"
                 )
 
-            # Verify model dtype
-            if hasattr(self.model, "_first_module"):
+            # Verify model dtype (8-bit weights legitimately differ)
+            if hasattr(self.model, "_first_module") and not load_in_8bit:
                 actual_dtype = next(self.model._first_module().parameters()).dtype
                 if actual_dtype != self.dtype:
                     logger.warning(
@@ -560,6 +638,7 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
                 device=self.device,
                 max_batch_tokens=config.extra_params.get("max_batch_tokens"),
                 encode_batch_size=encode_batch_size,
+                cuda_events=bool(config.extra_params.get("cuda_events", False)),
             )
 
             # Start background processing task
@@ -574,7 +653,9 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
             logger.error(f"Failed to load local embedding model: {e}")
             raise RuntimeError(f"Failed to load local embedding model: {e}") from e
 
-    async def embed(self, texts: List[str], **kwargs) -> np.ndarray:
+    async def embed(
+        self, texts: List[str], to_numpy: bool = True, **kwargs
+    ) -> Union[np.ndarray, torch.Tensor]:
         """
         Generate embeddings for input texts using dynamic batching.
 
@@ -583,10 +664,13 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
 
         Args:
             texts: List of texts to embed
+            to_numpy: If False, return the on-device ``torch.Tensor`` so
+                callers that only inspect shape/dtype avoid a host copy
             **kwargs: Additional parameters (ignored for now)
 
         Returns:
-            numpy array of embeddings with shape (len(texts), embedding_dim)
+            numpy array (or tensor) of embeddings with shape
+            (len(texts), embedding_dim)
 
         Raises:
             RuntimeError: If embedding generation fails
@@ -596,7 +680,7 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
 
         try:
             # Submit request to batch processor
-            embeddings = await self.batch_processor.embed(texts)
+            embeddings = await self.batch_processor.embed(texts, to_numpy=to_numpy)
             return embeddings
 
         except Exception as e:
@@ -1328,8 +1412,7 @@ class MultimodalEmbeddingProvider(BaseEmbeddingProvider):
         """
         with torch.no_grad():
             embeddings_tensor = self._forward(**inputs)
-            embeddings_np = embeddings_tensor.cpu().numpy()
-            return embeddings_np.astype(np.float32)
+            return embeddings_tensor.to(torch.float32).cpu().numpy()
 
     @property
     def embedding_dim(self) -> int:
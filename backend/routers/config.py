@@ -12,11 +12,14 @@ from typing import Any, Optional
 from fastapi import APIRouter, Request, HTTPException, status
 from dotenv import load_dotenv
 
+from raganything.config import clear_env_cache
+
 from backend.config import BackendConfig, ModelConfig
 from backend.services.rag_service import RAGService
 from backend.services.background_indexer import BackgroundIndexer
 from backend.services.model_factory import ModelFactory
 from backend.utils.env_file import choose_env_file, update_env_file
+from backend.utils.http_cache import etag_json_response, get_response_cache
 from backend.utils.torch_runtime import ensure_torch_cuda_libs
 from backend.models.config import (
     ConfigReloadRequest,
@@ -356,6 +359,9 @@ async def _apply_config(
         state.config = new_config
         state.rag_service = old_rag_service
 
+    # Cached graph stats / processed documents came from the previous service.
+    get_response_cache(request).invalidate()
+
     # Restart background indexer if enabled
     if getattr(new_config, "auto_indexing_enabled", False):
         index_status_service = getattr(state, "index_status_service", None)
@@ -456,6 +462,7 @@ async def reload_configuration(
                 # Reload environment file
                 if config_file.endswith(".env") or ".env." in config_file:
                     load_dotenv(dotenv_path=config_path, override=True)
+                    clear_env_cache()
                     reloaded_files.append(config_file)
                     logger.info(f"Reloaded environment file: {config_file}")
 
@@ -658,7 +665,9 @@ async def get_current_config(request: Request):
                 "base_url": getattr(config.reranker, "base_url", None),
             }
 
-        return response
+        # Reason: the Settings modal refetches on every open; an ETag lets
+        # unchanged config revalidate as a bodyless 304.
+        return etag_json_response(request, response)
 
     except Exception as e:
         logger.error(f"Failed to get current config: {e}", exc_info=True)
@@ -1075,6 +1084,7 @@ async def update_models_config(request: Request, update: ModelsUpdateRequest):
 
         # Ensure os.environ matches persisted file (handles quoting/escaping)
         load_dotenv(dotenv_path=env_path, override=True)
+        clear_env_cache()
 
         reloaded_components: list[str] = []
         applied = False
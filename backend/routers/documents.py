@@ -2,15 +2,18 @@
 Document management endpoints.
 """
 
+import asyncio
+import json
 import logging
 import os
 import shutil
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Any, AsyncIterator, List
 
 from fastapi import APIRouter, Request, UploadFile, File, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from backend.models.document import (
     DocumentUploadResponse,
@@ -31,7 +34,8 @@ from backend.models.index_status import (
     ReindexRequest,
     ReindexResponse,
 )
-from backend.services.file_scanner import compute_file_hash
+from backend.services.file_scanner import compute_file_hash, save_upload_stream
+from backend.utils.http_cache import cached_json_response, get_response_cache
 
 
 router = APIRouter()
@@ -65,12 +69,9 @@ async def upload_document(
                 detail=f"File '{file.filename}' already exists",
             )
 
-        # Save file
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-
-        file_size = file_path.stat().st_size
+        # Save file (streamed in chunks; hash computed in the same pass)
+        file_hash, file_size = await save_upload_stream(file, file_path)
+        get_response_cache(request).invalidate()
 
         logger.info(f"Uploaded file: {file.filename} ({file_size} bytes)")
 
@@ -78,7 +79,6 @@ async def upload_document(
         # Reason: Track uploaded files for background indexing, but don't fail upload if status creation fails
         try:
             relative_path = str(file_path.relative_to(upload_dir))
-            file_hash = compute_file_hash(str(file_path))
             last_modified = datetime.fromtimestamp(file_path.stat().st_mtime)
 
             index_status = IndexStatus(
@@ -140,6 +140,7 @@ async def process_document(request: Request, req: DocumentProcessRequest):
             output_dir=req.output_dir,
             parse_method=req.parse_method,
         )
+        get_response_cache(request).invalidate()
 
         # Defensive: Update IndexStatus to INDEXED after successful processing
         # Reason: Track processing completion, but don't fail request if status update fails
@@ -223,9 +224,8 @@ async def upload_and_process_document(
 
         file_path = upload_dir / file.filename
 
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        file_hash, file_size = await save_upload_stream(file, file_path)
+        get_response_cache(request).invalidate()
 
         logger.info(f"Uploaded and processing file: {file.filename}")
 
@@ -234,14 +234,13 @@ async def upload_and_process_document(
             file_path=str(file_path),
             parse_method=parse_method,
         )
+        get_response_cache(request).invalidate()
 
         # Defensive: Create IndexStatus record (status=INDEXED) after successful processing
         # Reason: Track processed files, but don't fail request if status creation fails
         if result.get("status") == "success":
             try:
                 relative_path = str(file_path.relative_to(upload_dir))
-                file_hash = compute_file_hash(str(file_path))
-                file_size = file_path.stat().st_size
                 last_modified = datetime.fromtimestamp(file_path.stat().st_mtime)
 
                 index_status = IndexStatus(
@@ -304,6 +303,7 @@ async def batch_process_documents(request: Request, req: BatchProcessRequest):
             max_workers=req.max_workers,
             parse_method=req.parse_method,
         )
+        get_response_cache(request).invalidate()
 
         # TODO: Track individual file results
         # For now, return summary
@@ -480,10 +480,16 @@ async def list_processed_documents(request: Request):
     List all RAG-processed documents with metadata.
 
     Returns information about documents that have been processed and indexed
-    in the RAG knowledge base.
+    in the RAG knowledge base. Results are cached for a couple of seconds and
+    served with an ETag, since listing walks the upload directory.
     """
     state = request.app.state
+    return await cached_json_response(
+        request, lambda: _collect_processed_documents(state)
+    )
+
 
+async def _collect_processed_documents(state: Any) -> dict[str, Any]:
     try:
         # Get RAG instance
         rag = await state.rag_service.get_rag_instance()
@@ -619,6 +625,7 @@ async def delete_document(request: Request, filename: str):
 
         # Move file to trash
         shutil.move(str(original_file_path), str(trash_file_path))
+        get_response_cache(request).invalidate()
 
         logger.info(f"Moved file to trash: {safe_filename} -> {trash_filename}")
 
@@ -690,6 +697,69 @@ async def get_index_status(request: Request):
         )
 
 
+# Reason: the Documents view used to poll /index-status every 10s. Pushing
+# snapshots over SSE only when they change removes that request churn while
+# keeping the polling endpoint as a fallback for clients without EventSource.
+INDEX_STATUS_EVENT_INTERVAL = 2.0
+INDEX_STATUS_KEEPALIVE_INTERVAL = 15.0
+
+
+def _index_status_snapshot(state: Any) -> str:
+    """Serialize all index statuses exactly like ``GET /index-status``."""
+    payload = [
+        IndexStatusResponse(
+            file_path=record.file_path,
+            file_hash=record.file_hash,
+            status=record.status,
+            indexed_at=record.indexed_at,
+            error_message=record.error_message,
+            file_size=record.file_size,
+            last_modified=record.last_modified,
+        ).model_dump(mode="json")
+        for record in state.index_status_service.list_all_status()
+    ]
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+@router.get("/index-status/events")
+async def stream_index_status(request: Request) -> StreamingResponse:
+    """
+    Stream index status changes as Server-Sent Events.
+
+    Emits the full status list (same schema as ``GET /index-status``) as a
+    ``data:`` event on connect and again whenever it changes. A comment line
+    is sent periodically so proxies keep the connection open.
+    """
+    state = request.app.state
+
+    async def _events() -> AsyncIterator[str]:
+        last_snapshot: str | None = None
+        last_sent = time.monotonic()
+        while not await request.is_disconnected():
+            try:
+                snapshot = await asyncio.to_thread(_index_status_snapshot, state)
+            except Exception as e:
+                logger.warning(f"Failed to snapshot index status: {e}")
+                snapshot = None
+
+            now = time.monotonic()
+            if snapshot is not None and snapshot != last_snapshot:
+                last_snapshot = snapshot
+                last_sent = now
+                yield f"data: {snapshot}\n\n"
+            elif now - last_sent >= INDEX_STATUS_KEEPALIVE_INTERVAL:
+                last_sent = now
+                yield ": ping\n\n"
+
+            await asyncio.sleep(INDEX_STATUS_EVENT_INTERVAL)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/trigger-index", response_model=TriggerIndexResponse)
 async def trigger_index(request: Request):
     """
@@ -716,6 +786,7 @@ async def trigger_index(request: Request):
         # Scan upload directory and update status
         # Reason: This is fast (just file scanning and DB updates), safe to await
         await indexer.scan_and_update_status()
+        get_response_cache(request).invalidate()
 
         # Get all statuses to count by status
         all_statuses = state.index_status_service.list_all_status()
@@ -865,6 +936,8 @@ async def reindex_documents(request: Request, req: ReindexRequest):
                 files_marked += 1
                 logger.info(f"Marked for re-indexing: {status_record.file_path}")
 
+        get_response_cache(request).invalidate()
+
         # Trigger background processing if any files were marked
         if files_marked > 0:
             import asyncio
@@ -9,6 +9,7 @@ from typing import Any
 from fastapi import APIRouter, Request, HTTPException, status, Query
 
 from backend.models.graph import GraphDataResponse, GraphNode, GraphEdge
+from backend.utils.http_cache import cached_json_response
 
 
 router = APIRouter()
@@ -223,10 +224,15 @@ async def get_graph_stats(request: Request):
     """
     Get knowledge graph statistics without full data.
 
-    Returns summary statistics about the knowledge graph.
+    Returns summary statistics about the knowledge graph. Results are cached
+    for a couple of seconds and served with an ETag, since counting scans
+    the full entity/relation storages.
     """
     state = request.app.state
+    return await cached_json_response(request, lambda: _compute_graph_stats(state))
 
+
+async def _compute_graph_stats(state: Any) -> dict[str, Any]:
     try:
         rag = await state.rag_service.get_rag_instance()
 
@@ -11,7 +11,7 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Any, List, Tuple
 
 
 logger = logging.getLogger(__name__)
@@ -75,6 +75,34 @@ def compute_file_hash(file_path: Path) -> str:
         raise
 
 
+async def save_upload_stream(
+    upload: Any, dest_path: Path, chunk_size: int = 1 << 20
+) -> Tuple[str, int]:
+    """
+    Stream an uploaded file to disk while hashing it.
+
+    Copies ``upload`` in ``chunk_size`` pieces so memory stays O(chunk_size)
+    regardless of file size, and computes the same MD5 as ``compute_file_hash``
+    in the same pass so callers don't need to re-read the saved file.
+
+    Args:
+        upload: Object with an async ``read(size)`` method (e.g. FastAPI UploadFile)
+        dest_path: Destination file path
+        chunk_size: Bytes per read (default 1 MiB)
+
+    Returns:
+        Tuple of (MD5 hash as hexadecimal string, bytes written)
+    """
+    md5_hash = hashlib.md5()
+    size = 0
+    with open(dest_path, "wb") as f:
+        while chunk := await upload.read(chunk_size):
+            md5_hash.update(chunk)
+            f.write(chunk)
+            size += len(chunk)
+    return md5_hash.hexdigest(), size
+
+
 def get_file_metadata(file_path: Path, upload_dir: Path) -> FileMetadata:
     """
     Extract metadata for a single file.
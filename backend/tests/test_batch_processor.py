@@ -45,6 +45,7 @@ if "torch" not in sys.modules:
     # dtypes
     torch_mod.float16 = "float16"
     torch_mod.float32 = "float32"
+    torch_mod.bfloat16 = "bfloat16"
 
     class _NoGrad:
         def __enter__(self):
@@ -85,14 +86,18 @@ if "PIL" not in sys.modules:
     sys.modules["PIL"] = pil_mod
     sys.modules["PIL.Image"] = pil_image_mod
 
+import torch
+
 from backend.providers.local_embedding import BatchProcessor
 
 
 class MockSentenceTransformer:
     """A lightweight mock of SentenceTransformer for unit tests."""
 
-    def __init__(self, embedding_dim: int = 8):
+    def __init__(self, embedding_dim: int = 8, tensor_dtype=None):
         self.embedding_dim = embedding_dim
+        # dtype reported by returned tensors; numpy() refuses bfloat16 like torch
+        self.tensor_dtype = tensor_dtype if tensor_dtype is not None else torch.float32
         self.encode_call_sizes = []  # record number of texts per encode call
         self.tokenize_call_sizes = []
 
@@ -108,16 +113,29 @@ class MockSentenceTransformer:
         )
 
         class _MockTensor:
-            def __init__(self, a):
+            def __init__(self, a, dtype):
                 self._a = a
+                self.dtype = dtype
 
             def cpu(self):
                 return self
 
+            def to(self, dtype):
+                return _MockTensor(self._a, dtype)
+
             def numpy(self):
+                if self.dtype == torch.bfloat16:
+                    raise TypeError("Got unsupported ScalarType BFloat16")
                 return self._a
 
-        return _MockTensor(arr)
+            def __getitem__(self, idx):
+                return _MockTensor(self._a[idx], self.dtype)
+
+            @property
+            def shape(self):
+                return self._a.shape
+
+        return _MockTensor(arr, self.tensor_dtype)
 
     # Mimic sentence-transformers' tokenize API
     def tokenize(self, texts):
@@ -196,6 +214,40 @@ async def test_multi_text_request_roundtrips():
     await processor.shutdown()
 
 
+@pytest.mark.asyncio
+async def test_to_numpy_false_returns_device_tensor_in_mixed_batch():
+    model = MockSentenceTransformer(embedding_dim=4)
+    processor = BatchProcessor(model=model, max_batch_size=2, max_wait_time=0.2)
+    processor.start()
+
+    r_np = asyncio.create_task(processor.embed(["a"]))
+    r_dev = asyncio.create_task(processor.embed(["b", "c"], to_numpy=False))
+    res_np, res_dev = await asyncio.gather(r_np, r_dev)
+
+    # Both requests shared one encode call
+    assert model.encode_call_sizes == [3]
+    assert isinstance(res_np, np.ndarray)
+    assert not isinstance(res_dev, np.ndarray)
+    assert res_dev.shape == (2, 4)
+    np.testing.assert_array_equal(res_dev.cpu().numpy(), np.arange(4, 12).reshape(2, 4))
+
+    await processor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_bfloat16_embeddings_upcast_before_numpy():
+    model = MockSentenceTransformer(embedding_dim=4, tensor_dtype=torch.bfloat16)
+    processor = BatchProcessor(model=model, max_batch_size=4, max_wait_time=0.05)
+    processor.start()
+
+    res = await processor.embed(["a", "b"])
+    assert isinstance(res, np.ndarray)
+    assert res.dtype == np.float32
+    np.testing.assert_array_equal(res, np.arange(8).reshape(2, 4))
+
+    await processor.shutdown()
+
+
 @pytest.mark.asyncio
 async def test_shutdown_is_graceful():
     model = MockSentenceTransformer()
@@ -0,0 +1,85 @@
+"""
+Tests for Document API Router (/api/documents).
+
+`/processed` is served through the short-lived response cache, so every endpoint
+that changes documents must invalidate it; otherwise the UI's refetch right
+after an upload or delete shows the previous list.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers.documents import router
+
+
+class DocStatusStorage:
+    """Reports every uploaded file as processed."""
+
+    async def get_by_id(self, doc_id: str) -> dict[str, Any]:
+        return {"file_path": doc_id.removeprefix("doc-pre-"), "status": "processed"}
+
+
+class MockRAGService:
+    def __init__(self, rag_instance: Any):
+        self._rag_instance = rag_instance
+
+    async def get_rag_instance(self):
+        return self._rag_instance
+
+    async def process_document(self, **kwargs: Any) -> dict[str, Any]:
+        return {"status": "success", "message": "ok", "file_path": kwargs["file_path"]}
+
+
+class MockIndexStatusService:
+    def upsert_status(self, status: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def client(tmp_path) -> TestClient:
+    lightrag = SimpleNamespace(
+        doc_status=DocStatusStorage(), working_dir=str(tmp_path / "rag_storage")
+    )
+    app = FastAPI()
+    app.state.config = SimpleNamespace(upload_dir=str(tmp_path / "uploads"))
+    app.state.rag_service = MockRAGService(SimpleNamespace(lightrag=lightrag))
+    app.state.index_status_service = MockIndexStatusService()
+    app.include_router(router, prefix="/api/documents")
+    return TestClient(app)
+
+
+def _processed_files(client: TestClient) -> list[str]:
+    resp = client.get("/api/documents/processed")
+    assert resp.status_code == 200
+    return [doc["file_path"] for doc in resp.json()["documents"]]
+
+
+def test_upload_then_list_shows_new_document(client: TestClient):
+    assert _processed_files(client) == []
+
+    resp = client.post(
+        "/api/documents/upload", files={"file": ("a.txt", b"hello", "text/plain")}
+    )
+    assert resp.status_code == 200
+
+    assert _processed_files(client) == ["a.txt"]
+
+
+def test_upload_and_process_then_delete_refreshes_list(client: TestClient):
+    resp = client.post(
+        "/api/documents/upload-and-process",
+        files={"file": ("b.txt", b"hello", "text/plain")},
+    )
+    assert resp.status_code == 200
+    assert _processed_files(client) == ["b.txt"]
+
+    resp = client.delete("/api/documents/delete/b.txt")
+    assert resp.status_code == 200
+
+    assert _processed_files(client) == []
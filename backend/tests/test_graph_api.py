@@ -156,6 +156,17 @@ def test_graph_stats_works_with_legacy_kv_api(client: TestClient):
     assert data["working_dir"] == "/tmp/rag_storage"
 
 
+def test_graph_stats_revalidates_with_etag(client: TestClient):
+    first = client.get("/api/graph/stats")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    resp = client.get("/api/graph/stats", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert resp.content == b""
+
+
 def test_graph_data_works_with_modern_get_all_kv_api(tmp_path):
     kg = MockKG(
         nodes={
@@ -0,0 +1,502 @@
+"""
+Tests for raganything.clients.ollama.OllamaClient.
+
+The client is exercised against a small in-process HTTP stub of the Ollama REST
+API, so both the pooled sync transport and the aiohttp transport run for real.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+import numpy as np
+import pytest
+
+from raganything.clients.ollama import (
+    OllamaClient,
+    OllamaClientError,
+    _CircuitBreaker,
+)
+
+
+def _vector(text: str) -> list[float]:
+    return [float(len(text)), 1.0]
+
+
+class OllamaStub:
+    """Threaded HTTP server answering ``/api/embed`` and ``/api/chat``.
+
+    ``handler`` may be replaced per test; it receives ``(path, body)`` and returns
+    ``(status, payload)``. A list payload is streamed one bytes chunk at a time,
+    ``chunk_delay`` seconds apart. Every request is recorded in ``requests``.
+    """
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, dict]] = []
+        self.handler: Callable[[str, dict], tuple[int, Any]] = self.default_handler
+        self.chunk_delay = 0.0
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                stub.requests.append((self.path, body))
+                status, payload = stub.handler(self.path, body)
+                if isinstance(payload, list):
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.send_header("Content-Length", str(sum(map(len, payload))))
+                    self.end_headers()
+                    for chunk in payload:
+                        time.sleep(stub.chunk_delay)
+                        self.wfile.write(chunk)
+                        self.wfile.flush()
+                    return
+                raw = payload if isinstance(payload, bytes) else json.dumps(payload)
+                raw = raw.encode() if isinstance(raw, str) else raw
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.01,), daemon=True
+        )
+        self._thread.start()
+
+    @staticmethod
+    def default_handler(path: str, body: dict) -> tuple[int, Any]:
+        if path == "/api/embed":
+            return 200, {"embeddings": [_vector(text) for text in body["input"]]}
+        if path == "/api/chat":
+            return 200, {
+                "message": {"content": "echo:" + body["messages"][-1]["content"]}
+            }
+        return 404, {"error": "not found"}
+
+    def embed_sizes(self) -> list[int]:
+        return [
+            len(body["input"]) for path, body in self.requests if path == "/api/embed"
+        ]
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = OllamaStub()
+    yield server
+    server.stop()
+
+
+def _client(stub: OllamaStub, **kwargs: Any) -> OllamaClient:
+    kwargs.setdefault("backoff_factor", 0)
+    return OllamaClient(stub.url, **kwargs)
+
+
+class TestCircuitBreaker:
+    """open -> half-open -> closed transitions of the shared breaker."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("raganything.clients.ollama.time.monotonic", lambda: now[0])
+        return now
+
+    def test_opens_after_threshold(self, clock):
+        breaker = _CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        breaker.record_failure()
+        breaker.check()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(OllamaClientError, match="circuit breaker open"):
+            breaker.check()
+
+    def test_half_open_admits_a_single_trial(self, clock):
+        breaker = _CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record_failure()
+        clock[0] += 10
+        breaker.check()
+        assert breaker.state == "half_open"
+        with pytest.raises(OllamaClientError, match="half-open"):
+            breaker.check()
+
+    def test_trial_success_closes(self, clock):
+        breaker = _CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record_failure()
+        clock[0] += 10
+        breaker.check()
+        breaker.record_success()
+        assert breaker.state == "closed"
+        breaker.check()
+        breaker.check()
+
+    def test_trial_failure_reopens(self, clock):
+        breaker = _CircuitBreaker(failure_threshold=3, reset_timeout=10)
+        for _ in range(3):
+            breaker.record_failure()
+        clock[0] += 10
+        breaker.check()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(OllamaClientError, match="circuit breaker open"):
+            breaker.check()
+
+    def test_released_trial_lets_next_caller_probe(self, clock):
+        breaker = _CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record_failure()
+        clock[0] += 10
+        breaker.check()
+        breaker.release()
+        breaker.check()
+        assert breaker.trial_in_flight
+
+    def test_client_recovers_through_half_open(self, stub):
+        healthy = threading.Event()
+
+        def handler(path: str, body: dict) -> tuple[int, Any]:
+            if not healthy.is_set():
+                return 503, {"error": "loading"}
+            return OllamaStub.default_handler(path, body)
+
+        stub.handler = handler
+        client = _client(
+            stub, max_retries=0, breaker_failure_threshold=2, breaker_reset_timeout=0
+        )
+        for _ in range(2):
+            with pytest.raises(OllamaClientError, match="HTTP 503"):
+                client.chat("hi", model="m")
+        assert client._breaker.state == "open"
+
+        healthy.set()
+        assert client.chat("hi", model="m") == "echo:hi"
+        assert client._breaker.state == "closed"
+
+
+def _reject_batches_over(limit: int) -> Callable[[str, dict], tuple[int, Any]]:
+    def handler(path: str, body: dict) -> tuple[int, Any]:
+        if path == "/api/embed" and len(body["input"]) > limit:
+            return 500, {"error": "out of memory"}
+        return OllamaStub.default_handler(path, body)
+
+    return handler
+
+
+class TestAdaptiveSplit:
+    """Batches answered with 5xx are halved without tripping the breaker."""
+
+    TEXTS = [f"text-{i:02d}" + "x" * i for i in range(16)]
+
+    def test_sync_split_keeps_breaker_closed(self, stub):
+        stub.handler = _reject_batches_over(4)
+        client = _client(stub, embed_batch_size=16, embed_cache_size=0)
+
+        matrix = client.embed(self.TEXTS, model="m")
+
+        assert matrix.tolist() == [_vector(text) for text in self.TEXTS]
+        assert stub.embed_sizes() == [16, 8, 4, 4, 8, 4, 4]
+        assert client._breaker.state == "closed"
+        assert client.chat("still up", model="m") == "echo:still up"
+
+    def test_async_split_keeps_breaker_closed(self, stub):
+        stub.handler = _reject_batches_over(4)
+        client = _client(stub, embed_batch_size=16, embed_cache_size=0)
+
+        async def run():
+            try:
+                return await client.aembed(self.TEXTS, model="m")
+            finally:
+                await client.aclose()
+
+        matrix = asyncio.run(run())
+
+        assert matrix.tolist() == [_vector(text) for text in self.TEXTS]
+        assert stub.embed_sizes() == [16, 8, 4, 4, 8, 4, 4]
+        assert client._breaker.state == "closed"
+
+    def test_single_text_failures_still_open_breaker(self, stub):
+        stub.handler = _reject_batches_over(0)
+        client = _client(
+            stub, embed_batch_size=4, embed_cache_size=0, breaker_failure_threshold=3
+        )
+
+        with pytest.raises(OllamaClientError):
+            client.embed(self.TEXTS[:4], model="m")
+
+        assert client._breaker.state == "open"
+        # 4 -> 2 -> 1: the lone text is retried (max_retries=2) and opens the breaker.
+        assert stub.embed_sizes() == [4, 2, 1, 1, 1]
+
+
+class TestMalformedEmbeddings:
+    @pytest.mark.parametrize(
+        "rows, expected",
+        [
+            (
+                [[0.1, 0.2], None],
+                r"1 malformed embeddings \(not a list at batch indices \[1\]\)",
+            ),
+            ([[0.1, 0.2], 0.5], r"not a list at batch indices \[1\]"),
+            ([3, 4], r"not a list at batch indices \[0, 1\]"),
+            (
+                [[0.1, 0.2], [], [0.1, "a"], [0.1, 0.2, 0.3], [0.3, 0.4]],
+                r"empty at batch indices \[1\]; non-numeric at batch indices \[2\]; "
+                r"dimension != 2 at batch indices \[3\]",
+            ),
+        ],
+    )
+    def test_every_bad_row_is_reported(self, rows, expected):
+        client = OllamaClient("http://127.0.0.1:9")
+        batch = [f"t{i}" for i in range(len(rows))]
+        with pytest.raises(OllamaClientError, match=expected):
+            client._parse_embed(rows, batch)
+
+    def test_null_row_from_server(self, stub):
+        stub.handler = lambda path, body: (200, {"embeddings": [[0.1, 0.2], None]})
+        client = _client(stub, embed_cache_size=0)
+        with pytest.raises(OllamaClientError, match="not a list"):
+            client.embed(["a", "b"], model="m")
+
+
+class TestAsyncSessions:
+    def test_session_closed_when_its_loop_shuts_down(self, stub, caplog):
+        client = _client(stub, embed_cache_size=0)
+        sessions = []
+
+        async def run(text: str):
+            matrix = await client.aembed([text], model="m")
+            sessions.append(client._sessions[asyncio.get_running_loop()][0])
+            return matrix
+
+        for text in ("first", "second"):
+            assert asyncio.run(run(text)).tolist() == [_vector(text)]
+        gc.collect()
+
+        assert len(sessions) == 2 and sessions[0] is not sessions[1]
+        assert all(session.closed for session in sessions)
+        assert "Unclosed" not in caplog.text
+
+    def test_session_reused_within_a_loop(self, stub):
+        client = _client(stub, embed_cache_size=0)
+
+        async def run():
+            first = await client._get_session()
+            await client.achat("hi", model="m")
+            second = await client._get_session()
+            await client.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first is second and first.closed
+
+
+def _ndjson(*chunks: dict) -> bytes:
+    return b"".join(json.dumps(chunk).encode() + b"\n" for chunk in chunks)
+
+
+class TestEmbed:
+    TEXTS = [f"doc {i} " + "w" * i for i in range(10)]
+
+    def test_batches_preserve_order(self, stub):
+        client = _client(stub, embed_batch_size=4, embed_cache_size=0)
+        matrix = client.embed(self.TEXTS, model="m")
+
+        assert matrix.dtype == np.float32
+        assert matrix.tolist() == [_vector(text) for text in self.TEXTS]
+        assert sorted(stub.embed_sizes()) == [2, 4, 4]
+
+    def test_async_batches_preserve_order(self, stub):
+        client = _client(stub, embed_batch_size=4, embed_cache_size=0)
+        matrix = asyncio.run(client.aembed(self.TEXTS, model="m"))
+
+        assert matrix.tolist() == [_vector(text) for text in self.TEXTS]
+        assert sorted(stub.embed_sizes()) == [2, 4, 4]
+
+    def test_empty_input(self, stub):
+        assert _client(stub).embed([], model="m").shape == (0, 0)
+        assert stub.requests == []
+
+    def test_legacy_endpoint_fallback(self, stub):
+        def handler(path: str, body: dict) -> tuple[int, Any]:
+            if path == "/api/embeddings":
+                return 200, {"embedding": _vector(body["prompt"])}
+            return 404, {"error": "not found"}
+
+        stub.handler = handler
+        client = _client(stub, embed_cache_size=0)
+
+        assert client.embed(["a", "bb"], model="m").tolist() == [[1, 1], [2, 1]]
+        assert asyncio.run(client.aembed(["ccc"], model="m")).tolist() == [[3, 1]]
+        paths = [path for path, _ in stub.requests]
+        # Once the legacy endpoint worked, /api/embed is no longer tried.
+        assert paths.count("/api/embed") == 1
+        assert paths.count("/api/embeddings") == 3
+
+    def test_duplicate_texts_embedded_once(self, stub):
+        client = _client(stub, embed_cache_size=0)
+        texts = ["a", "bb", "a", "ccc", "bb", "a"]
+
+        matrix = client.embed(texts, model="m")
+
+        assert matrix.tolist() == [_vector(text) for text in texts]
+        assert stub.requests[0][1]["input"] == ["a", "bb", "ccc"]
+
+    def test_cache_serves_repeat_calls(self, stub):
+        client = _client(stub)
+        first = client.embed(["a", "bb"], model="m")
+        second = asyncio.run(client.aembed(["bb", "a", "new"], model="m"))
+
+        assert second.tolist() == [first[1].tolist(), first[0].tolist(), [3, 1]]
+        assert [body["input"] for _, body in stub.requests] == [["a", "bb"], ["new"]]
+        # Cache entries are per model.
+        client.embed(["a"], model="other")
+        assert stub.requests[-1][1] == {"model": "other", "input": ["a"]}
+
+    def test_cache_persists_to_npz(self, stub, tmp_path):
+        path = tmp_path / "embed_cache.npz"
+        client = _client(stub, embed_cache_sq8=True)
+        expected = client.embed(["a", "bb", "ccc"], model="m")
+        assert client.save_embed_cache(path) == 3
+
+        restored = _client(stub, embed_cache_sq8=True)
+        assert restored.load_embed_cache(path) == 3
+        matrix = restored.embed(["ccc", "a"], model="m")
+
+        assert len(stub.requests) == 1
+        np.testing.assert_allclose(matrix, expected[[2, 0]], rtol=0.02)
+
+    def test_coalesced_calls_share_one_request(self, stub):
+        client = _client(stub, embed_cache_size=0)
+
+        async def run():
+            rows = await asyncio.gather(
+                *(client.embed_coalesced(text, model="m") for text in self.TEXTS[:5])
+            )
+            await client.aclose()
+            return rows
+
+        rows = asyncio.run(run())
+
+        assert [row.tolist() for row in rows] == [
+            _vector(text) for text in self.TEXTS[:5]
+        ]
+        assert stub.embed_sizes() == [5]
+
+
+class TestChat:
+    def test_retries_transient_5xx(self, stub):
+        responses = [(503, {"error": "loading"})]
+
+        def handler(path: str, body: dict) -> tuple[int, Any]:
+            return responses.pop() if responses else stub.default_handler(path, body)
+
+        stub.handler = handler
+        client = _client(stub)
+
+        assert client.chat("hi", model="m") == "echo:hi"
+        assert len(stub.requests) == 2
+
+    def test_client_error_is_not_retried(self, stub):
+        stub.handler = lambda path, body: (400, {"error": "bad model"})
+        client = _client(stub)
+
+        with pytest.raises(OllamaClientError, match="HTTP 400") as info:
+            client.chat("hi", model="m")
+        assert info.value.status == 400
+        assert len(stub.requests) == 1
+
+    def test_stream_chat_yields_deltas(self, stub):
+        stream = _ndjson(
+            {"message": {"content": "Hel"}, "done": False},
+            {"message": {"content": "lo"}, "done": False},
+            {"message": {"content": ""}, "done": True},
+        )
+        stub.handler = lambda path, body: (200, stream)
+        client = _client(stub)
+
+        async def collect():
+            parts = [part async for part in client.astream_chat("hi", model="m")]
+            await client.aclose()
+            return parts
+
+        assert list(client.stream_chat("hi", model="m")) == ["Hel", "lo"]
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+        assert all(body["stream"] is True for _, body in stub.requests)
+
+    def test_stream_outlives_client_timeout(self, stub):
+        chunks = [
+            _ndjson({"message": {"content": str(i)}, "done": False}) for i in range(4)
+        ]
+        chunks.append(_ndjson({"message": {"content": ""}, "done": True}))
+        stub.handler = lambda path, body: (200, chunks)
+        stub.chunk_delay = 0.3
+        client = _client(stub, timeout=1.0)
+
+        async def collect():
+            parts = [part async for part in client.astream_chat("hi", model="m")]
+            await client.aclose()
+            return parts
+
+        assert asyncio.run(collect()) == ["0", "1", "2", "3"]
+        assert list(client.stream_chat("hi", model="m")) == ["0", "1", "2", "3"]
+
+    def test_stalled_stream_raises_client_error(self, stub):
+        chunks = [
+            _ndjson({"message": {"content": "a"}, "done": False}),
+            _ndjson({"message": {"content": ""}, "done": True}),
+        ]
+        stub.handler = lambda path, body: (200, chunks)
+        stub.chunk_delay = 0.5
+        client = _client(stub, timeout=0.2)
+
+        with pytest.raises(OllamaClientError, match="failed"):
+            list(client.stream_chat("hi", model="m"))
+
+        async def collect():
+            try:
+                return [part async for part in client.astream_chat("hi", model="m")]
+            finally:
+                await client.aclose()
+
+        with pytest.raises(OllamaClientError, match="TimeoutError"):
+            asyncio.run(collect())
+
+    def test_prefix_cache_body_matches_plain_body(self, stub):
+        kwargs = dict(
+            model="m",
+            system_prompt="You are terse.",
+            history_messages=[{"role": "user", "content": "earlier"}],
+            options={"temperature": 0},
+        )
+        plain = _client(stub)
+        spliced = _client(stub, chat_prefix_cache=True)
+
+        plain.chat("hi", **kwargs)
+        spliced.chat("hi", **kwargs)
+        spliced.chat("again", **kwargs)
+
+        bodies = [body for _, body in stub.requests]
+        assert bodies[0] == bodies[1]
+        assert bodies[2]["messages"][0] == {
+            "role": "system",
+            "content": "You are terse.",
+        }
+        assert bodies[2]["messages"][-1]["content"] == "again"
@@ -0,0 +1,153 @@
+"""
+Short-lived response caching with ETag revalidation.
+
+Read-mostly endpoints (current config, graph stats, processed documents) are
+hit every time the UI opens a panel, yet their payloads rarely change. This
+module lets such endpoints:
+
+- memoize the computed payload for a short TTL, coalescing concurrent callers
+  onto a single in-flight computation, and
+- answer ``If-None-Match`` revalidation with ``304 Not Modified``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+DEFAULT_TTL_SECONDS = 2.0
+
+
+class TTLCache:
+    """
+    Async TTL cache with single-flight computation per key.
+
+    Entries hold the JSON-encoded body and its ETag so hits skip both the
+    expensive computation and re-serialization.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS):
+        if ttl < 0:
+            raise ValueError("ttl must be >= 0")
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, bytes, str]] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]]
+    ) -> Tuple[bytes, str]:
+        """
+        Return ``(body, etag)`` for ``key``, computing it at most once per TTL.
+
+        Concurrent callers for the same key await the same computation.
+        Failures are propagated to every waiter and are not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1], entry[2]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            body = encode_json_body(await compute())
+            result = (body, compute_etag(body))
+            self._entries[key] = (time.monotonic() + self.ttl, *result)
+            future.set_result(result)
+            return result
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Reason: mark retrieved so a failure with no other waiters doesn't
+            # log "Future exception was never retrieved".
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or every entry when ``key`` is None."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+def encode_json_body(payload: Any) -> bytes:
+    """Serialize a payload (dicts, Pydantic models, ...) to compact JSON bytes."""
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def compute_etag(body: bytes) -> str:
+    """Return a strong ETag for a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    # Weak comparison, as required for If-None-Match (RFC 9110 §13.1.2).
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def get_response_cache(request: Request) -> TTLCache:
+    """Return the per-app response cache, creating it on first use."""
+    state = request.app.state
+    cache = getattr(state, "response_cache", None)
+    if cache is None:
+        cache = TTLCache()
+        state.response_cache = cache
+    return cache
+
+
+def etag_json_response(
+    request: Request,
+    payload: Any = None,
+    *,
+    body: Optional[bytes] = None,
+    etag: Optional[str] = None,
+) -> Response:
+    """
+    Build a JSON response carrying an ETag, or ``304`` if the client has it.
+
+    ``Cache-Control: no-cache`` makes browsers always revalidate, so clients
+    never see stale data while unchanged payloads cost only a 304.
+    """
+    if body is None:
+        body = encode_json_body(payload)
+    if etag is None:
+        etag = compute_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def cached_json_response(
+    request: Request,
+    compute: Callable[[], Awaitable[Any]],
+    *,
+    key: Optional[Hashable] = None,
+) -> Response:
+    """
+    Serve ``compute()``'s payload through the app's TTL cache with an ETag.
+
+    Only use this for payloads that may lag behind writes by the cache TTL.
+    """
+    cache = get_response_cache(request)
+    body, etag = await cache.get_or_compute(key or request.url.path, compute)
+    return etag_json_response(request, body=body, etag=etag)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import importlib.util
 import logging
 import os
+import sys
 from pathlib import Path
 
 from backend.config import BackendConfig, ProviderType
@@ -89,7 +90,15 @@ def ensure_torch_cuda_libs(config: BackendConfig) -> None:
 
     This is a best-effort mitigation for systems where an old CUDA toolkit path earlier in
     LD_LIBRARY_PATH causes torch CUDA imports to fail.
+
+    If torch has already been imported, its CUDA libs are already loaded and changing
+    LD_LIBRARY_PATH cannot affect them, so this returns without touching the environment
+    (avoids leaking the mutation into child processes for no benefit).
     """
+    if "torch" in sys.modules:
+        logger.debug("torch already imported; skipping LD_LIBRARY_PATH mutation")
+        return
+
     if not needs_local_gpu_torch(config):
         return
 
@@ -129,8 +129,9 @@ async def example_with_jina_reranker():
     print("  - Ready to process documents and query with reranking")
     print("=" * 60 + "\n")
 
-    # Cleanup
+    # Cleanup: also close the HTTP client rerankers share on this event loop
     await reranker.close()
+    await APIReranker.shutdown_all()
 
 
 async def example_standalone_reranker():
@@ -180,8 +181,9 @@ async def example_standalone_reranker():
     print("✅ Standalone reranker example complete!")
     print("=" * 60 + "\n")
 
-    # Cleanup
+    # Cleanup: also close the HTTP client rerankers share on this event loop
     await reranker.close()
+    await APIReranker.shutdown_all()
 
 
 async def main():
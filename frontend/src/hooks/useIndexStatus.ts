@@ -1,7 +1,11 @@
-import { useQuery } from '@tanstack/react-query';
+import { useEffect, useState } from 'react';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { getIndexStatus } from '@/api/documents';
+import { BACKEND_URL } from '@/api/client';
 import type { IndexStatusListResponse } from '@/types/index-status';
 
+const INDEX_STATUS_QUERY_KEY = ['documents', 'index-status'] as const;
+
 /**
  * useIndexStatus Hook
  *
@@ -9,7 +13,8 @@ import type { IndexStatusListResponse } from '@/types/index-status';
  *
  * Features:
  * - Fetch index status for all documents
- * - Automatic polling every 10 seconds
+ * - Live updates pushed over SSE (`/api/documents/index-status/events`)
+ * - Falls back to polling every 10 seconds if the stream is unavailable
  * - Loading and error states
  * - Manual refetch capability
  *
@@ -23,17 +28,48 @@ import type { IndexStatusListResponse } from '@/types/index-status';
  * ```
  */
 export function useIndexStatus() {
+  const queryClient = useQueryClient();
+  const [isStreaming, setIsStreaming] = useState(false);
+
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') {
+      return;
+    }
+
+    const source = new EventSource(`${BACKEND_URL}/api/documents/index-status/events`);
+
+    source.onopen = () => setIsStreaming(true);
+    source.onmessage = (event) => {
+      try {
+        const statuses = JSON.parse(event.data) as IndexStatusListResponse;
+        queryClient.setQueryData(INDEX_STATUS_QUERY_KEY, statuses);
+      } catch (err) {
+        console.error('Failed to parse index status event:', err);
+      }
+    };
+    source.onerror = () => {
+      // Stop the browser's auto-reconnect loop and let polling take over.
+      source.close();
+      setIsStreaming(false);
+    };
+
+    return () => {
+      source.close();
+      setIsStreaming(false);
+    };
+  }, [queryClient]);
+
   const {
     data,
     isLoading,
     error,
     refetch,
   } = useQuery<IndexStatusListResponse>({
-    queryKey: ['documents', 'index-status'],
+    queryKey: INDEX_STATUS_QUERY_KEY,
     queryFn: getIndexStatus,
     staleTime: 5 * 1000, // 5 seconds - status changes frequently
-    refetchInterval: 10 * 1000, // Poll every 10 seconds
-    refetchOnWindowFocus: true, // Refetch when user returns to tab
+    refetchInterval: isStreaming ? false : 10 * 1000, // Poll only without SSE
+    refetchOnWindowFocus: !isStreaming, // SSE already keeps data fresh
   });
 
   return {
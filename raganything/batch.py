@@ -6,8 +6,19 @@ Contains methods for processing multiple documents in batch mode
 
 import asyncio
 import logging
+import sys
 from pathlib import Path
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    List,
+    Dict,
+    Any,
+    Optional,
+    TYPE_CHECKING,
+    Union,
+)
 import time
 
 from .batch_parser import BatchParser, BatchProcessingResult
@@ -384,3 +395,162 @@ class BatchMixin:
                 [r for r in rag_results.values() if not r["processed"]]
             ),
         }
+
+    async def process_documents_stream(
+        self,
+        file_paths: Union[Iterable[str], AsyncIterable[str]],
+        output_dir: Optional[str] = None,
+        parse_method: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Process documents as their paths arrive, reusing this warm instance
+
+        Unlike the batch methods, the file list need not be known up front: paths
+        may be streamed (e.g. read from stdin or a queue) and each document starts
+        as soon as it arrives and a worker slot is free. LightRAG storages, model
+        clients and their connection pools are initialized once and shared by
+        every document. Blank entries are skipped.
+
+        Args:
+            file_paths: Sync or async iterable of file paths
+            output_dir: Output directory for parsed files
+            parse_method: Parsing method to use
+            max_workers: Maximum number of documents processed concurrently
+            **kwargs: Additional arguments passed to process_document_complete
+
+        Returns:
+            Dict with "successful" paths, "failed" (path, error) pairs and
+            "total_processing_time"
+        """
+        start_time = time.time()
+
+        if output_dir is None:
+            output_dir = self.config.parser_output_dir
+        if parse_method is None:
+            parse_method = self.config.parse_method
+        if max_workers is None:
+            max_workers = self.config.max_concurrent_files
+
+        await self._ensure_lightrag_initialized()
+
+        semaphore = asyncio.Semaphore(max_workers)
+        successful: List[str] = []
+        failed: List[tuple] = []
+        tasks: set = set()
+
+        async def process_single_file(file_path: str):
+            try:
+                await self.process_document_complete(
+                    file_path,
+                    output_dir=output_dir,
+                    parse_method=parse_method,
+                    **kwargs,
+                )
+                successful.append(file_path)
+            except Exception as e:
+                self.logger.error(f"Failed to process {file_path}: {str(e)}")
+                failed.append((file_path, str(e)))
+            finally:
+                semaphore.release()
+
+        try:
+            async for file_path in _aiter(file_paths):
+                file_path = file_path.strip()
+                if not file_path:
+                    continue
+                # Reason: acquire before reading on, so a fast producer waits for
+                # a free slot instead of queueing unbounded tasks.
+                await semaphore.acquire()
+                task = asyncio.create_task(process_single_file(file_path))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            # Reason: also drain in-flight documents when the producer raises or
+            # is cancelled, so none still runs once the caller finalizes storages.
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return {
+            "successful": successful,
+            "failed": failed,
+            "total_processing_time": time.time() - start_time,
+        }
+
+
+async def _aiter(items: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    """Iterate a sync or async iterable from async code"""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def _stdin_lines() -> AsyncIterator[str]:
+    """Yield stdin lines without blocking the event loop"""
+    while True:
+        line = await asyncio.to_thread(sys.stdin.readline)
+        if not line:
+            return
+        yield line
+
+
+async def _serve(args) -> int:
+    # Reason: imported here; raganything.raganything imports this module.
+    from .config import RAGAnythingConfig
+    from .raganything import RAGAnything
+
+    config = RAGAnythingConfig()
+    if args.working_dir:
+        config.working_dir = args.working_dir
+    rag = RAGAnything(config=config)
+
+    try:
+        result = await rag.process_documents_stream(
+            _stdin_lines(), output_dir=args.output, max_workers=args.workers
+        )
+    finally:
+        await rag.finalize_storages()
+
+    print(
+        f"Processed {len(result['successful'])} documents, "
+        f"{len(result['failed'])} failed in {result['total_processing_time']:.1f}s"
+    )
+    return 1 if result["failed"] else 0
+
+
+def main():
+    """Long-lived ingest worker: read document paths from stdin, one per line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Ingest documents whose paths arrive on stdin, keeping one "
+        "RAGAnything instance (storages, model clients) warm for all of them"
+    )
+    parser.add_argument("--working-dir", help="RAG storage directory")
+    parser.add_argument("--output", "-o", help="Output directory for parsed files")
+    parser.add_argument("--workers", type=int, help="Documents processed concurrently")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(_serve(args))
+    # Reason: the worker spends its time on many small aiohttp round trips to
+    # the model servers, where uvloop's event loop is markedly cheaper
+    if hasattr(uvloop, "run"):
+        return uvloop.run(_serve(args))
+    # uvloop < 0.18 has no run(); install its loop policy for asyncio.run instead
+    uvloop.install()
+    return asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
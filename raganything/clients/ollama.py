@@ -2,26 +2,342 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import logging
+import os
+import random
+import socket
+import threading
 import time
-from dataclasses import dataclass
-from typing import List, Optional, Sequence
-from urllib import error, request
-from urllib.parse import urljoin
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Sequence
+
+import aiohttp
+import numpy as np
+import urllib3
+
+from raganything.utils import dequantize_sq8, quantize_sq8
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_JSON_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+_ENDPOINTS = ("api/chat", "api/embed", "api/embeddings")
+_CHAT_PREFIX_CACHE_SIZE = 64
+_SOCKET_BUFFER_BYTES = 1 << 20
+# Reason: keep urllib3's TCP_NODELAY default (small JSON bodies must not wait on
+# Nagle) and enlarge kernel buffers so multi-MB embedding responses drain quickly.
+_SOCKET_OPTIONS = urllib3.connection.HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCKET_BUFFER_BYTES),
+    (socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKET_BUFFER_BYTES),
+]
+
+
+def _encode_json(payload: dict) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_json(raw: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 class OllamaClientError(RuntimeError):
     """Raised when the Ollama service rejects or cannot handle a request."""
 
+    def __init__(self, message: str, *, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+# Response decoders validate each payload shape exactly once, at decode time, and
+# return only the field the caller needs. With msgspec installed the validation runs
+# in C against typed schemas; otherwise the same checks run on the decoded dict.
+if MSGSPEC_AVAILABLE:
+
+    class _ChatMessage(msgspec.Struct):
+        content: str = ""
+
+    class _ChatResponse(msgspec.Struct):
+        message: _ChatMessage
+
+    class _ChatChunk(msgspec.Struct):
+        message: Optional[_ChatMessage] = None
+        done: bool = False
+        error: Optional[str] = None
+
+    class _EmbedResponse(msgspec.Struct):
+        embeddings: List[List[float]]
+
+    class _EmbeddingResponse(msgspec.Struct):
+        embedding: List[float]
+
+    _CHAT_DECODER = msgspec.json.Decoder(_ChatResponse)
+    _CHUNK_DECODER = msgspec.json.Decoder(_ChatChunk)
+    _EMBED_DECODER = msgspec.json.Decoder(_EmbedResponse)
+    _EMBEDDING_DECODER = msgspec.json.Decoder(_EmbeddingResponse)
+
+# Reason: msgspec.DecodeError/ValidationError subclass ValueError; the rest cover
+# the dict fallback (wrong container types, missing keys).
+_DECODE_ERRORS = (ValueError, TypeError, KeyError)
+
+
+def _decode_chat(raw: bytes) -> str:
+    try:
+        if MSGSPEC_AVAILABLE:
+            return _CHAT_DECODER.decode(raw).message.content
+        message = _decode_json(raw)["message"]
+        if not isinstance(message, dict) or "content" not in message:
+            raise TypeError("missing message content")
+        return message["content"]
+    except _DECODE_ERRORS as exc:
+        raise OllamaClientError(
+            "Unexpected response payload from Ollama chat endpoint"
+        ) from exc
+
+
+def _decode_chat_chunk(raw: bytes) -> tuple[str, bool]:
+    """Decode one NDJSON chunk from a streaming chat into ``(content, done)``."""
+
+    try:
+        if MSGSPEC_AVAILABLE:
+            chunk = _CHUNK_DECODER.decode(raw)
+            error, done = chunk.error, chunk.done
+            content = chunk.message.content if chunk.message is not None else ""
+        else:
+            data = _decode_json(raw)
+            if not isinstance(data, dict):
+                raise TypeError("chunk is not an object")
+            error, done = data.get("error"), bool(data.get("done"))
+            message = data.get("message")
+            content = message.get("content", "") if isinstance(message, dict) else ""
+    except _DECODE_ERRORS as exc:
+        raise OllamaClientError(
+            f"Malformed streaming chunk from Ollama chat endpoint: {raw[:200]!r}"
+        ) from exc
+    if error is not None:
+        raise OllamaClientError(f"Ollama stream failed: {error}")
+    return content, done
+
+
+def _decode_embed(raw: bytes) -> List[List[float]]:
+    try:
+        # Reason: for large float arrays orjson decodes ~10-15% faster than the typed
+        # msgspec schema, and _parse_embed's np.asarray re-checks every row anyway.
+        if MSGSPEC_AVAILABLE and not ORJSON_AVAILABLE:
+            return _EMBED_DECODER.decode(raw).embeddings
+        vectors = _decode_json(raw)["embeddings"]
+        if not isinstance(vectors, list):
+            raise TypeError("embeddings is not a list")
+        return vectors
+    except _DECODE_ERRORS as exc:
+        raise OllamaClientError(
+            f"Malformed response from Ollama embed endpoint: {exc}"
+        ) from exc
+
+
+def _decode_embedding(raw: bytes) -> List[float]:
+    try:
+        if MSGSPEC_AVAILABLE:
+            return _EMBEDDING_DECODER.decode(raw).embedding
+        vector = _decode_json(raw)["embedding"]
+        if not isinstance(vector, list):
+            raise TypeError("embedding is not a list")
+        return vector
+    except _DECODE_ERRORS as exc:
+        raise OllamaClientError(
+            f"Malformed response from Ollama embeddings endpoint: {exc}"
+        ) from exc
+
+
+async def _close_on_loop_shutdown(
+    session: aiohttp.ClientSession,
+) -> AsyncIterator[None]:
+    """Async generator parked at ``yield`` until ``session`` should be closed.
+
+    Reason: asyncio.run() (and uvloop.run()) call ``loop.shutdown_asyncgens()``
+    before closing the loop, which finalizes this generator while the loop can
+    still await ``session.close()``; otherwise sessions of finished loops leak.
+    """
+
+    try:
+        yield
+    finally:
+        await session.close()
+
+
+def _should_split(exc: OllamaClientError, batch: List[str]) -> bool:
+    """Whether a failed embed batch is worth retrying as two smaller requests."""
+
+    return len(batch) > 1 and exc.status is not None and exc.status >= 500
+
+
+@dataclass
+class _CircuitBreaker:
+    """Fail fast while Ollama keeps erroring instead of queueing more retries.
+
+    Opens after ``failure_threshold`` consecutive transport errors or 5xx responses
+    and rejects requests for ``reset_timeout`` seconds. After that a single trial
+    request is let through (half-open) while concurrent callers keep being rejected:
+    success closes the breaker, failure re-opens it. A non-positive threshold
+    disables the breaker.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    state: str = "closed"
+    fail_count: int = 0
+    opened_at: float = 0.0
+    trial_in_flight: bool = False
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def check(self) -> None:
+        """Raise :class:`OllamaClientError` if requests are currently rejected."""
+
+        if self.failure_threshold <= 0 or self.state == "closed":
+            return
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open":
+                remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+                if remaining > 0:
+                    raise OllamaClientError(
+                        f"Ollama circuit breaker open after {self.fail_count} "
+                        f"consecutive failures; retrying in {remaining:.1f}s"
+                    )
+                self.state = "half_open"
+            elif self.trial_in_flight:
+                # Reason: a recovering server gets one probe, not every queued caller.
+                raise OllamaClientError(
+                    "Ollama circuit breaker half-open; waiting on a trial request"
+                )
+            self.trial_in_flight = True
+
+    def record_success(self) -> None:
+        if self.state == "closed" and self.fail_count == 0:
+            return
+        with self._lock:
+            self.state = "closed"
+            self.fail_count = 0
+            self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self.fail_count += 1
+            if self.state == "half_open" or self.fail_count >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def release(self) -> None:
+        """Give up a trial request that ended without a verdict (e.g. cancelled)."""
+
+        if not self.trial_in_flight:
+            return
+        with self._lock:
+            self.trial_in_flight = False
+
 
 @dataclass
 class OllamaClient:
-    """Blocking HTTP client for the Ollama REST API with retry semantics."""
+    """HTTP client for the Ollama REST API with retry semantics.
+
+    Requests go through a per-instance keep-alive connection pool so repeated chat and
+    embedding calls reuse warm sockets instead of reconnecting each time. ``achat`` and
+    ``aembed`` mirror the blocking API on an ``aiohttp`` session for event-loop callers.
+    """
 
     base_url: str
     timeout: float = 120.0
     max_retries: int = 2
     backoff_factor: float = 0.5
+    embed_batch_size: int = 64
+    embed_cache_size: int = 4096
+    """Maximum number of embeddings kept in the in-process LRU cache (0 disables)."""
+    embed_cache_sq8: bool = False
+    """Store cached embeddings as SQ8 int8 codes (4x smaller, slightly lossy)."""
+    embed_concurrency: int = 8
+    """Concurrent per-text requests when falling back to legacy ``/api/embeddings``."""
+    embed_batch_concurrency: int = 4
+    """Batched ``/api/embed`` requests kept in flight by one ``embed``/``aembed`` call."""
+    chat_prefix_cache: bool = False
+    """Reuse the serialized ``model``/system-prompt head of chat bodies across calls."""
+    breaker_failure_threshold: int = 5
+    """Consecutive failures that open the circuit breaker (0 disables it)."""
+    breaker_reset_timeout: float = 30.0
+    """Seconds the breaker stays open before letting a trial request through."""
+
+    _legacy_embed: bool = field(default=False, init=False, repr=False)
+    """Set once the server is known to lack the batched ``/api/embed`` endpoint."""
+
+    _urls: dict[str, str] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    """Absolute URLs of the endpoints this client calls, resolved once."""
+
+    _pool: urllib3.PoolManager = field(init=False, repr=False, compare=False)
+    """Keep-alive connection pool owned by this client."""
+
+    _breaker: _CircuitBreaker = field(init=False, repr=False, compare=False)
+    """Shared by the sync and async transports."""
+
+    _sessions: dict[
+        asyncio.AbstractEventLoop, tuple[aiohttp.ClientSession, AsyncIterator[None]]
+    ] = field(default_factory=dict, init=False, repr=False, compare=False)
+    """aiohttp session backing the async API per event loop, with its closing guard."""
+
+    _batcher: Optional["EmbedBatcher"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    """Request coalescer backing :meth:`embed_coalesced`."""
+
+    _embed_cache: "OrderedDict[tuple[str, bytes], Any]" = field(
+        default_factory=OrderedDict, init=False, repr=False, compare=False
+    )
+    """LRU cache of embeddings keyed by ``(model, blake2b(text))``."""
+
+    _cache_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    _prefix_cache: dict[tuple[str, str], bytes] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    """Encoded chat body heads keyed by ``(model, system_prompt)``."""
+
+    _executors: dict[str, ThreadPoolExecutor] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    """Worker pools for the blocking embed fan-out, kept warm across calls."""
+
+    _executor_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         if not self.base_url:
@@ -31,11 +347,58 @@ class OllamaClient:
                 f"Invalid Ollama base_url '{self.base_url}'; expected http(s) scheme."
             )
         self.base_url = self.base_url.rstrip("/")
+        self._urls = {path: f"{self.base_url}/{path}" for path in _ENDPOINTS}
 
         if self.max_retries < 0:
             raise ValueError("max_retries must be zero or positive")
         if self.backoff_factor < 0:
             raise ValueError("backoff_factor must be zero or positive")
+        if self.embed_batch_size <= 0:
+            raise ValueError("embed_batch_size must be positive")
+        if self.embed_cache_size < 0:
+            raise ValueError("embed_cache_size must be zero or positive")
+        if self.embed_concurrency <= 0:
+            raise ValueError("embed_concurrency must be positive")
+        if self.embed_batch_concurrency <= 0:
+            raise ValueError("embed_batch_concurrency must be positive")
+        if self.breaker_reset_timeout < 0:
+            raise ValueError("breaker_reset_timeout must be zero or positive")
+
+        self._breaker = _CircuitBreaker(
+            failure_threshold=self.breaker_failure_threshold,
+            reset_timeout=self.breaker_reset_timeout,
+        )
+
+        # Reason: retries are handled by _post_json's backoff loop, not by urllib3.
+        # The pool must hold one socket per concurrent embed worker.
+        self._pool = urllib3.PoolManager(
+            maxsize=max(
+                self.max_retries + 8,
+                self.embed_concurrency,
+                self.embed_batch_concurrency,
+            ),
+            retries=False,
+            timeout=urllib3.Timeout(total=self.timeout),
+            socket_options=_SOCKET_OPTIONS,
+        )
+
+    def close(self) -> None:
+        """Close pooled connections and worker threads held by this client."""
+
+        self._pool.clear()
+        with self._executor_lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=False)
+
+    async def aclose(self) -> None:
+        """Close pooled connections, including the aiohttp session, if any."""
+
+        self.close()
+        entry = self._sessions.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
 
     def chat(
         self,
@@ -49,6 +412,486 @@ class OllamaClient:
     ) -> str:
         """Call ``/api/chat`` and return the assistant response text."""
 
+        body = self._chat_body(
+            prompt, model, system_prompt, history_messages, stream, options
+        )
+        return self._post_json("api/chat", body, decode=_decode_chat)
+
+    async def achat(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        system_prompt: Optional[str] = None,
+        history_messages: Optional[Sequence[dict]] = None,
+        stream: bool = False,
+        options: Optional[dict] = None,
+    ) -> str:
+        """Async counterpart of :meth:`chat`."""
+
+        body = self._chat_body(
+            prompt, model, system_prompt, history_messages, stream, options
+        )
+        return await self._apost_json("api/chat", body, decode=_decode_chat)
+
+    def stream_chat(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        system_prompt: Optional[str] = None,
+        history_messages: Optional[Sequence[dict]] = None,
+        options: Optional[dict] = None,
+    ) -> Iterator[str]:
+        """Call ``/api/chat`` in streaming mode and yield content deltas as they arrive.
+
+        Streaming requests are not retried: tokens already yielded cannot be replayed.
+        """
+
+        body = self._chat_body(
+            prompt, model, system_prompt, history_messages, True, options
+        )
+        url = self._urls["api/chat"]
+        try:
+            # Reason: a long generation must not be cut by a whole-request budget;
+            # bound the connect and each gap between chunks instead.
+            resp = self._pool.request(
+                "POST",
+                url,
+                body=body,
+                headers=_JSON_HEADERS,
+                preload_content=False,
+                timeout=urllib3.Timeout(connect=self.timeout, read=self.timeout),
+            )
+        except urllib3.exceptions.HTTPError as exc:
+            raise OllamaClientError(f"Ollama at {url} is unreachable: {exc}") from exc
+
+        try:
+            if resp.status >= 400:
+                raw = resp.read().decode("utf-8", "ignore")
+                raise OllamaClientError(
+                    f"Ollama request failed with HTTP {resp.status}: {raw or resp.reason}",
+                    status=resp.status,
+                )
+            for line in resp:
+                content, done = self._parse_stream_line(line)
+                if content:
+                    yield content
+                if done:
+                    break
+        except urllib3.exceptions.HTTPError as exc:
+            raise OllamaClientError(
+                f"Ollama stream from {url} failed: {exc!r}"
+            ) from exc
+        finally:
+            resp.release_conn()
+
+    async def astream_chat(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        system_prompt: Optional[str] = None,
+        history_messages: Optional[Sequence[dict]] = None,
+        options: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        """Async counterpart of :meth:`stream_chat`."""
+
+        body = self._chat_body(
+            prompt, model, system_prompt, history_messages, True, options
+        )
+        url = self._urls["api/chat"]
+        session = await self._get_session()
+        # Reason: the session's total timeout would also cover reading the whole
+        # streamed body and abort healthy long generations mid-stream.
+        timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=self.timeout, sock_read=self.timeout
+        )
+        try:
+            async with session.post(url, data=body, timeout=timeout) as resp:
+                if resp.status >= 400:
+                    raw = (await resp.read()).decode("utf-8", "ignore")
+                    raise OllamaClientError(
+                        f"Ollama request failed with HTTP {resp.status}: {raw or resp.reason}",
+                        status=resp.status,
+                    )
+                async for line in resp.content:
+                    content, done = self._parse_stream_line(line)
+                    if content:
+                        yield content
+                    if done:
+                        break
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            # Reason: asyncio.TimeoutError has an empty str(); repr keeps the type.
+            raise OllamaClientError(f"Ollama at {url} is unreachable: {exc!r}") from exc
+
+    def embed(self, texts: Sequence[str], *, model: str) -> np.ndarray:
+        """Call ``/api/embed`` in batches of ``embed_batch_size`` and return embeddings.
+
+        Up to ``embed_batch_concurrency`` batches are in flight at once, and a batch
+        that keeps failing with HTTP 5xx is split in half and retried. Servers that
+        predate the batched endpoint (HTTP 404) are served through the legacy
+        per-text ``/api/embeddings`` endpoint instead. Texts already embedded with
+        the same model are served from the in-process cache without a request, and
+        a text repeated within ``texts`` is embedded only once.
+
+        Returns:
+            ``float32`` array of shape ``(len(texts), dim)``.
+        """
+
+        if isinstance(texts, str):  # type: ignore[unreachable]
+            texts = [texts]
+
+        texts = list(texts)
+        cached, missing = self._lookup_cached(texts, model)
+        missing, repeats = self._dedupe(texts, missing)
+        batches = self._split_batches(missing)
+
+        def _one(batch: List[int]) -> tuple[List[int], np.ndarray]:
+            batch_texts = [texts[i] for i in batch]
+            matrix = self._embed_adaptive(batch_texts, model)
+            self._store_cached(model, batch_texts, matrix)
+            return batch, matrix
+
+        workers = min(self.embed_batch_concurrency, len(batches))
+        if workers <= 1:
+            results = [_one(batch) for batch in batches]
+        else:
+            pool = self._executor("ollama-embed-batch", self.embed_batch_concurrency)
+            results = list(pool.map(_one, batches))
+        return self._assemble(len(texts), cached, results, repeats)
+
+    async def aembed(self, texts: Sequence[str], *, model: str) -> np.ndarray:
+        """Async counterpart of :meth:`embed`."""
+
+        if isinstance(texts, str):  # type: ignore[unreachable]
+            texts = [texts]
+
+        texts = list(texts)
+        cached, missing = self._lookup_cached(texts, model)
+        missing, repeats = self._dedupe(texts, missing)
+        semaphore = asyncio.Semaphore(self.embed_batch_concurrency)
+
+        async def _one(batch: List[int]) -> tuple[List[int], np.ndarray]:
+            batch_texts = [texts[i] for i in batch]
+            async with semaphore:
+                matrix = await self._aembed_adaptive(batch_texts, model)
+            self._store_cached(model, batch_texts, matrix)
+            return batch, matrix
+
+        results = await asyncio.gather(
+            *(_one(batch) for batch in self._split_batches(missing))
+        )
+        return self._assemble(len(texts), cached, results, repeats)
+
+    async def embed_coalesced(self, text: str, *, model: str) -> np.ndarray:
+        """Embed one text, sharing a batched request with concurrent callers.
+
+        Calls arriving within a few milliseconds of each other are sent to Ollama as
+        one ``/api/embed`` request; see :class:`EmbedBatcher`.
+        """
+
+        loop = asyncio.get_running_loop()
+        if self._batcher is None or self._batcher.loop is not loop:
+            self._batcher = EmbedBatcher(self)
+        return await self._batcher.embed(text, model=model)
+
+    @staticmethod
+    def _assemble(
+        count: int,
+        cached: dict[int, np.ndarray],
+        results: Sequence[tuple[List[int], np.ndarray]],
+        repeats: Optional[dict[int, int]] = None,
+    ) -> np.ndarray:
+        """Copy cache hits and per-batch matrices into one preallocated matrix.
+
+        ``repeats`` maps positions of duplicate texts to the position that was
+        actually embedded (see :meth:`_dedupe`).
+        """
+
+        if not count:
+            return np.empty((0, 0), dtype=np.float32)
+        # Reason: allocate the (count, dim) output once and scatter each batch into
+        # it, instead of collecting per-row arrays and stacking them afterwards.
+        first = next(iter(cached.values()), None)
+        dim = first.shape[-1] if first is not None else results[0][1].shape[1]
+        out = np.empty((count, dim), dtype=np.float32)
+        for index, row in cached.items():
+            out[index] = row
+        for indices, matrix in results:
+            out[indices] = matrix
+        if repeats:
+            out[list(repeats)] = out[list(repeats.values())]
+        return out
+
+    @staticmethod
+    def _dedupe(
+        texts: List[str], indices: List[int]
+    ) -> tuple[List[int], dict[int, int]]:
+        """Return ``(unique, repeats)`` for the positions in ``indices``.
+
+        ``unique`` keeps the first position of each distinct text; ``repeats`` maps
+        every later position of that text back to it.
+        """
+
+        first: dict[str, int] = {}
+        unique: List[int] = []
+        repeats: dict[int, int] = {}
+        for index in indices:
+            origin = first.setdefault(texts[index], index)
+            if origin == index:
+                unique.append(index)
+            else:
+                repeats[index] = origin
+        return unique, repeats
+
+    @staticmethod
+    def _cache_key(model: str, text: str) -> tuple[str, bytes]:
+        return model, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _lookup_cached(
+        self, texts: List[str], model: str
+    ) -> tuple[dict[int, np.ndarray], List[int]]:
+        """Return ``(cached, missing)``: cache hits by position and the positions to fetch."""
+
+        cached: dict[int, np.ndarray] = {}
+        if not self.embed_cache_size:
+            return cached, list(range(len(texts)))
+
+        missing: List[int] = []
+        with self._cache_lock:
+            for index, text in enumerate(texts):
+                key = self._cache_key(model, text)
+                entry = self._embed_cache.get(key)
+                if entry is None:
+                    missing.append(index)
+                    continue
+                self._embed_cache.move_to_end(key)
+                cached[index] = (
+                    dequantize_sq8(*entry) if self.embed_cache_sq8 else entry
+                )
+        return cached, missing
+
+    def save_embed_cache(self, path: str | os.PathLike) -> int:
+        """Write the embedding cache to an ``.npz`` file and return the entry count.
+
+        Entries are stored as float32 vectors keyed by model and text digest, so a
+        later process can skip re-embedding unchanged texts. Only entries with the
+        dimension of the most recently used one are written. The file is replaced
+        atomically.
+        """
+
+        with self._cache_lock:
+            items = list(self._embed_cache.items())
+        if not items:
+            return 0
+
+        vectors = [
+            dequantize_sq8(*entry) if self.embed_cache_sq8 else entry
+            for _, entry in items
+        ]
+        dim = vectors[-1].shape[-1]
+        keep = [i for i, vector in enumerate(vectors) if vector.shape[-1] == dim]
+        # Reason: raw uint8 rows, since numpy's "S" dtype strips trailing NULs.
+        digests = np.frombuffer(
+            b"".join(items[i][0][1] for i in keep), dtype=np.uint8
+        ).reshape(len(keep), -1)
+
+        tmp_path = f"{os.fspath(path)}.tmp"
+        with open(tmp_path, "wb") as fh:
+            np.savez(
+                fh,
+                models=np.array([items[i][0][0] for i in keep]),
+                digests=digests,
+                vectors=np.stack([vectors[i] for i in keep]),
+            )
+        os.replace(tmp_path, path)
+        return len(keep)
+
+    def load_embed_cache(self, path: str | os.PathLike) -> int:
+        """Merge a file written by :meth:`save_embed_cache`; return entries loaded.
+
+        A missing file loads nothing. When the file holds more entries than
+        ``embed_cache_size``, the most recently used ones are kept.
+        """
+
+        if not self.embed_cache_size or not os.path.exists(path):
+            return 0
+        with np.load(path, allow_pickle=False) as data:
+            models = data["models"].tolist()
+            digests = data["digests"]
+            vectors = data["vectors"].astype(np.float32, copy=False)
+
+        start = max(0, len(models) - self.embed_cache_size)
+        keys = [
+            (model, digest.tobytes())
+            for model, digest in zip(models[start:], digests[start:])
+        ]
+        self._store_entries(keys, vectors[start:])
+        return len(keys)
+
+    def _store_cached(self, model: str, texts: List[str], matrix: np.ndarray) -> None:
+        if not self.embed_cache_size:
+            return
+        self._store_entries([self._cache_key(model, text) for text in texts], matrix)
+
+    def _store_entries(self, keys: List[tuple[str, bytes]], matrix: np.ndarray) -> None:
+        if self.embed_cache_sq8:
+            codes, scales, zero_points = quantize_sq8(matrix)
+            entries = list(zip(codes, scales, zero_points))
+        else:
+            # Reason: copy so evicting a row does not pin the whole batch matrix.
+            entries = [row.copy() for row in matrix]
+            for entry in entries:
+                entry.flags.writeable = False
+        with self._cache_lock:
+            for key, entry in zip(keys, entries):
+                self._embed_cache[key] = entry
+                self._embed_cache.move_to_end(key)
+            while len(self._embed_cache) > self.embed_cache_size:
+                self._embed_cache.popitem(last=False)
+
+    def _executor(self, name: str, max_workers: int) -> ThreadPoolExecutor:
+        """Return the persistent worker pool ``name``, creating it on first use.
+
+        Batch-level and legacy per-text work use separate pools: a batch worker
+        waits on legacy requests, so sharing one pool could exhaust it.
+        """
+
+        executor = self._executors.get(name)
+        if executor is None:
+            with self._executor_lock:
+                executor = self._executors.get(name)
+                if executor is None:
+                    executor = ThreadPoolExecutor(
+                        max_workers=max_workers, thread_name_prefix=name
+                    )
+                    self._executors[name] = executor
+        return executor
+
+    def _split_batches(self, indices: List[int]) -> List[List[int]]:
+        size = self.embed_batch_size
+        return [indices[i : i + size] for i in range(0, len(indices), size)]
+
+    def _embed_adaptive(self, batch: List[str], model: str) -> np.ndarray:
+        """Embed ``batch``, halving it while Ollama keeps answering HTTP 5xx."""
+
+        try:
+            return self._embed_batch(batch, model)
+        except OllamaClientError as exc:
+            if not _should_split(exc, batch):
+                raise
+        # Reason: 5xx on a multi-text batch is usually an oversized request (context
+        # or memory pressure on the server); smaller halves often succeed. Such
+        # batches skip per-request retries and the breaker (see split_on_5xx), so
+        # only single-text requests can open the breaker.
+        half = len(batch) // 2
+        return np.concatenate(
+            [
+                self._embed_adaptive(batch[:half], model),
+                self._embed_adaptive(batch[half:], model),
+            ]
+        )
+
+    async def _aembed_adaptive(self, batch: List[str], model: str) -> np.ndarray:
+        """Async counterpart of :meth:`_embed_adaptive`."""
+
+        try:
+            return await self._aembed_batch(batch, model)
+        except OllamaClientError as exc:
+            if not _should_split(exc, batch):
+                raise
+        half = len(batch) // 2
+        return np.concatenate(
+            [
+                await self._aembed_adaptive(batch[:half], model),
+                await self._aembed_adaptive(batch[half:], model),
+            ]
+        )
+
+    def _embed_batch(self, batch: List[str], model: str) -> np.ndarray:
+        if not self._legacy_embed:
+            try:
+                vectors = self._post_json(
+                    "api/embed",
+                    {"model": model, "input": batch},
+                    decode=_decode_embed,
+                    split_on_5xx=len(batch) > 1,
+                )
+            except OllamaClientError as exc:
+                if exc.status != 404:
+                    raise
+            else:
+                return self._parse_embed(vectors, batch)
+
+        matrix = np.stack(self._embed_legacy(batch, model))
+        # Reason: only remember the fallback once the legacy endpoint actually works;
+        # /api/embed also answers 404 for unknown models.
+        self._legacy_embed = True
+        return matrix
+
+    async def _aembed_batch(self, batch: List[str], model: str) -> np.ndarray:
+        if not self._legacy_embed:
+            try:
+                vectors = await self._apost_json(
+                    "api/embed",
+                    {"model": model, "input": batch},
+                    decode=_decode_embed,
+                    split_on_5xx=len(batch) > 1,
+                )
+            except OllamaClientError as exc:
+                if exc.status != 404:
+                    raise
+            else:
+                return self._parse_embed(vectors, batch)
+
+        matrix = np.stack(await self._aembed_legacy(batch, model))
+        self._legacy_embed = True
+        return matrix
+
+    def _embed_legacy(self, batch: List[str], model: str) -> List[np.ndarray]:
+        """Embed texts one request each, up to ``embed_concurrency`` in flight."""
+
+        workers = min(self.embed_concurrency, len(batch))
+        if workers <= 1:
+            return [self._embed_one(text, model) for text in batch]
+        pool = self._executor("ollama-embed", self.embed_concurrency)
+        futures = [pool.submit(self._embed_one, text, model) for text in batch]
+        # Reason: collect in submission order so rows line up with ``batch``.
+        return [future.result() for future in futures]
+
+    async def _aembed_legacy(self, batch: List[str], model: str) -> List[np.ndarray]:
+        """Async counterpart of :meth:`_embed_legacy`."""
+
+        semaphore = asyncio.Semaphore(self.embed_concurrency)
+
+        async def _one(text: str) -> np.ndarray:
+            async with semaphore:
+                return await self._aembed_one(text, model)
+
+        return list(await asyncio.gather(*(_one(text) for text in batch)))
+
+    def _embed_one(self, text: str, model: str) -> np.ndarray:
+        vector = self._post_json(
+            "api/embeddings", {"model": model, "prompt": text}, decode=_decode_embedding
+        )
+        return self._coerce_vector(vector, text)
+
+    async def _aembed_one(self, text: str, model: str) -> np.ndarray:
+        vector = await self._apost_json(
+            "api/embeddings", {"model": model, "prompt": text}, decode=_decode_embedding
+        )
+        return self._coerce_vector(vector, text)
+
+    def _chat_payload(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str],
+        history_messages: Optional[Sequence[dict]],
+        stream: bool,
+        options: Optional[dict],
+    ) -> dict:
         payload = {
             "model": model,
             "messages": self._build_messages(prompt, system_prompt, history_messages),
@@ -56,37 +899,153 @@ class OllamaClient:
         }
         if options:
             payload["options"] = options
+        return payload
 
-        response = self._post_json("api/chat", payload)
-        message = response.get("message")
-        if not isinstance(message, dict) or "content" not in message:
+    def _chat_body(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str],
+        history_messages: Optional[Sequence[dict]],
+        stream: bool,
+        options: Optional[dict],
+    ) -> bytes:
+        """Encode a chat request body, splicing in a cached head when enabled."""
+
+        if not (self.chat_prefix_cache and system_prompt):
+            return _encode_json(
+                self._chat_payload(
+                    prompt, model, system_prompt, history_messages, stream, options
+                )
+            )
+
+        # Reason: large system prompts are identical across turns; encode the
+        # '{"model": ..., "messages": [<system>' head once and splice the rest in.
+        key = (model, system_prompt)
+        head = self._prefix_cache.get(key)
+        if head is None:
+            encoded = _encode_json(
+                {
+                    "model": model,
+                    "messages": [{"role": "system", "content": system_prompt}],
+                }
+            )
+            head = encoded[:-2]  # strip the closing ']}'
+            if len(self._prefix_cache) >= _CHAT_PREFIX_CACHE_SIZE:
+                self._prefix_cache.clear()
+            self._prefix_cache[key] = head
+
+        rest = _encode_json(self._build_messages(prompt, None, history_messages))
+        tail = {"stream": bool(stream)}
+        if options:
+            tail["options"] = options
+        return b"".join((head, b",", rest[1:-1], b"],", _encode_json(tail)[1:]))
+
+    @staticmethod
+    def _parse_stream_line(line: bytes) -> tuple[str, bool]:
+        """Decode one NDJSON chunk from a streaming chat into ``(content, done)``."""
+
+        line = line.strip()
+        if not line:
+            return "", False
+        return _decode_chat_chunk(line)
+
+    def _parse_embed(self, vectors: List[List[float]], batch: List[str]) -> np.ndarray:
+        if len(vectors) != len(batch):
             raise OllamaClientError(
-                "Unexpected response payload from Ollama chat endpoint"
+                "Ollama embed response missing 'embeddings' list "
+                f"(expected {len(batch)} vectors)"
             )
-        return message["content"]
+        try:
+            matrix = np.asarray(vectors, dtype=np.float32)
+        except (TypeError, ValueError):
+            matrix = None
+        if matrix is None or matrix.ndim != 2 or matrix.shape[1] == 0:
+            raise self._malformed_embed_error(vectors, batch)
 
-    def embed(self, texts: Sequence[str], *, model: str) -> List[List[float]]:
-        """Call ``/api/embeddings`` for each input and return embeddings."""
+        # Reason: one vectorized pass over the whole batch instead of per-row checks;
+        # NaN/inf rows would poison similarity search, so they are zeroed.
+        non_finite = ~np.isfinite(matrix).all(axis=1)
+        if non_finite.any():
+            matrix[non_finite] = 0.0
+        degenerate = np.flatnonzero(~matrix.any(axis=1))
+        if degenerate.size:
+            logger.warning(
+                "Ollama returned %d degenerate embeddings (zero or non-finite); "
+                "batch indices: %s",
+                degenerate.size,
+                degenerate[:20].tolist(),
+            )
+        return matrix
 
-        if isinstance(texts, str):  # type: ignore[unreachable]
-            texts = [texts]
+    @staticmethod
+    def _malformed_embed_error(
+        vectors: List[List[float]], batch: List[str]
+    ) -> OllamaClientError:
+        """Describe every missing, empty, non-numeric or wrong-sized row at once."""
 
-        embeddings: List[List[float]] = []
-        for text in texts:
-            payload = {"model": model, "prompt": text}
-            response = self._post_json("api/embeddings", payload)
-            vector = response.get("embedding")
-            if not isinstance(vector, list):
-                raise OllamaClientError(
-                    "Ollama embeddings response missing 'embedding' list"
-                )
-            if len(vector) == 0:
-                # Reason: Empty embeddings break RAG retrieval; fail fast with diagnostic info.
-                raise OllamaClientError(
-                    f"Ollama returned empty embedding for text: {text[:100]}... Response: {response}"
-                )
-            embeddings.append([float(v) for v in vector])
-        return embeddings
+        # Reason: scan the whole batch so the error lists all offending chunks
+        # rather than stopping at the first one.
+        lengths = [
+            len(vector) if isinstance(vector, (list, tuple)) else None
+            for vector in vectors
+        ]
+        sizes = Counter(length for length in lengths if length)
+        dim = sizes.most_common(1)[0][0] if sizes else 0
+        not_list: List[int] = []
+        empty: List[int] = []
+        non_numeric: List[int] = []
+        wrong_dim: List[int] = []
+        for index, (vector, length) in enumerate(zip(vectors, lengths)):
+            if length is None:
+                not_list.append(index)
+                continue
+            if not length:
+                empty.append(index)
+                continue
+            try:
+                np.asarray(vector, dtype=np.float32)
+            except (TypeError, ValueError):
+                non_numeric.append(index)
+                continue
+            if length != dim:
+                wrong_dim.append(index)
+
+        problems = [
+            f"{label} at batch indices {indices[:20]}"
+            for label, indices in (
+                ("not a list", not_list),
+                ("empty", empty),
+                ("non-numeric", non_numeric),
+                (f"dimension != {dim}", wrong_dim),
+            )
+            if indices
+        ]
+        if not problems:
+            return OllamaClientError(
+                "Ollama embed response contains vectors of inconsistent dimension"
+            )
+        bad = not_list + empty + non_numeric + wrong_dim
+        first = min(bad)
+        return OllamaClientError(
+            f"Ollama returned {len(bad)} "
+            f"malformed embeddings ({'; '.join(problems)}); "
+            f"first text: {batch[first][:100]}..."
+        )
+
+    @staticmethod
+    def _coerce_vector(vector: List[float], text: str) -> np.ndarray:
+        if len(vector) == 0:
+            # Reason: Empty embeddings break RAG retrieval; fail fast with diagnostic info.
+            raise OllamaClientError(
+                f"Ollama returned empty embedding for text: {text[:100]}..."
+            )
+        try:
+            return np.asarray(vector, dtype=np.float32)
+        except (TypeError, ValueError) as exc:
+            raise OllamaClientError(
+                f"Ollama returned non-numeric embedding for text: {text[:100]}..."
+            ) from exc
 
     def _build_messages(
         self,
@@ -94,58 +1053,243 @@ class OllamaClient:
         system_prompt: Optional[str],
         history: Optional[Sequence[dict]],
     ) -> List[dict]:
-        messages: List[dict] = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        if history:
+        """Assemble chat messages; ``history`` must be ``{"role", "content"}`` dicts."""
+
+        history = history or ()
+        if __debug__:
             for item in history:
-                role = item.get("role") if isinstance(item, dict) else None
-                content = item.get("content") if isinstance(item, dict) else None
-                if role and content:
-                    messages.append({"role": role, "content": content})
-        messages.append({"role": "user", "content": prompt})
+                assert (
+                    isinstance(item, dict) and "role" in item and "content" in item
+                ), f"history messages must be dicts with 'role' and 'content': {item!r}"
+
+        # Reason: long transcripts are the hot path; fill a preallocated list by
+        # index instead of re-validating and appending every message.
+        offset = 1 if system_prompt else 0
+        messages: List[Any] = [None] * (offset + len(history) + 1)
+        if system_prompt:
+            messages[0] = {"role": "system", "content": system_prompt}
+        for index, item in enumerate(history, offset):
+            messages[index] = {"role": item["role"], "content": item["content"]}
+        messages[-1] = {"role": "user", "content": prompt}
         return messages
 
-    def _post_json(self, path: str, payload: dict) -> dict:
-        url = urljoin(f"{self.base_url}/", path.lstrip("/"))
-        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    def _url(self, path: str) -> str:
+        url = self._urls.get(path)
+        if url is None:
+            url = f"{self.base_url}/{path.lstrip('/')}"
+        return url
+
+    def _post_json(
+        self,
+        path: str,
+        payload: dict | bytes,
+        *,
+        decode: Optional[Callable[[bytes], Any]] = None,
+        split_on_5xx: bool = False,
+    ) -> Any:
+        """POST ``payload`` (a dict or pre-encoded JSON body) and return the response.
+
+        The response is validated by ``decode`` if given. With ``split_on_5xx`` an
+        HTTP 5xx is raised straight away, without retries and without counting
+        against the circuit breaker, because the caller retries smaller requests.
+        """
+        url = self._url(path)
+        body = payload if isinstance(payload, bytes) else _encode_json(payload)
 
         attempt = 0
         delay = self.backoff_factor
         while True:
-            req = request.Request(
-                url,
-                data=body,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                },
-                method="POST",
-            )
+            self._breaker.check()
             try:
-                with request.urlopen(req, timeout=self.timeout) as resp:
-                    raw = resp.read().decode("utf-8")
-                    if resp.status >= 400:
-                        raise OllamaClientError(
-                            f"Ollama request failed with HTTP {resp.status}: {raw}"
-                        )
-                    return json.loads(raw or "{}")
-            except error.HTTPError as exc:
-                content = exc.read().decode("utf-8", "ignore")
-                if exc.code >= 500 and attempt < self.max_retries:
-                    # Reason: backend returned transient error, retry with backoff.
-                    time.sleep(delay)
-                    attempt += 1
-                    delay *= 2
-                    continue
-                raise OllamaClientError(
-                    f"Ollama request failed with HTTP {exc.code}: {content or exc.reason}"
-                ) from exc
-            except error.URLError as exc:
+                resp = self._pool.request("POST", url, body=body, headers=_JSON_HEADERS)
+            except urllib3.exceptions.HTTPError as exc:
+                self._breaker.record_failure()
                 if attempt >= self.max_retries:
                     raise OllamaClientError(
-                        f"Ollama at {url} is unreachable: {exc.reason}"
+                        f"Ollama at {url} is unreachable: {exc}"
                     ) from exc
                 time.sleep(delay)
                 attempt += 1
                 delay *= 2
+                continue
+            except BaseException:
+                self._breaker.release()
+                raise
+
+            raw = resp.data
+            if resp.status >= 500 and split_on_5xx:
+                self._breaker.release()
+            elif resp.status >= 500:
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
+            if resp.status >= 500 and attempt < self.max_retries and not split_on_5xx:
+                # Reason: backend returned transient error, retry with backoff.
+                time.sleep(delay)
+                attempt += 1
+                delay *= 2
+                continue
+            if resp.status >= 400:
+                raise OllamaClientError(
+                    f"Ollama request failed with HTTP {resp.status}: "
+                    f"{raw.decode('utf-8', 'ignore') or resp.reason}",
+                    status=resp.status,
+                )
+            if decode is not None:
+                return decode(raw)
+            return _decode_json(raw) if raw else {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        # Reason: aiohttp sessions are bound to the loop they were created on, so
+        # callers that use several asyncio.run() calls get one session per loop.
+        entry = self._sessions.get(loop)
+        if entry is not None and not entry[0].closed:
+            return entry[0]
+
+        for stale in [other for other in self._sessions if other.is_closed()]:
+            del self._sessions[stale]
+        # Reason: one session serves chat and every concurrent embed batch, so
+        # the connector must not become the bottleneck for the fan-out.
+        limit = max(64, self.embed_concurrency, self.embed_batch_concurrency)
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=limit, keepalive_timeout=120),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=_JSON_HEADERS,
+        )
+        guard = _close_on_loop_shutdown(session)
+        await anext(guard)
+        self._sessions[loop] = (session, guard)
+        return session
+
+    async def _apost_json(
+        self,
+        path: str,
+        payload: dict | bytes,
+        *,
+        decode: Optional[Callable[[bytes], Any]] = None,
+        split_on_5xx: bool = False,
+    ) -> Any:
+        url = self._url(path)
+        body = payload if isinstance(payload, bytes) else _encode_json(payload)
+        session = await self._get_session()
+
+        # Reason: bound total time spent backing off by the request timeout budget.
+        deadline = time.monotonic() + self.timeout
+        attempt = 0
+        delay = self.backoff_factor
+        while True:
+            self._breaker.check()
+            try:
+                async with session.post(url, data=body) as resp:
+                    status = resp.status
+                    raw = await resp.read()
+                    reason = resp.reason
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                self._breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise OllamaClientError(
+                        f"Ollama at {url} is unreachable: {exc}"
+                    ) from exc
+                await self._asleep_before_retry(delay, deadline)
+                attempt += 1
+                delay *= 2
+                continue
+            except BaseException:
+                self._breaker.release()
+                raise
+
+            if status >= 500 and split_on_5xx:
+                self._breaker.release()
+            elif status >= 500:
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
+            if status >= 500 and attempt < self.max_retries and not split_on_5xx:
+                # Reason: backend returned transient error, retry with backoff.
+                await self._asleep_before_retry(delay, deadline)
+                attempt += 1
+                delay *= 2
+                continue
+            if status >= 400:
+                raise OllamaClientError(
+                    f"Ollama request failed with HTTP {status}: "
+                    f"{raw.decode('utf-8', 'ignore') or reason}",
+                    status=status,
+                )
+            if decode is not None:
+                return decode(raw)
+            return _decode_json(raw) if raw else {}
+
+    async def _asleep_before_retry(self, delay: float, deadline: float) -> None:
+        # Reason: jitter spreads retries from many callers when Ollama restarts.
+        pause = delay * (0.5 + random.random() * 0.5)
+        if time.monotonic() + pause > deadline:
+            raise OllamaClientError(
+                f"Ollama retry budget exhausted ({self.timeout}s timeout)"
+            )
+        await asyncio.sleep(pause)
+
+
+class EmbedBatcher:
+    """Coalesce concurrent single-text embedding calls into batched requests.
+
+    Each :meth:`embed` call enqueues its text and awaits a future. A worker task drains
+    the queue for up to ``max_wait_ms`` (or until ``max_batch`` texts are queued), sends
+    one :meth:`OllamaClient.aembed` call per model, and resolves every caller's future
+    with its own row. A failed request fails each caller waiting on it.
+    """
+
+    def __init__(
+        self, client: OllamaClient, *, max_batch: int = 32, max_wait_ms: float = 10.0
+    ) -> None:
+        if max_batch <= 0:
+            raise ValueError("max_batch must be positive")
+        self.client = client
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def embed(self, text: str, *, model: str) -> np.ndarray:
+        future = self.loop.create_future()
+        self._queue.put_nowait((text, model, future))
+        if self._worker is None or self._worker.done():
+            self._worker = self.loop.create_task(self._run())
+        return await future
+
+    async def _run(self) -> None:
+        # Reason: the worker exits once the queue is empty; embed() restarts it.
+        while not self._queue.empty():
+            items = [self._queue.get_nowait()]
+            deadline = self.loop.time() + self.max_wait
+            while len(items) < self.max_batch:
+                timeout = deadline - self.loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._dispatch(items)
+
+    async def _dispatch(self, items: List[tuple[str, str, asyncio.Future]]) -> None:
+        by_model: dict[str, List[tuple[str, asyncio.Future]]] = {}
+        for text, model, future in items:
+            if not future.cancelled():
+                by_model.setdefault(model, []).append((text, future))
+
+        for model, pending in by_model.items():
+            try:
+                matrix = await self.client.aembed(
+                    [text for text, _ in pending], model=model
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), row in zip(pending, matrix):
+                if not future.done():
+                    future.set_result(row)
@@ -6,25 +6,128 @@ Contains configuration dataclasses with environment variable support.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List
+from functools import lru_cache
+from typing import Any, List, Optional, Set, Tuple
 import warnings
 
 from lightrag.utils import get_env_value
 
 
+_emitted_warnings: Set[Tuple[str, type]] = set()
+
+
+def _warn_once(message: str, category: type, stacklevel: int = 2) -> None:
+    """``warnings.warn`` that short-circuits for already-emitted messages.
+
+    Config objects may be built per request; ``warnings.warn`` walks frames and
+    the filter list on every call, so repeat warnings are skipped up front.
+    ``stacklevel`` is relative to the caller, as with ``warnings.warn``.
+    """
+
+    key = (message, category)
+    if key in _emitted_warnings:
+        return
+    _emitted_warnings.add(key)
+    warnings.warn(message, category, stacklevel=stacklevel + 1)
+
+
+# Reason: ``field(default=get_env_value(...))`` is evaluated once at import, but
+# default factories and ``__post_init__`` re-read the environment on every
+# ``RAGAnythingConfig()``. Memoize those lookups for the process lifetime.
+@lru_cache(maxsize=None)
+def _cached_env(env_key: str, default: Any, value_type: type = str) -> Any:
+    """Memoized :func:`get_env_value` for per-instance config lookups."""
+
+    return get_env_value(env_key, default, value_type)
+
+
+@lru_cache(maxsize=None)
+def _cached_env_list(env_key: str, default: str) -> Tuple[str, ...]:
+    """Memoized comma-separated env value, split once."""
+
+    return tuple(get_env_value(env_key, default, str).split(","))
+
+
+def clear_env_cache() -> None:
+    """Forget memoized environment lookups (call after reloading ``.env``)."""
+
+    _cached_env.cache_clear()
+    _cached_env_list.cache_clear()
+    _legacy_parse_method.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _legacy_parse_method() -> Optional[str]:
+    """Return MINERU_PARSE_METHOD when it should override PARSE_METHOD.
+
+    Warns only on the first lookup.
+    """
+
+    legacy = _cached_env("MINERU_PARSE_METHOD", None, str)
+    if not legacy or _cached_env("PARSE_METHOD", None, str):
+        return None
+    _warn_once(
+        "MINERU_PARSE_METHOD is deprecated. Use PARSE_METHOD instead.",
+        DeprecationWarning,
+        stacklevel=4,
+    )
+    return legacy
+
+
+@lru_cache(maxsize=256)
+def _validate_ollama_config(
+    base_url: str, embedding_dim: int, max_retries: int, mineru_vram: Optional[int]
+) -> Tuple[str, int, int, Optional[int]]:
+    """Normalize and validate Ollama/MinerU settings.
+
+    Memoized on the raw values: env-derived settings are identical across
+    instances, so repeated constructions skip the string work and warnings.
+    """
+
+    # Normalize Ollama URL for downstream HTTP clients.
+    base_url = (base_url or "").strip()
+    if base_url:
+        if not base_url.startswith(("http://", "https://")):
+            # Reason: LightRAG passes the URL across nodes; enforce explicit scheme.
+            base_url = f"http://{base_url}"
+        base_url = base_url.rstrip("/")
+
+    if embedding_dim <= 0:
+        _warn_once(
+            "OLLAMA_EMBED_DIM must be positive; falling back to 8192.",
+            RuntimeWarning,
+            stacklevel=4,
+        )
+        embedding_dim = 8192
+
+    if max_retries < 0:
+        _warn_once(
+            "OLLAMA_MAX_RETRIES cannot be negative; clamping to zero.",
+            RuntimeWarning,
+            stacklevel=4,
+        )
+        max_retries = 0
+
+    if mineru_vram is not None and mineru_vram <= 0:
+        # Treat zero/negative as "unset"
+        mineru_vram = None
+
+    return base_url, embedding_dim, max_retries, mineru_vram
+
+
 def _get_ollama_base_url() -> str:
     """Return the Ollama base URL using layered environment fallbacks."""
 
     # Prefer explicit base URL, then legacy host, finally the local default.
-    base_url = get_env_value("OLLAMA_BASE_URL", "", str)
+    base_url = _cached_env("OLLAMA_BASE_URL", "", str)
     if not base_url:
-        base_url = get_env_value("OLLAMA_HOST", "", str)
+        base_url = _cached_env("OLLAMA_HOST", "", str)
     if not base_url:
         return "http://127.0.0.1:11434"
     return base_url
 
 
-@dataclass
+@dataclass(slots=True)
 class RAGAnythingConfig:
     """Configuration class for RAGAnything with environment variable support"""
 
@@ -86,11 +189,12 @@ class RAGAnythingConfig:
     """Maximum number of files to process concurrently."""
 
     supported_file_extensions: List[str] = field(
-        default_factory=lambda: get_env_value(
-            "SUPPORTED_FILE_EXTENSIONS",
-            ".pdf,.jpg,.jpeg,.png,.bmp,.tiff,.tif,.gif,.webp,.doc,.docx,.ppt,.pptx,.xls,.xlsx,.txt,.md",
-            str,
-        ).split(",")
+        default_factory=lambda: list(
+            _cached_env_list(
+                "SUPPORTED_FILE_EXTENSIONS",
+                ".pdf,.jpg,.jpeg,.png,.bmp,.tiff,.tif,.gif,.webp,.doc,.docx,.ppt,.pptx,.xls,.xlsx,.txt,.md",
+            )
+        )
     )
     """List of supported file extensions for batch processing."""
 
@@ -121,9 +225,9 @@ class RAGAnythingConfig:
     """Whether to include image/table captions in context."""
 
     context_filter_content_types: List[str] = field(
-        default_factory=lambda: get_env_value(
-            "CONTEXT_FILTER_CONTENT_TYPES", "text", str
-        ).split(",")
+        default_factory=lambda: list(
+            _cached_env_list("CONTEXT_FILTER_CONTENT_TYPES", "text")
+        )
     )
     """Content types to include in context extraction (e.g., 'text', 'image', 'table')."""
 
@@ -171,6 +275,26 @@ class RAGAnythingConfig:
     )
     """Base backoff seconds between Ollama retry attempts."""
 
+    ollama_embed_batch_size: int = field(
+        default=get_env_value("OLLAMA_EMBED_BATCH_SIZE", 64, int)
+    )
+    """Maximum texts sent per batched ``/api/embed`` request."""
+
+    ollama_embed_concurrency: int = field(
+        default=get_env_value("OLLAMA_EMBED_CONCURRENCY", 4, int)
+    )
+    """Batched ``/api/embed`` requests kept in flight per embedding call."""
+
+    ollama_embed_cache_sq8: bool = field(
+        default=get_env_value("OLLAMA_EMBED_CACHE_SQ8", False, bool)
+    )
+    """Keep cached Ollama embeddings as SQ8 int8 codes (4x smaller, slightly lossy)."""
+
+    ollama_embed_cache_file: str = field(
+        default=get_env_value("OLLAMA_EMBED_CACHE_FILE", "", str)
+    )
+    """Ollama embedding cache file under ``working_dir``, kept across runs (empty disables)."""
+
     # Reranker Configuration
     # ---
     enable_rerank: bool = field(default=get_env_value("ENABLE_RERANK", True, bool))
@@ -194,42 +318,23 @@ class RAGAnythingConfig:
     def __post_init__(self):
         """Post-initialization setup for backward compatibility"""
         # Support legacy environment variable names for backward compatibility
-        legacy_parse_method = get_env_value("MINERU_PARSE_METHOD", None, str)
-        if legacy_parse_method and not get_env_value("PARSE_METHOD", None, str):
+        legacy_parse_method = _legacy_parse_method()
+        if legacy_parse_method:
             self.parse_method = legacy_parse_method
-            warnings.warn(
-                "MINERU_PARSE_METHOD is deprecated. Use PARSE_METHOD instead.",
-                DeprecationWarning,
-                stacklevel=2,
-            )
 
-        # Normalize Ollama URL for downstream HTTP clients.
-        base_url = (self.ollama_base_url or "").strip()
+        (
+            base_url,
+            self.ollama_embedding_dim,
+            self.ollama_max_retries,
+            self.mineru_vram,
+        ) = _validate_ollama_config(
+            self.ollama_base_url,
+            self.ollama_embedding_dim,
+            self.ollama_max_retries,
+            self.mineru_vram,
+        )
         if base_url:
-            if not base_url.startswith(("http://", "https://")):
-                # Reason: LightRAG passes the URL across nodes; enforce explicit scheme.
-                base_url = f"http://{base_url}"
-            self.ollama_base_url = base_url.rstrip("/")
-
-        if self.ollama_embedding_dim <= 0:
-            warnings.warn(
-                "OLLAMA_EMBED_DIM must be positive; falling back to 8192.",
-                RuntimeWarning,
-                stacklevel=2,
-            )
-            self.ollama_embedding_dim = 8192
-
-        if self.ollama_max_retries < 0:
-            warnings.warn(
-                "OLLAMA_MAX_RETRIES cannot be negative; clamping to zero.",
-                RuntimeWarning,
-                stacklevel=2,
-            )
-            self.ollama_max_retries = 0
-
-        if self.mineru_vram is not None and self.mineru_vram <= 0:
-            # Treat zero/negative as "unset"
-            self.mineru_vram = None
+            self.ollama_base_url = base_url
 
         # Note: Reranker validation is now handled by backend/model_factory.py
         # The backend passes rerank_model_func directly to RAGAnything, so we don't
@@ -241,14 +346,14 @@ class RAGAnythingConfig:
         if self.enable_rerank and not self.reranker_model_path:
             # Check if we're being used directly (not through backend)
             # If RERANKER_PROVIDER is set to 'api', don't warn
-            reranker_provider = get_env_value("RERANKER_PROVIDER", "", str)
+            reranker_provider = _cached_env("RERANKER_PROVIDER", "", str)
             if reranker_provider != "api":
                 # Reason: FlagEmbedding cannot load without a cached model location.
-                warnings.warn(
+                _warn_once(
                     "ENABLE_RERANK is true but RERANKER_MODEL_PATH is empty; disabling reranker stage. "
                     "Set RERANKER_PROVIDER=api if using API-based reranker.",
                     RuntimeWarning,
-                    stacklevel=2,
+                    stacklevel=3,
                 )
                 self.enable_rerank = False
 
@@ -260,19 +365,18 @@ class RAGAnythingConfig:
         .. deprecated::
            Use `parse_method` instead. This property will be removed in a future version.
         """
-        warnings.warn(
+        # Reason: legacy callers may read the alias in per-chunk loops.
+        _warn_once(
             "mineru_parse_method is deprecated. Use parse_method instead.",
             DeprecationWarning,
-            stacklevel=2,
         )
         return self.parse_method
 
     @mineru_parse_method.setter
     def mineru_parse_method(self, value: str):
         """Setter for backward compatibility"""
-        warnings.warn(
+        _warn_once(
             "mineru_parse_method is deprecated. Use parse_method instead.",
             DeprecationWarning,
-            stacklevel=2,
         )
         self.parse_method = value
@@ -13,6 +13,7 @@ import asyncio
 import atexit
 from dataclasses import dataclass, field
 
+import numpy as np
 from lightrag import LightRAG
 from lightrag.utils import EmbeddingFunc, logger
 
@@ -171,6 +172,9 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 timeout=self.config.ollama_request_timeout,
                 max_retries=self.config.ollama_max_retries,
                 backoff_factor=self.config.ollama_retry_backoff,
+                embed_batch_size=self.config.ollama_embed_batch_size,
+                embed_batch_concurrency=self.config.ollama_embed_concurrency,
+                embed_cache_sq8=self.config.ollama_embed_cache_sq8,
             )
         except Exception as exc:  # pylint: disable=broad-except
             self.logger.warning("Skipping Ollama auto-binding: %s", exc, exc_info=False)
@@ -178,6 +182,22 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
 
         self._ollama_client = client
 
+        cache_path = self._ollama_embed_cache_path()
+        if cache_path:
+            try:
+                loaded = client.load_embed_cache(cache_path)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.logger.warning(
+                    "Ignoring unreadable Ollama embedding cache %s: %s",
+                    cache_path,
+                    exc,
+                )
+            else:
+                if loaded:
+                    self.logger.info(
+                        "Loaded %d cached Ollama embeddings from %s", loaded, cache_path
+                    )
+
         if self.llm_model_func is None:
             self.llm_model_func = self._create_ollama_llm_func(client)
             self.logger.info(
@@ -192,6 +212,27 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 self.config.ollama_embed_model,
             )
 
+    def _ollama_embed_cache_path(self) -> Optional[str]:
+        cache_file = getattr(self.config, "ollama_embed_cache_file", "")
+        if not cache_file:
+            return None
+        return os.path.join(self.config.working_dir, cache_file)
+
+    def _save_ollama_embed_cache(self) -> None:
+        cache_path = self._ollama_embed_cache_path()
+        if not cache_path:
+            return
+        # Reason: a small synchronous write; finalization may also run from the
+        # atexit hook, where executor threads can no longer be started.
+        try:
+            saved = self._ollama_client.save_embed_cache(cache_path)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.logger.warning(
+                "Failed to save Ollama embedding cache %s: %s", cache_path, exc
+            )
+        else:
+            self.logger.debug("Saved %d Ollama embeddings to %s", saved, cache_path)
+
     def _create_ollama_llm_func(self, client):  # type: ignore[override]
         async def _call_llm(
             prompt,
@@ -207,45 +248,53 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 if key in kwargs and kwargs[key] is not None
             }
 
+            if stream:
+                # Reason: LightRAG expects an AsyncIterator when streaming is
+                # requested; relay Ollama's deltas as they arrive so callers see
+                # the first tokens without waiting for the whole answer.
+                async def _stream():
+                    try:
+                        async for chunk in client.astream_chat(
+                            prompt,
+                            model=self.config.ollama_llm_model,
+                            system_prompt=system_prompt,
+                            history_messages=history_messages,
+                            options=options or None,
+                        ):
+                            yield chunk
+                    except Exception as exc:  # pylint: disable=broad-except
+                        raise RuntimeError(f"Ollama chat failed: {exc}") from exc
+
+                return _stream()
+
             try:
-                # Reason: LightRAG awaits LLM func; wrap sync client.chat in asyncio.to_thread
-                response = await asyncio.to_thread(
-                    client.chat,
+                # Reason: await the client's aiohttp transport directly instead of
+                # hopping to a worker thread for every call.
+                return await client.achat(
                     prompt,
                     model=self.config.ollama_llm_model,
                     system_prompt=system_prompt,
                     history_messages=history_messages,
-                    stream=False,  # Force non-streaming for sync client
+                    stream=False,
                     options=options or None,
                 )
             except Exception as exc:  # pylint: disable=broad-except
                 raise RuntimeError(f"Ollama chat failed: {exc}") from exc
 
-            if stream:
-                # Reason: LightRAG expects AsyncIterator when streaming is requested.
-                async def _stream_once():
-                    yield response
-
-                return _stream_once()
-
-            return response
-
         return _call_llm
 
     def _create_ollama_embedding_func(self, client):
         async def _embed(texts):
-            import numpy as np
-
             payload = list(texts)
             try:
-                vectors = await asyncio.to_thread(
-                    client.embed,
-                    payload,
-                    model=self.config.ollama_embed_model,
+                vectors = await client.aembed(
+                    payload, model=self.config.ollama_embed_model
                 )
             except Exception as exc:  # pylint: disable=broad-except
                 raise RuntimeError(f"Ollama embeddings failed: {exc}") from exc
-            return np.asarray(vectors, dtype=float)
+            # Reason: the client already returns float32; upcasting to float64 would
+            # double the memory and I/O of every vector LightRAG stores.
+            return np.asarray(vectors, dtype=np.float32)
 
         return EmbeddingFunc(
             embedding_dim=self.config.ollama_embedding_dim,
@@ -289,8 +338,6 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
 
     def close(self):
         """Cleanup resources when object is destroyed"""
-        import asyncio
-
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
@@ -546,6 +593,13 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 tasks.append(self.lightrag.finalize_storages())
                 self.logger.debug("Scheduled LightRAG storages finalization")
 
+            # Persist the Ollama embedding cache and release the client's
+            # pooled connections and session
+            if self._ollama_client is not None:
+                self._save_ollama_embed_cache()
+                tasks.append(self._ollama_client.aclose())
+                self.logger.debug("Scheduled Ollama client shutdown")
+
             # Run all finalization tasks concurrently
             if tasks:
                 await asyncio.gather(*tasks)
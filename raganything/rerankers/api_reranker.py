@@ -10,51 +10,259 @@ Supports multiple reranker API providers:
 from __future__ import annotations
 
 import asyncio
+import atexit
+import json
 import logging
+import threading
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Sequence
+from enum import IntEnum
+from typing import Any, Callable, ClassVar, Dict, List, Sequence, Tuple
 
 import httpx
 
 from .flagembedding import RerankerError
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+_MAX_KEEPALIVE_CONNECTIONS = 5
+_MAX_CONNECTIONS = 10
+
+# Reason: rerankers are often created per tenant/config reload; sharing one
+# client per (loop, timeout, limits) reuses TLS sessions and sockets across them.
+# httpx async clients are bound to the event loop they first ran on.
+_SHARED_CLIENTS: Dict[
+    Tuple[asyncio.AbstractEventLoop, float, int, int], httpx.AsyncClient
+] = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+
+def _get_shared_client(timeout: float) -> httpx.AsyncClient:
+    """Return the pooled client for the running loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    key = (loop, timeout, _MAX_KEEPALIVE_CONNECTIONS, _MAX_CONNECTIONS)
+    client = _SHARED_CLIENTS.get(key)
+    if client is not None and not client.is_closed:
+        return client
+
+    with _SHARED_CLIENTS_LOCK:
+        # Drop clients whose event loop is gone; they can never be used again.
+        for stale in [k for k in _SHARED_CLIENTS if k[0].is_closed()]:
+            del _SHARED_CLIENTS[stale]
+        client = _SHARED_CLIENTS.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(timeout),
+                limits=httpx.Limits(
+                    max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+                    max_connections=_MAX_CONNECTIONS,
+                ),
+            )
+            _SHARED_CLIENTS[key] = client
+    return client
+
+
+def _close_shared_clients_at_exit() -> None:
+    """Best-effort close of pooled clients whose loop is still usable."""
+    for (loop, *_), client in list(_SHARED_CLIENTS.items()):
+        if client.is_closed or loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(client.aclose())
+        except Exception:  # pylint: disable=broad-except
+            pass
+    _SHARED_CLIENTS.clear()
+
+
+atexit.register(_close_shared_clients_at_exit)
+
+
+def _encode_json(payload: Dict[str, Any]) -> bytes:
+    # Reason: payloads carry every document in the batch; orjson encodes them
+    # straight to UTF-8 bytes several times faster than the stdlib.
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_json(raw: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class Provider(IntEnum):
+    """Reranker API providers; anything unrecognized uses the generic format."""
+
+    JINA = 0
+    COHERE = 1
+    VOYAGE = 2
+    OPENAI = 3
+    GENERIC = 4
+
+    @classmethod
+    def from_name(cls, name: str) -> "Provider":
+        return cls.__members__.get(name.strip().upper(), cls.GENERIC)
+
+
+_DEFAULT_BASE_URLS: Dict[Provider, str] = {
+    Provider.JINA: "https://api.jina.ai/v1/rerank",
+    Provider.COHERE: "https://api.cohere.ai/v1/rerank",
+    Provider.VOYAGE: "https://api.voyageai.com/v1/rerank",
+    Provider.OPENAI: "https://api.openai.com/v1/rerank",
+}
+
+
+# Request templates: provider -> (result-count key, constant extra fields).
+# Payloads are {"model", "query", "documents", <count key>: N, **extras}.
+# ---
+
+_REQUEST_FORMATS: Dict[Provider, Tuple[str | None, Dict[str, Any]]] = {
+    Provider.JINA: ("top_n", {}),  # Return all documents with scores
+    Provider.COHERE: ("top_n", {"return_documents": False}),  # We only need scores
+    Provider.VOYAGE: ("top_k", {}),
+    Provider.OPENAI: (None, {}),  # OpenAI-compatible format (hypothetical)
+    Provider.GENERIC: (None, {}),
+}
+
+
+# Response parsers: (response JSON, expected count) -> scores in input order
+# ---
+
+
+def _scatter_scores(
+    items: List[Dict[str, Any]], expected_count: int, score_key: str | None
+) -> List[float]:
+    """Place each item's score at its ``index``; missing slots score 0.0.
+
+    ``score_key=None`` accepts either ``relevance_score`` or ``score``. Items
+    without an ``index`` are taken in response order.
+    """
+    if len(items) != expected_count:
+        logger.warning(
+            f"Expected {expected_count} scores but got {len(items)}. "
+            f"Padding with zeros."
+        )
+    # Reason: indices are dense in [0, N); a direct scatter avoids sorting.
+    scores = [0.0] * expected_count
+    for position, item in enumerate(items):
+        idx = item.get("index", position)
+        if 0 <= idx < expected_count:
+            if score_key is None:
+                value = item.get("relevance_score") or item.get("score", 0.0)
+            else:
+                value = item.get(score_key, 0.0)
+            scores[idx] = float(value)
+    return scores
+
+
+def _parse_results(response_data: Dict[str, Any], expected_count: int) -> List[float]:
+    # Jina/Cohere return: {"results": [{"index": 0, "relevance_score": 0.95}, ...]}
+    return _scatter_scores(
+        response_data.get("results", []), expected_count, "relevance_score"
+    )
+
+
+def _parse_voyage(response_data: Dict[str, Any], expected_count: int) -> List[float]:
+    # Voyage returns: {"data": [{"index": 0, "relevance_score": 0.95}, ...]}
+    return _scatter_scores(
+        response_data.get("data", []), expected_count, "relevance_score"
+    )
+
+
+def _parse_openai(response_data: Dict[str, Any], expected_count: int) -> List[float]:
+    return _scatter_scores(response_data.get("results", []), expected_count, "score")
+
 
-@dataclass
+def _parse_generic(response_data: Dict[str, Any], expected_count: int) -> List[float]:
+    # Generic: try to find scores in common formats
+    if "results" in response_data:
+        items = response_data["results"]
+    elif "data" in response_data:
+        items = response_data["data"]
+    else:
+        raise ValueError(f"Unknown response format: {response_data.keys()}")
+    return _scatter_scores(items, expected_count, None)
+
+
+@dataclass(slots=True)
 class APIReranker:
-    """API-based reranker with support for multiple providers."""
+    """API-based reranker with support for multiple providers.
+
+    Provider-specific request templates and response parsers are resolved once in
+    ``__post_init__``; unknown providers with an explicit ``base_url`` use the
+    generic format.
+    """
 
     provider: str  # "jina", "cohere", "voyage", "openai"
     model_name: str
     api_key: str
-    base_url: str | None = None
+    base_url: str = ""
+    """Rerank endpoint; empty selects the provider's default URL."""
     batch_size: int = 16
     timeout: float = 30.0
     max_retries: int = 3
-
-    _client: httpx.AsyncClient | None = field(default=None, init=False, repr=False)
+    max_concurrent_batches: int = 8
+    """Upper bound on batches in flight per query, to stay under provider rate limits."""
+
+    _RESPONSE_PARSERS: ClassVar[
+        Dict[Provider, Callable[[Dict[str, Any], int], List[float]]]
+    ] = {
+        Provider.JINA: _parse_results,
+        Provider.COHERE: _parse_results,
+        Provider.VOYAGE: _parse_voyage,
+        Provider.OPENAI: _parse_openai,
+        Provider.GENERIC: _parse_generic,
+    }
+
+    _provider_id: Provider = field(init=False, repr=False)
+    _request_template: Dict[str, Any] = field(init=False, repr=False)
+    _count_key: str | None = field(init=False, repr=False)
+    _parse: Callable[[Dict[str, Any], int], List[float]] = field(init=False, repr=False)
+    _headers: Dict[str, str] = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
-        """Validate configuration and set defaults."""
+        """Validate configuration, set defaults and bind provider handlers."""
         if self.batch_size <= 0:
             raise ValueError("batch_size must be positive for APIReranker")
+        if self.max_concurrent_batches <= 0:
+            raise ValueError("max_concurrent_batches must be positive for APIReranker")
+
+        # Keep the provider string for logs/config; dispatch on the enum.
+        self._provider_id = Provider.from_name(self.provider)
 
         # Set default base URLs for known providers
         if not self.base_url:
-            if self.provider == "jina":
-                self.base_url = "https://api.jina.ai/v1/rerank"
-            elif self.provider == "cohere":
-                self.base_url = "https://api.cohere.ai/v1/rerank"
-            elif self.provider == "voyage":
-                self.base_url = "https://api.voyageai.com/v1/rerank"
-            elif self.provider == "openai":
-                self.base_url = "https://api.openai.com/v1/rerank"
-            else:
+            default_url = _DEFAULT_BASE_URLS.get(self._provider_id)
+            if default_url is None:
                 raise ValueError(
                     f"Unknown provider '{self.provider}'. "
                     "Please specify base_url for custom providers."
                 )
+            self.base_url = default_url
+
+        # Reason: only query/documents/count vary per batch; build the rest once.
+        self._count_key, extras = _REQUEST_FORMATS[self._provider_id]
+        self._request_template = {
+            "model": self.model_name,
+            "query": "",
+            "documents": [],
+        }
+        if self._count_key is not None:
+            self._request_template[self._count_key] = 0
+        self._request_template.update(extras)
+        self._parse = self._RESPONSE_PARSERS[self._provider_id]
+        # Reason: every supported provider authenticates with a Bearer token.
+        self._headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}",
+        }
 
         logger.info(
             f"Initialized APIReranker: provider={self.provider}, "
@@ -62,19 +270,31 @@ class APIReranker:
         )
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                timeout=httpx.Timeout(self.timeout),
-                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-            )
-        return self._client
+        """Get the HTTP client shared by all rerankers with the same settings."""
+        return _get_shared_client(self.timeout)
 
     async def close(self) -> None:
-        """Close HTTP client."""
-        if self._client is not None:
-            await self._client.aclose()
-            self._client = None
+        """Release this reranker.
+
+        The HTTP client is shared with other rerankers, so it stays open; use
+        :meth:`shutdown_all` to close pooled connections.
+        """
+
+    @classmethod
+    async def shutdown_all(cls) -> None:
+        """Close every pooled HTTP client bound to the running event loop.
+
+        Clients of event loops that have already closed cannot be awaited
+        any more and are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        with _SHARED_CLIENTS_LOCK:
+            for stale in [k for k in _SHARED_CLIENTS if k[0].is_closed()]:
+                del _SHARED_CLIENTS[stale]
+            owned = [key for key in _SHARED_CLIENTS if key[0] is loop]
+            clients = [_SHARED_CLIENTS.pop(key) for key in owned]
+        for client in clients:
+            await client.aclose()
 
     async def score_async(self, query: str, documents: Sequence[str]) -> List[float]:
         """
@@ -90,210 +310,110 @@ class APIReranker:
         if not documents:
             return []
 
-        # Process in batches if needed
-        all_scores: List[float] = []
+        # Materialize once; list slices are already lists and go straight into
+        # the JSON payload without further copies.
+        docs = documents if isinstance(documents, list) else list(documents)
+        batches = [
+            docs[i : i + self.batch_size] for i in range(0, len(docs), self.batch_size)
+        ]
+        if len(batches) == 1:
+            return await self._score_batch(query, batches[0])
 
-        for i in range(0, len(documents), self.batch_size):
-            batch = documents[i : i + self.batch_size]
-            batch_scores = await self._score_batch(query, batch)
-            all_scores.extend(batch_scores)
+        # Reason: batches are independent; overlap their round-trips instead of
+        # paying one RTT per batch, bounded to avoid tripping rate limits.
+        semaphore = asyncio.Semaphore(self.max_concurrent_batches)
 
-        return all_scores
+        async def _bounded(batch: List[str]) -> List[float]:
+            async with semaphore:
+                return await self._score_batch(query, batch)
 
-    async def _score_batch(self, query: str, documents: Sequence[str]) -> List[float]:
+        results = await asyncio.gather(*(_bounded(batch) for batch in batches))
+        return [score for batch_scores in results for score in batch_scores]
+
+    async def _score_batch(self, query: str, documents: List[str]) -> List[float]:
         """Score a single batch of documents."""
         client = await self._get_client()
 
-        # Prepare request based on provider
-        request_data = self._prepare_request(query, documents)
-        headers = self._prepare_headers()
+        content = self._encode_request(query, documents)
 
         # Retry logic
-        last_error = None
+        last_error: Exception | None = None
         for attempt in range(self.max_retries):
             try:
                 response = await client.post(
-                    self.base_url,  # type: ignore[arg-type]
-                    json=request_data,
-                    headers=headers,
-                )
-                response.raise_for_status()
-
-                # Parse response based on provider
-                scores = self._parse_response(response.json(), len(documents))
-                return scores
-
-            except httpx.HTTPStatusError as exc:
-                last_error = exc
-                logger.warning(
-                    f"Reranker API request failed (attempt {attempt + 1}/{self.max_retries}): "
-                    f"HTTP {exc.response.status_code} - {exc.response.text}"
+                    self.base_url,
+                    content=content,
+                    headers=self._headers,
                 )
-
-                # Don't retry on client errors (4xx)
-                if 400 <= exc.response.status_code < 500:
-                    raise RerankerError(
-                        f"Reranker API client error: {exc.response.status_code} - {exc.response.text}"
-                    ) from exc
-
-                # Exponential backoff for server errors
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(2**attempt)
-
             except Exception as exc:
                 last_error = exc
                 logger.warning(
                     f"Reranker API request failed (attempt {attempt + 1}/{self.max_retries}): {exc}"
                 )
-
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(2**attempt)
+            else:
+                # Reason: check the status inline so the happy path builds no
+                # HTTPStatusError and the body is only decoded to text on errors.
+                status_code = response.status_code
+                if 200 <= status_code < 300:
+                    try:
+                        return self._parse_response(
+                            _decode_json(response.content), len(documents)
+                        )
+                    except Exception as exc:
+                        last_error = exc
+                        logger.warning(
+                            f"Reranker API request failed (attempt {attempt + 1}/{self.max_retries}): {exc}"
+                        )
+                else:
+                    body = response.text
+                    logger.warning(
+                        f"Reranker API request failed (attempt {attempt + 1}/{self.max_retries}): "
+                        f"HTTP {status_code} - {body}"
+                    )
+
+                    # Don't retry on client errors (4xx)
+                    if 400 <= status_code < 500:
+                        raise RerankerError(
+                            f"Reranker API client error: {status_code} - {body}"
+                        )
+
+                    last_error = httpx.HTTPStatusError(
+                        f"HTTP {status_code} - {body}",
+                        request=response.request,
+                        response=response,
+                    )
+
+            # Exponential backoff before the next attempt
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(2**attempt)
 
         # All retries failed
         raise RerankerError(
             f"Reranker API request failed after {self.max_retries} attempts: {last_error}"
         ) from last_error
 
-    def _prepare_headers(self) -> Dict[str, str]:
-        """Prepare HTTP headers based on provider."""
-        headers = {"Content-Type": "application/json"}
-
-        if self.provider == "jina":
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        elif self.provider == "cohere":
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        elif self.provider == "voyage":
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        elif self.provider == "openai":
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        else:
-            # Generic: assume Bearer token
-            headers["Authorization"] = f"Bearer {self.api_key}"
-
-        return headers
-
-    def _prepare_request(self, query: str, documents: Sequence[str]) -> Dict[str, Any]:
-        """Prepare request payload based on provider."""
-        if self.provider == "jina":
-            # Jina API format
-            return {
-                "model": self.model_name,
-                "query": query,
-                "documents": list(documents),
-                "top_n": len(documents),  # Return all documents with scores
-            }
-
-        elif self.provider == "cohere":
-            # Cohere API format
-            return {
-                "model": self.model_name,
-                "query": query,
-                "documents": list(documents),
-                "top_n": len(documents),
-                "return_documents": False,  # We only need scores
-            }
-
-        elif self.provider == "voyage":
-            # Voyage AI API format
-            return {
-                "model": self.model_name,
-                "query": query,
-                "documents": list(documents),
-                "top_k": len(documents),
-            }
-
-        elif self.provider == "openai":
-            # OpenAI-compatible format (hypothetical)
-            return {
-                "model": self.model_name,
-                "query": query,
-                "documents": list(documents),
-            }
-
-        else:
-            # Generic format (similar to OpenAI)
-            return {
-                "model": self.model_name,
-                "query": query,
-                "documents": list(documents),
-            }
+    def _encode_request(self, query: str, documents: List[str]) -> bytes:
+        """Fill the request template for one batch and encode it."""
+        request = self._request_template
+        request["query"] = query
+        request["documents"] = documents
+        if self._count_key is not None:
+            request[self._count_key] = len(documents)
+        try:
+            # Reason: no await between filling and encoding, so concurrent batches
+            # on the same event loop cannot interleave on the shared template.
+            return _encode_json(request)
+        finally:
+            # Don't keep the last batch's documents alive via the template.
+            request["documents"] = []
 
     def _parse_response(
         self, response_data: Dict[str, Any], expected_count: int
     ) -> List[float]:
         """Parse API response and extract scores."""
         try:
-            if self.provider == "jina":
-                # Jina returns: {"results": [{"index": 0, "relevance_score": 0.95}, ...]}
-                results = response_data.get("results", [])
-                # Sort by index to maintain order
-                results_sorted = sorted(results, key=lambda x: x.get("index", 0))
-                scores = [float(r.get("relevance_score", 0.0)) for r in results_sorted]
-
-            elif self.provider == "cohere":
-                # Cohere returns: {"results": [{"index": 0, "relevance_score": 0.95}, ...]}
-                results = response_data.get("results", [])
-                results_sorted = sorted(results, key=lambda x: x.get("index", 0))
-                scores = [float(r.get("relevance_score", 0.0)) for r in results_sorted]
-
-            elif self.provider == "voyage":
-                # Voyage returns: {"data": [{"index": 0, "relevance_score": 0.95}, ...]}
-                data = response_data.get("data", [])
-                data_sorted = sorted(data, key=lambda x: x.get("index", 0))
-                scores = [float(d.get("relevance_score", 0.0)) for d in data_sorted]
-
-            elif self.provider == "openai":
-                # OpenAI-compatible format
-                results = response_data.get("results", [])
-                results_sorted = sorted(results, key=lambda x: x.get("index", 0))
-                scores = [float(r.get("score", 0.0)) for r in results_sorted]
-
-            else:
-                # Generic: try to find scores in common formats
-                if "results" in response_data:
-                    results = response_data["results"]
-                    results_sorted = sorted(results, key=lambda x: x.get("index", 0))
-                    scores = [
-                        float(r.get("relevance_score") or r.get("score", 0.0))
-                        for r in results_sorted
-                    ]
-                elif "data" in response_data:
-                    data = response_data["data"]
-                    data_sorted = sorted(data, key=lambda x: x.get("index", 0))
-                    scores = [
-                        float(d.get("relevance_score") or d.get("score", 0.0))
-                        for d in data_sorted
-                    ]
-                else:
-                    raise ValueError(f"Unknown response format: {response_data.keys()}")
-
-            # Validate score count
-            if len(scores) != expected_count:
-                logger.warning(
-                    f"Expected {expected_count} scores but got {len(scores)}. "
-                    f"Padding with zeros."
-                )
-                # Pad with zeros if needed
-                while len(scores) < expected_count:
-                    scores.append(0.0)
-                # Truncate if too many
-                scores = scores[:expected_count]
-
-            return scores
-
+            return self._parse(response_data, expected_count)
         except Exception as exc:
             raise RerankerError(
                 f"Failed to parse reranker response: {exc}. Response: {response_data}"
             ) from exc
-
-    def __del__(self) -> None:
-        """Cleanup on deletion."""
-        if self._client is not None:
-            # Schedule cleanup in event loop if available
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self.close())
-            except RuntimeError:
-                # No event loop, can't cleanup
-                pass
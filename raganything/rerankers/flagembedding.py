@@ -3,35 +3,66 @@
 from __future__ import annotations
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from threading import Lock
-from typing import Iterable, List, Sequence
+from typing import Dict, List, Sequence, Set, Tuple
+
+# Reason: reranker weights are multi-GB; instances created with the same path and
+# precision (config reloads, tests, several RAG instances) share one loaded model.
+_MODEL_CACHE: Dict[Tuple[str, bool], object] = {}
+_MODEL_CACHE_LOCK = Lock()
+_VALIDATED_PATHS: Set[str] = set()
+
+# Reason: the GPU is the serialized resource; a dedicated single-thread pool keeps
+# CUDA state warm on one thread instead of contending in asyncio's default pool.
+_EXECUTORS: Dict[int, ThreadPoolExecutor] = {}
+_EXECUTORS_LOCK = Lock()
+
+
+def _get_executor(num_workers: int) -> ThreadPoolExecutor:
+    executor = _EXECUTORS.get(num_workers)
+    if executor is None:
+        with _EXECUTORS_LOCK:
+            executor = _EXECUTORS.get(num_workers)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=num_workers, thread_name_prefix="flag-rerank"
+                )
+                _EXECUTORS[num_workers] = executor
+    return executor
 
 
 class RerankerError(RuntimeError):
     """Raised when the FlagEmbedding reranker cannot be constructed or executed."""
 
 
-@dataclass
+@dataclass(slots=True)
 class FlagEmbeddingReranker:
     """Lazy loader around ``FlagLLMReranker`` with simple batching support."""
 
     model_path: str
     use_fp16: bool = True
     batch_size: int = 16
+    num_workers: int = 1
+    """Scoring threads shared by rerankers with the same setting (raise for multi-GPU)."""
     _model: object | None = field(default=None, init=False, repr=False)
     _lock: Lock = field(default_factory=Lock, init=False, repr=False)
 
     def __post_init__(self) -> None:
-        resolved = Path(self.model_path).expanduser()
-        if not resolved.exists():
-            raise RerankerError(
-                f"FlagEmbedding model path '{resolved}' does not exist; pre-download the weights."
-            )
-        self.model_path = str(resolved)
+        resolved = str(Path(self.model_path).expanduser())
+        if resolved not in _VALIDATED_PATHS:
+            if not Path(resolved).exists():
+                raise RerankerError(
+                    f"FlagEmbedding model path '{resolved}' does not exist; pre-download the weights."
+                )
+            _VALIDATED_PATHS.add(resolved)
+        self.model_path = resolved
         if self.batch_size <= 0:
             raise ValueError("batch_size must be positive for FlagEmbeddingReranker")
+        if self.num_workers <= 0:
+            raise ValueError("num_workers must be positive for FlagEmbeddingReranker")
 
     def score(self, query: str, documents: Sequence[str]) -> List[float]:
         """Synchronously score documents for a single query."""
@@ -40,53 +71,78 @@ class FlagEmbeddingReranker:
             return []
 
         reranker = self._ensure_model()
-        scores: List[float] = []
-        for batch in _chunk_sequence(documents, self.batch_size):
-            batch_scores = [
-                _to_float(reranker.compute_score([query, doc]))  # type: ignore[attr-defined]
-                for doc in batch
-            ]
-            scores.extend(batch_scores)
-        return scores
+        pairs = [[query, doc] for doc in documents]
+        # Reason: one call lets FlagEmbedding pad and run ``batch_size`` pairs per
+        # forward pass instead of one model invocation per document.
+        raw = reranker.compute_score(pairs, batch_size=self.batch_size)  # type: ignore[attr-defined]
+        # FlagEmbedding returns a bare score (not a list) for a single pair.
+        if not isinstance(raw, (list, tuple)):
+            raw = raw.tolist() if len(pairs) > 1 and hasattr(raw, "tolist") else [raw]
+        if len(raw) != len(pairs):
+            raise RerankerError(
+                f"FlagEmbedding returned {len(raw)} scores for {len(pairs)} documents"
+            )
+        return [_to_float(score) for score in raw]
 
     async def score_async(self, query: str, documents: Sequence[str]) -> List[float]:
-        """Asynchronously score documents by offloading to a worker thread."""
+        """Asynchronously score documents on the reranker's dedicated worker pool."""
 
-        return await asyncio.to_thread(self.score, query, list(documents))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_executor(self.num_workers), self.score, query, documents
+        )
 
     def _ensure_model(self) -> object:
         if self._model is not None:
             return self._model
         with self._lock:
             if self._model is None:
-                try:
-                    # Lazily import FlagEmbedding to avoid startup cost when rerank is disabled.
-                    from FlagEmbedding import FlagLLMReranker
-
-                    self._model = FlagLLMReranker(
-                        self.model_path,
-                        use_fp16=self.use_fp16,
-                    )
-                except Exception as exc:  # pylint: disable=broad-except
-                    raise RerankerError(
-                        f"Failed to initialize FlagEmbedding reranker: {exc}"
-                    ) from exc
+                self._model = _load_model(self.model_path, self.use_fp16)
         return self._model
 
 
-def _chunk_sequence(items: Sequence[str], size: int) -> Iterable[Sequence[str]]:
-    for start in range(0, len(items), size):
-        yield items[start : start + size]
+def _load_model(model_path: str, use_fp16: bool) -> object:
+    """Return the process-wide ``FlagLLMReranker`` for ``(model_path, use_fp16)``."""
+
+    key = (model_path, use_fp16)
+    model = _MODEL_CACHE.get(key)
+    if model is not None:
+        return model
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            try:
+                # Lazily import FlagEmbedding to avoid startup cost when rerank is disabled.
+                from FlagEmbedding import FlagLLMReranker
+
+                model = FlagLLMReranker(model_path, use_fp16=use_fp16)
+            except Exception as exc:  # pylint: disable=broad-except
+                raise RerankerError(
+                    f"Failed to initialize FlagEmbedding reranker: {exc}"
+                ) from exc
+            _MODEL_CACHE[key] = model
+    return model
 
 
 def _to_float(value: object) -> float:
+    value_type = type(value)
+    if value_type is float:
+        return value  # type: ignore[return-value]
+    if value_type is int:
+        return float(value)  # type: ignore[arg-type]
+    # Reason: FlagEmbedding may return torch.Tensor/np.ndarray objects; convert safely.
+    item = getattr(value, "item", None)
+    if item is not None:
+        return float(item())
+    tolist = getattr(value, "tolist", None)
+    if tolist is not None:
+        arr = tolist()
+        if isinstance(arr, (list, tuple)):
+            if arr:
+                return float(arr[0])
+        else:
+            return float(arr)
     if isinstance(value, (float, int)):
+        # float/int subclasses (e.g. bool) are rare; keep them working.
         return float(value)
-    # Reason: FlagEmbedding may return torch.Tensor/np.ndarray objects; convert safely.
-    if hasattr(value, "item"):
-        return float(value.item())  # type: ignore[call-arg]
-    if hasattr(value, "tolist"):
-        arr = value.tolist()  # type: ignore[call-arg]
-        if isinstance(arr, (list, tuple)) and arr:
-            return float(arr[0])
-    raise RerankerError(f"Unsupported reranker score type: {type(value)!r}")
+    raise RerankerError(f"Unsupported reranker score type: {value_type!r}")
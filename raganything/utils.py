@@ -7,6 +7,8 @@ Contains helper functions for content separation, text insertion, and other util
 import base64
 from typing import Dict, List, Any, Tuple
 from pathlib import Path
+
+import numpy as np
 from lightrag.utils import logger
 
 
@@ -272,3 +274,46 @@ def get_processor_supports(proc_type: str) -> List[str]:
         ],
     }
     return supports_map.get(proc_type, ["Basic processing"])
+
+
+def quantize_sq8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Scalar-quantize float vectors to int8 using per-vector min/max (SQ8)
+
+    Args:
+        vectors: Array of shape (dim,) or (n, dim)
+
+    Returns:
+        (codes, scale, zero_point): int8 codes with the same shape as ``vectors``,
+        plus float32 per-vector scale and minimum needed by ``dequantize_sq8``
+    """
+    arr = np.asarray(vectors, dtype=np.float32)
+    vmin = arr.min(axis=-1, keepdims=True)
+    scale = (arr.max(axis=-1, keepdims=True) - vmin) / 255.0
+    # Constant vectors have no range; any non-zero scale round-trips them exactly.
+    scale[scale == 0] = 1.0
+    codes = np.rint((arr - vmin) / scale) - 128.0
+    return (
+        codes.astype(np.int8),
+        scale.squeeze(-1).astype(np.float32),
+        vmin.squeeze(-1).astype(np.float32),
+    )
+
+
+def dequantize_sq8(
+    codes: np.ndarray, scale: np.ndarray, zero_point: np.ndarray
+) -> np.ndarray:
+    """
+    Reconstruct float32 vectors from ``quantize_sq8`` output
+
+    Args:
+        codes: int8 codes of shape (dim,) or (n, dim)
+        scale: Per-vector scale returned by ``quantize_sq8``
+        zero_point: Per-vector minimum returned by ``quantize_sq8``
+
+    Returns:
+        np.ndarray: float32 vectors with the same shape as ``codes``
+    """
+    scale = np.asarray(scale, dtype=np.float32)[..., None]
+    zero_point = np.asarray(zero_point, dtype=np.float32)[..., None]
+    return (codes.astype(np.float32) + 128.0) * scale + zero_point
@@ -21,6 +21,7 @@ Usage:
 
 import argparse
 import asyncio
+import re
 import sys
 from pathlib import Path
 from typing import Any, Dict, List
@@ -30,6 +31,9 @@ from typing import Any, Dict, List
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# Sentence-ish chunks: maximal runs of text between periods.
+_SENT_RE = re.compile(r"[^.]+")
+
 
 def print_header(title: str):
     print("\n" + "=" * 80)
@@ -37,6 +41,17 @@ def print_header(title: str):
     print("=" * 80 + "\n")
 
 
+def _contains(obj: Any, needle: str) -> bool:
+    """Return True if any string nested in ``obj`` contains ``needle``."""
+    if isinstance(obj, str):
+        return needle in obj
+    if isinstance(obj, dict):
+        return any(_contains(v, needle) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_contains(x, needle) for x in obj)
+    return False
+
+
 async def run_test(args) -> Dict[str, Any]:
     from backend.config import ModelConfig, ModelType, ProviderType
     from backend.providers.local_embedding import LocalEmbeddingProvider
@@ -83,14 +98,17 @@ async def run_test(args) -> Dict[str, Any]:
     doc_de = "Berlin is the capital of Germany. The Brandenburg Gate is in Berlin."
     doc_cn = "Beijing is the capital of China. The Forbidden City is in Beijing."
 
-    # Use simple sentence chunks
-    async def insert_doc(full: str, doc_id: str):
-        chunks = [s.strip() for s in full.split(".") if s.strip()]
-        await rag.ainsert_custom_chunks(full, chunks, doc_id)
-
-    await insert_doc(doc_fr, "doc-fr")
-    await insert_doc(doc_de, "doc-de")
-    await insert_doc(doc_cn, "doc-cn")
+    # Use simple sentence chunks. ainsert_custom_chunks holds LightRAG's
+    # pipeline reservation and rejects concurrent calls, so the corpus goes in
+    # as one combined document: all chunks are embedded in a single batch.
+    docs = (doc_fr, doc_de, doc_cn)
+    chunks = [
+        chunk
+        for doc in docs
+        for chunk in (m.group().strip() for m in _SENT_RE.finditer(doc))
+        if chunk
+    ]
+    await rag.ainsert_custom_chunks(" ".join(docs), chunks, "doc-capitals")
 
     # 5) Query (retrieval-only path)
     qp = QueryParam(
@@ -99,10 +117,10 @@ async def run_test(args) -> Dict[str, Any]:
     q = args.query
     result = await rag.aquery_data(q, qp)
 
-    # 6) Basic assertion: retrieved context should contain the target fact
-    # Fall back to lenient string inspection of the result dictionary
-    blob = str(result)
-    success = "Paris is the capital of France" in blob or "Paris" in blob
+    # 6) Basic assertion: retrieved context should contain the target fact.
+    # Walk the result structure (short-circuiting on the first hit) rather than
+    # stringifying the whole payload.
+    success = _contains(result, "Paris")
 
     # 7) Cleanup
     await provider.shutdown()
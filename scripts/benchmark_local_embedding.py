@@ -20,14 +20,20 @@ Usage:
 
     # Custom configuration
     python scripts/benchmark_local_embedding.py --device cuda:0 --batch-size 64
+
+    # Compare precisions (memory + throughput per dtype)
+    python scripts/benchmark_local_embedding.py --dtype-sweep float16,bfloat16,int8
 """
 
 import asyncio
 import argparse
+import random
 import time
 import sys
+from functools import lru_cache
+from itertools import cycle, islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import numpy as np
 
 # Add project root to path
@@ -49,6 +55,97 @@ def print_section(title: str):
     print(f"{'─'*80}")
 
 
+# Bytes per GiB for the memory monitor
+_GB = 1 << 30
+
+# Batch sizes exercised by the memory benchmark; the shared warmup covers the
+# largest of these.
+MEMORY_BATCH_SIZES = [32, 64, 128]
+
+# Precisions accepted by --dtype / --dtype-sweep ("int8" = 8-bit weights).
+SWEEP_DTYPES = ["float16", "bfloat16", "float32", "int8"]
+
+
+@lru_cache(maxsize=None)
+def _test_texts(length: str = "medium") -> Tuple[str, ...]:
+    """
+    Return the test text pool for a given length ("short", "medium", "long",
+    or "mixed" for all three interleaved).
+
+    Pools are built once and shared by every benchmark, so the "long" strings
+    are joined a single time rather than on each run.
+    """
+    if length == "mixed":
+        pools = (_test_texts("short"), _test_texts("medium"), _test_texts("long"))
+        return tuple(text for group in zip(*pools) for text in group)
+    if length == "short":
+        return (
+            "This is a short test sentence for embedding.",
+            "Another short example text.",
+            "Quick brown fox jumps over the lazy dog.",
+        )
+    elif length == "long":
+        return (
+            " ".join(["This is a longer test sentence with more tokens."] * 20),
+            " ".join(["Another example of a long text for testing."] * 20),
+            " ".join(["Performance testing requires realistic data."] * 20),
+        )
+    else:  # medium
+        return (
+            "This is a medium-length test sentence for embedding performance testing. "
+            "It contains enough tokens to be realistic but not too long to slow down tests.",
+            "Another medium-length example text that simulates typical document chunks. "
+            "This helps us measure realistic performance under normal workload conditions.",
+            "Performance benchmarking requires representative test data that matches "
+            "the expected input distribution in production environments.",
+        )
+
+
+def _length_classes(length: str) -> Tuple[Tuple[str, ...], ...]:
+    """Per-length-class pools behind ``length`` (three for "mixed", else one)."""
+    if length == "mixed":
+        return tuple(_test_texts(name) for name in ("short", "medium", "long"))
+    return (_test_texts(length),)
+
+
+def _cycle_texts(pool: Tuple[str, ...], count: int) -> List[str]:
+    """Return ``count`` texts drawn round-robin from ``pool``."""
+    # Reason: cycle/islice walk the pool in C, with no per-text modulo or
+    # index lookup, and reuse the pooled string objects.
+    return list(islice(cycle(pool), max(count, 0)))
+
+
+def _request_length(request: List[str]) -> int:
+    """Approximate padded length of a request: its longest text, in characters."""
+    return max(map(len, request), default=0)
+
+
+def _token_counter(provider) -> Callable[[str], int]:
+    """
+    Return a per-text token counter using the provider's tokenizer.
+
+    Falls back to character count when the provider exposes no tokenizer.
+    """
+    inner = getattr(provider, "inner", provider)
+    processor = getattr(inner, "batch_processor", None)
+    if processor is None:
+        return len
+    return lambda text: processor._count_texts_tokens([text])
+
+
+def _device_time_ms(provider) -> Optional[float]:
+    """
+    Return the provider's accumulated CUDA-event encode time in ms.
+
+    Returns None unless the provider was built with ``cuda_events`` enabled.
+    """
+    inner = getattr(provider, "inner", provider)
+    processor = getattr(inner, "batch_processor", None)
+    if processor is None or not getattr(processor, "cuda_events", False):
+        return None
+    return processor.device_time_ms
+
+
 class GPUMemoryMonitor:
     """GPU memory monitoring utility (device-normalized)."""
 
@@ -71,13 +168,19 @@ class GPUMemoryMonitor:
             except Exception:
                 self.device_index = 0
 
+        # Bind the torch.cuda callables once so the per-sample getters skip
+        # the module attribute chain.
+        self._allocated = torch.cuda.memory_allocated
+        self._peak = torch.cuda.max_memory_allocated
+        self._reserved = torch.cuda.memory_reserved
+
     def get_memory_usage(self) -> float:
         """Get current GPU memory usage in GB."""
-        return self.torch.cuda.memory_allocated(self.device_index) / 1024**3
+        return self._allocated(self.device_index) / _GB
 
     def get_peak_memory(self) -> float:
         """Get peak GPU memory usage in GB."""
-        return self.torch.cuda.max_memory_allocated(self.device_index) / 1024**3
+        return self._peak(self.device_index) / _GB
 
     def reset_peak_memory(self):
         """Reset peak memory statistics."""
@@ -85,13 +188,55 @@ class GPUMemoryMonitor:
 
     def get_memory_summary(self) -> Dict[str, float]:
         """Get comprehensive memory summary."""
+        index = self.device_index
         return {
-            "allocated_gb": self.get_memory_usage(),
-            "peak_gb": self.get_peak_memory(),
-            "reserved_gb": self.torch.cuda.memory_reserved(self.device_index) / 1024**3,
+            "allocated_gb": self._allocated(index) / _GB,
+            "peak_gb": self._peak(index) / _GB,
+            "reserved_gb": self._reserved(index) / _GB,
         }
 
 
+class CachedProvider:
+    """
+    Embedding provider adapter that memoizes results by text.
+
+    The benchmark pools contain only a handful of distinct strings, so with
+    this adapter each unique text reaches the model once and repeated texts
+    are served from memory.
+    """
+
+    def __init__(self, inner):
+        """Wrap ``inner`` (any object with an async ``embed(texts)``)."""
+        self.inner = inner
+        self._cache: Dict[str, np.ndarray] = {}
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts``, only sending uncached ones to the wrapped provider."""
+        cache = self._cache
+        # Reason: dict.fromkeys dedups misses while preserving order.
+        misses = list(dict.fromkeys(t for t in texts if t not in cache))
+        if misses:
+            embeddings = await self.inner.embed(misses)
+            cache.update(zip(misses, embeddings))
+        return np.stack([cache[t] for t in texts])
+
+
+async def warmup(provider, monitor: GPUMemoryMonitor | None, batch_size: int) -> None:
+    """
+    Run one shared warmup pass before any benchmark.
+
+    Embeds the longest test text at the largest configured batch size so
+    kernel selection and allocator growth happen up front, then resets the
+    peak memory counter so the memory benchmark measures steady state only.
+    """
+    longest = max(_test_texts("long"), key=len)
+    _ = await provider.embed([longest] * batch_size)
+
+    if monitor is not None:
+        monitor.torch.cuda.synchronize(monitor.device_index)
+        monitor.reset_peak_memory()
+
+
 class ThroughputBenchmark:
     """Throughput benchmark for embedding service."""
 
@@ -100,7 +245,11 @@ class ThroughputBenchmark:
         self.provider = provider
 
     async def run(
-        self, batch_sizes: List[int] = [100, 500, 1000], text_length: str = "medium"
+        self,
+        batch_sizes: List[int] = [100, 500, 1000],
+        text_length: str = "medium",
+        bucket_by_length: bool = False,
+        max_in_flight: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Run throughput benchmark with concurrent requests.
@@ -109,69 +258,123 @@ class ThroughputBenchmark:
         by sending multiple small requests simultaneously, which better
         reflects real-world usage patterns.
 
+        Each request draws its texts from one length class, consecutive
+        requests rotating through the classes (only "mixed" has more than one).
+        With ``bucket_by_length`` the same requests are also sent sorted by
+        length, so the batcher groups similar-length texts and pads less. The
+        unsorted and sorted passes run in ABBA order and each throughput is
+        the mean of its two passes, so warm-up favors neither.
+
         Args:
             batch_sizes: List of total texts to test (sent as concurrent requests)
-            text_length: Text length ("short", "medium", "long")
+            text_length: Text length ("short", "medium", "long", "mixed")
+            bucket_by_length: Also measure throughput with length-sorted requests
+            max_in_flight: Cap on concurrently pending requests (None = no cap)
 
         Returns:
             Benchmark results
         """
         print_section("Throughput Benchmark")
 
-        # Generate test texts
-        test_texts = self._generate_test_texts(text_length)
+        # Generate test texts and tokenize each distinct text once
+        classes = _length_classes(text_length)
+        count_tokens = _token_counter(self.provider)
+        text_tokens = {text: count_tokens(text) for pool in classes for text in pool}
+
+        # A request spec is (length class, number of texts)
+        def build(spec: Tuple[int, int]) -> List[str]:
+            length_class, request_size = spec
+            return _cycle_texts(classes[length_class], request_size)
+
+        if bucket_by_length and len(classes) == 1:
+            print("  Note: single length class; use --text-length mixed to bucket")
 
         results = {}
 
         for total_texts in batch_sizes:
             print(f"\nTesting {total_texts} texts (concurrent requests)")
 
-            # Warmup
-            _ = await self.provider.embed([test_texts[0]])
-
-            # Prepare concurrent requests (each request has 1-5 texts)
+            # Prepare concurrent request specs (each request has 3-5 texts).
+            # Only specs are stored; texts are built as requests are issued.
             # This simulates realistic concurrent usage
-            requests = []
+            specs: List[Tuple[int, int]] = []
             texts_per_request = 3  # Average texts per request
             num_requests = total_texts // texts_per_request
 
             for i in range(num_requests):
-                # Vary request size slightly for realism
+                # Vary request size slightly for realism, independently of the
+                # request's length class
                 request_size = min(
-                    texts_per_request + (i % 3), total_texts - i * texts_per_request
+                    texts_per_request + (i // len(classes)) % 3,
+                    total_texts - i * texts_per_request,
                 )
                 if request_size <= 0:
                     break
-                request_texts = [
-                    test_texts[j % len(test_texts)] for j in range(request_size)
+                specs.append((i % len(classes), request_size))
+
+            passes = [("plain", specs)]
+            if bucket_by_length:
+                bucketed = sorted(specs, key=lambda spec: _request_length(build(spec)))
+                passes = [
+                    ("plain", specs),
+                    ("bucketed", bucketed),
+                    ("bucketed", bucketed),
+                    ("plain", specs),
                 ]
-                requests.append(request_texts)
 
             # Benchmark concurrent requests
-            start_time = time.perf_counter()
-
-            # Send all requests concurrently
-            tasks = [self.provider.embed(req) for req in requests]
-            embeddings_list = await asyncio.gather(*tasks)
-
-            end_time = time.perf_counter()
+            elapsed_runs: Dict[str, List[float]] = {"plain": [], "bucketed": []}
+            device_ms = 0.0
+            for label, order in passes:
+                device_start_ms = _device_time_ms(self.provider)
+                pass_elapsed, total_processed = await self._send_concurrently(
+                    order, build, max_in_flight
+                )
+                elapsed_runs[label].append(pass_elapsed)
+                if device_start_ms is not None and label == "plain":
+                    device_ms += _device_time_ms(self.provider) - device_start_ms
 
-            # Calculate metrics
-            total_processed = sum(len(emb) for emb in embeddings_list)
-            elapsed = end_time - start_time
+            elapsed = float(np.mean(elapsed_runs["plain"]))
             throughput = total_processed / elapsed
+            spec_tokens = {
+                spec: sum(text_tokens[t] for t in build(spec)) for spec in set(specs)
+            }
+            total_tokens = sum(spec_tokens[spec] for spec in specs)
+            token_throughput = total_tokens / elapsed
 
             results[total_texts] = {
                 "elapsed_s": elapsed,
                 "throughput_texts_per_sec": throughput,
-                "num_requests": len(requests),
+                "throughput_tokens_per_sec": token_throughput,
+                "num_requests": len(specs),
                 "total_texts": total_processed,
             }
 
-            print(f"  Requests: {len(requests)}")
+            print(f"  Requests: {len(specs)}")
             print(f"  Total texts: {total_processed}")
             print(f"  Elapsed: {elapsed:.3f}s")
             print(f"  Throughput: {throughput:.1f} texts/sec")
+            print(f"  Token throughput: {token_throughput:.1f} tokens/sec")
+
+            # Host time includes Python/asyncio overhead; device time covers
+            # only encode() on the GPU. A large gap points at the host side.
+            if _device_time_ms(self.provider) is not None:
+                device_s = device_ms / len(elapsed_runs["plain"]) / 1000
+                device_throughput = total_processed / device_s if device_s else 0.0
+                results[total_texts]["device_elapsed_s"] = device_s
+                results[total_texts]["throughput_device_texts_per_sec"] = (
+                    device_throughput
+                )
+                print(f"  Device time: {device_s:.3f}s")
+                print(f"  Device throughput: {device_throughput:.1f} texts/sec")
+
+            if bucket_by_length:
+                bucketed_elapsed = float(np.mean(elapsed_runs["bucketed"]))
+                bucketed_throughput = total_processed / bucketed_elapsed
+                results[total_texts]["bucketed_throughput_texts_per_sec"] = (
+                    bucketed_throughput
+                )
+                print(f"  Bucketed: {bucketed_throughput:.1f} texts/sec")
 
             # Check if meets target
             if throughput >= 100:
@@ -181,29 +384,121 @@ class ThroughputBenchmark:
 
         return results
 
-    def _generate_test_texts(self, length: str = "medium") -> List[str]:
-        """Generate test texts of different lengths."""
-        if length == "short":
-            return [
-                "This is a short test sentence for embedding.",
-                "Another short example text.",
-                "Quick brown fox jumps over the lazy dog.",
-            ]
-        elif length == "long":
-            return [
-                " ".join(["This is a longer test sentence with more tokens."] * 20),
-                " ".join(["Another example of a long text for testing."] * 20),
-                " ".join(["Performance testing requires realistic data."] * 20),
-            ]
-        else:  # medium
-            return [
-                "This is a medium-length test sentence for embedding performance testing. "
-                "It contains enough tokens to be realistic but not too long to slow down tests.",
-                "Another medium-length example text that simulates typical document chunks. "
-                "This helps us measure realistic performance under normal workload conditions.",
-                "Performance benchmarking requires representative test data that matches "
-                "the expected input distribution in production environments.",
-            ]
+    async def run_sustained(
+        self,
+        duration_s: float,
+        arrival_rate: float,
+        text_length: str = "medium",
+        texts_per_request: int = 3,
+    ) -> Dict[str, Any]:
+        """
+        Run a sustained-load throughput test with Poisson arrivals.
+
+        Requests arrive with exponentially distributed gaps (mean
+        ``1 / arrival_rate``) until ``duration_s`` elapses, so the dynamic
+        batcher reaches steady state instead of flushing a single burst.
+        Throughput is computed from completions in the middle 80% of the run,
+        ignoring startup and drain.
+
+        Args:
+            duration_s: How long to keep generating requests
+            arrival_rate: Mean request arrival rate (requests/sec)
+            text_length: Text length ("short", "medium", "long", "mixed")
+            texts_per_request: Texts per request
+
+        Returns:
+            Benchmark results
+        """
+        print_section("Sustained Throughput Benchmark")
+        print(
+            f"Duration: {duration_s:.1f}s, arrival rate: {arrival_rate:.1f} req/s, "
+            f"{texts_per_request} texts/request"
+        )
+
+        texts = _cycle_texts(self._generate_test_texts(text_length), texts_per_request)
+        # (completion time, texts embedded) per finished request
+        completions: List[Tuple[float, int]] = []
+        pending: set = set()
+
+        async def one_request() -> None:
+            embeddings = await self.provider.embed(texts)
+            completions.append((time.perf_counter(), len(embeddings)))
+
+        start_time = time.perf_counter()
+        deadline = start_time + duration_s
+        sent = 0
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(random.expovariate(arrival_rate))
+            task = asyncio.create_task(one_request())
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            sent += 1
+
+        if pending:
+            await asyncio.gather(*pending)
+        end_time = time.perf_counter()
+
+        window_start = start_time + 0.1 * duration_s
+        window_end = start_time + 0.9 * duration_s
+        steady_texts = sum(n for t, n in completions if window_start <= t <= window_end)
+        steady_throughput = steady_texts / (window_end - window_start)
+        total_texts = sum(n for _, n in completions)
+
+        results = {
+            "duration_s": duration_s,
+            "arrival_rate": arrival_rate,
+            "num_requests": sent,
+            "total_texts": total_texts,
+            "elapsed_s": end_time - start_time,
+            "offered_texts_per_sec": arrival_rate * texts_per_request,
+            "steady_throughput_texts_per_sec": steady_throughput,
+        }
+
+        print(f"  Requests: {sent}")
+        print(f"  Total texts: {total_texts}")
+        print(f"  Offered load: {results['offered_texts_per_sec']:.1f} texts/sec")
+        print(f"  Steady-state throughput: {steady_throughput:.1f} texts/sec")
+
+        return results
+
+    async def _send_concurrently(
+        self,
+        specs: List[Tuple[int, int]],
+        build: Callable[[Tuple[int, int]], List[str]],
+        max_in_flight: Optional[int] = None,
+    ) -> Tuple[float, int]:
+        """
+        Issue one request per spec and return ``(elapsed_s, texts_embedded)``.
+
+        Requests are built and scheduled lazily: new tasks are created only
+        while fewer than ``max_in_flight`` are pending, so task creation
+        overlaps model execution instead of materializing every coroutine
+        before the first one runs.
+        """
+        limit = max_in_flight or len(specs) or 1
+        pending: set = set()
+        total = 0
+
+        start_time = time.perf_counter()
+
+        for spec in specs:
+            if len(pending) >= limit:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                total += sum(len(task.result()) for task in done)
+            pending.add(asyncio.ensure_future(self.provider.embed(build(spec))))
+
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            total += sum(len(task.result()) for task in done)
+
+        end_time = time.perf_counter()
+        return end_time - start_time, total
+
+    def _generate_test_texts(self, length: str = "medium") -> Tuple[str, ...]:
+        """Return the shared test text pool for ``length``."""
+        return _test_texts(length)
 
 
 class LatencyBenchmark:
@@ -214,14 +509,23 @@ class LatencyBenchmark:
         self.provider = provider
 
     async def run(
-        self, num_requests: int = 100, text_length: str = "medium"
+        self,
+        num_requests: int = 100,
+        text_length: str = "medium",
+        concurrency: int = 1,
     ) -> Dict[str, Any]:
         """
         Run latency benchmark.
 
+        With ``concurrency > 1`` up to that many single-text requests are kept
+        in flight at once, so the measured latency includes queueing inside the
+        provider's dynamic batcher. A serial pass is then run first to report
+        the uncontended ("cold") p50 for comparison.
+
         Args:
             num_requests: Number of requests to test
             text_length: Text length ("short", "medium", "long")
+            concurrency: Maximum number of in-flight requests
 
         Returns:
             Benchmark results with percentiles
@@ -231,42 +535,30 @@ class LatencyBenchmark:
         # Generate test texts
         test_texts = self._generate_test_texts(text_length)
 
-        print(f"Testing {num_requests} requests...")
+        serial_p50 = None
+        if concurrency > 1:
+            print(f"Testing {num_requests} requests (serial baseline)...")
+            serial = await self._measure(test_texts, num_requests, 1)
+            serial_p50 = float(np.median(serial))
 
-        # Warmup
-        _ = await self.provider.embed([test_texts[0]])
+        print(f"Testing {num_requests} requests (concurrency={concurrency})...")
+        latencies = await self._measure(test_texts, num_requests, concurrency)
 
-        # Collect latencies
-        latencies = []
-
-        for i in range(num_requests):
-            text = test_texts[i % len(test_texts)]
-
-            start_time = time.perf_counter()
-            _ = await self.provider.embed([text])
-            end_time = time.perf_counter()
-
-            latency_ms = (end_time - start_time) * 1000
-            latencies.append(latency_ms)
-
-            if (i + 1) % 20 == 0:
-                print(f"  Progress: {i + 1}/{num_requests}")
-
-        # Calculate percentiles
-        latencies_array = np.array(latencies)
-        p50 = np.percentile(latencies_array, 50)
-        p95 = np.percentile(latencies_array, 95)
-        p99 = np.percentile(latencies_array, 99)
-        mean = np.mean(latencies_array)
+        # Calculate percentiles: sort once, then read all quantiles and the
+        # min/max from the sorted buffer instead of re-scanning per statistic.
+        latencies_array = np.sort(latencies)
+        p50, p95, p99 = np.quantile(latencies_array, [0.5, 0.95, 0.99])
+        mean = latencies_array.mean()
 
         results = {
             "num_requests": num_requests,
+            "concurrency": concurrency,
             "mean_ms": mean,
             "p50_ms": p50,
             "p95_ms": p95,
             "p99_ms": p99,
-            "min_ms": np.min(latencies_array),
-            "max_ms": np.max(latencies_array),
+            "min_ms": latencies_array[0],
+            "max_ms": latencies_array[-1],
         }
 
         print("\nLatency Statistics:")
@@ -276,6 +568,9 @@ class LatencyBenchmark:
         print(f"  p99:    {p99:.2f} ms")
         print(f"  Min:    {results['min_ms']:.2f} ms")
         print(f"  Max:    {results['max_ms']:.2f} ms")
+        if serial_p50 is not None:
+            results["serial_p50_ms"] = serial_p50
+            print(f"  Serial p50: {serial_p50:.2f} ms")
 
         # Check if meets target
         if p95 < 200:
@@ -285,29 +580,41 @@ class LatencyBenchmark:
 
         return results
 
-    def _generate_test_texts(self, length: str = "medium") -> List[str]:
-        """Generate test texts (same as ThroughputBenchmark)."""
-        if length == "short":
-            return [
-                "This is a short test sentence for embedding.",
-                "Another short example text.",
-                "Quick brown fox jumps over the lazy dog.",
-            ]
-        elif length == "long":
-            return [
-                " ".join(["This is a longer test sentence with more tokens."] * 20),
-                " ".join(["Another example of a long text for testing."] * 20),
-                " ".join(["Performance testing requires realistic data."] * 20),
-            ]
-        else:  # medium
-            return [
-                "This is a medium-length test sentence for embedding performance testing. "
-                "It contains enough tokens to be realistic but not too long to slow down tests.",
-                "Another medium-length example text that simulates typical document chunks. "
-                "This helps us measure realistic performance under normal workload conditions.",
-                "Performance benchmarking requires representative test data that matches "
-                "the expected input distribution in production environments.",
-            ]
+    async def _measure(
+        self, test_texts: Tuple[str, ...], num_requests: int, concurrency: int
+    ) -> np.ndarray:
+        """
+        Time ``num_requests`` single-text embeds with bounded concurrency.
+
+        Returns per-request latencies in milliseconds.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        # Reason: record raw integer nanosecond stamps into preallocated
+        # buffers so the loop between awaits does no float math or list growth.
+        starts = np.empty(num_requests, dtype=np.int64)
+        ends = np.empty_like(starts)
+        completed = 0
+        progress_every = max(20, num_requests // 10)
+
+        async def one(i: int, text: str) -> None:
+            nonlocal completed
+            async with semaphore:
+                starts[i] = time.perf_counter_ns()
+                _ = await self.provider.embed([text])
+                ends[i] = time.perf_counter_ns()
+
+            completed += 1
+            if completed % progress_every == 0:
+                print(f"  Progress: {completed}/{num_requests}")
+
+        await asyncio.gather(
+            *(one(i, text) for i, text in zip(range(num_requests), cycle(test_texts)))
+        )
+        return (ends - starts).astype(np.float64) / 1e6
+
+    def _generate_test_texts(self, length: str = "medium") -> Tuple[str, ...]:
+        """Return the shared test text pool (same as ThroughputBenchmark)."""
+        return _test_texts(length)
 
 
 class MemoryBenchmark:
@@ -342,7 +649,7 @@ class MemoryBenchmark:
             print(f"\nTesting batch size: {batch_size} texts")
 
             # Prepare batch
-            texts = [test_texts[i % len(test_texts)] for i in range(batch_size)]
+            texts = _cycle_texts(test_texts, batch_size)
 
             # Reset peak memory
             self.monitor.reset_peak_memory()
@@ -378,29 +685,9 @@ class MemoryBenchmark:
 
         return results
 
-    def _generate_test_texts(self, length: str = "medium") -> List[str]:
-        """Generate test texts."""
-        if length == "short":
-            return [
-                "This is a short test sentence for embedding.",
-                "Another short example text.",
-                "Quick brown fox jumps over the lazy dog.",
-            ]
-        elif length == "long":
-            return [
-                " ".join(["This is a longer test sentence with more tokens."] * 20),
-                " ".join(["Another example of a long text for testing."] * 20),
-                " ".join(["Performance testing requires realistic data."] * 20),
-            ]
-        else:  # medium
-            return [
-                "This is a medium-length test sentence for embedding performance testing. "
-                "It contains enough tokens to be realistic but not too long to slow down tests.",
-                "Another medium-length example text that simulates typical document chunks. "
-                "This helps us measure realistic performance under normal workload conditions.",
-                "Performance benchmarking requires representative test data that matches "
-                "the expected input distribution in production environments.",
-            ]
+    def _generate_test_texts(self, length: str = "medium") -> Tuple[str, ...]:
+        """Return the shared test text pool."""
+        return _test_texts(length)
 
 
 class EndToEndTest:
@@ -422,6 +709,8 @@ class EndToEndTest:
 
         try:
             # Import required modules
+            import torch
+
             from backend.config import ModelConfig, ModelType, ProviderType
             from backend.providers.local_embedding import LocalEmbeddingProvider
 
@@ -452,20 +741,32 @@ class EndToEndTest:
                 "The Eiffel Tower is located in Paris.",
             ]
 
+            # Warm phase: the first call pays for CUDA context setup and kernel
+            # selection, so keep it out of the timed region.
+            _ = await provider.embed(["."])
+            torch.cuda.synchronize(provider.device)
+
+            # Measure phase: steady-state latency averaged over several calls.
+            # Only shape/dtype are checked, so keep the result on device and
+            # skip the device-to-host copy.
+            iterations = 10
             start_time = time.perf_counter()
-            embeddings = await provider.embed(test_texts)
+            for _ in range(iterations):
+                embeddings = await provider.embed(test_texts, to_numpy=False)
+            torch.cuda.synchronize(provider.device)
             end_time = time.perf_counter()
 
-            elapsed = end_time - start_time
+            elapsed = (end_time - start_time) / iterations
 
             print(f"  Generated {len(test_texts)} embeddings")
-            print(f"  Shape: {embeddings.shape}")
-            print(f"  Time: {elapsed*1000:.2f} ms")
+            print(f"  Shape: {tuple(embeddings.shape)}")
+            print(f"  Time: {elapsed*1000:.2f} ms (mean of {iterations} warm calls)")
             print(f"  Dimension: {embeddings.shape[1]}")
 
             # Verify embedding properties
-            assert embeddings.shape[0] == len(test_texts), "Wrong number of embeddings"
-            assert embeddings.shape[1] == 2560, "Wrong embedding dimension"
+            assert tuple(embeddings.shape) == (len(test_texts), 2560), (
+                "Wrong embedding shape"
+            )
 
             # Shutdown provider
             await provider.shutdown()
@@ -490,6 +791,76 @@ class EndToEndTest:
             }
 
 
+def build_provider(args, dtype: str = "float16"):
+    """
+    Create a LocalEmbeddingProvider from CLI args.
+
+    ``dtype`` is "float16", "bfloat16", "float32", or "int8" (8-bit weights
+    with float16 compute, via bitsandbytes).
+    """
+    from backend.config import ModelConfig, ModelType, ProviderType
+    from backend.providers.local_embedding import LocalEmbeddingProvider
+
+    extra_params = {
+        "device": args.device,
+        "dtype": "float16" if dtype == "int8" else dtype,
+        "attn_implementation": "sdpa",
+        "max_batch_size": args.batch_size,
+        "max_wait_time": args.max_wait_time,
+        "encode_batch_size": args.encode_batch_size,
+        "max_batch_tokens": args.max_batch_tokens,
+        "cuda_events": args.cuda_events,
+    }
+    if dtype == "int8":
+        extra_params["load_in_8bit"] = True
+
+    embedding_config = ModelConfig(
+        provider=ProviderType.LOCAL_GPU,
+        model_name=args.model,
+        model_type=ModelType.EMBEDDING,
+        embedding_dim=2560,
+        extra_params=extra_params,
+    )
+    return LocalEmbeddingProvider(embedding_config)
+
+
+async def run_dtype_sweep(args, dtypes: List[str]) -> Dict[str, Any]:
+    """
+    Run the memory and throughput benchmarks once per dtype.
+
+    The provider is rebuilt for every dtype since the weights must be
+    reloaded; each one is shut down and its memory released before the next.
+    """
+    results = {}
+    monitor = GPUMemoryMonitor(args.device)
+    torch = monitor.torch
+
+    for dtype in dtypes:
+        print_section(f"dtype: {dtype}")
+        provider = build_provider(args, dtype)
+        try:
+            await warmup(provider, monitor, max(MEMORY_BATCH_SIZES + [args.batch_size]))
+            memory = await MemoryBenchmark(provider, monitor).run(
+                batch_sizes=MEMORY_BATCH_SIZES, text_length=args.text_length
+            )
+            throughput = await ThroughputBenchmark(provider).run(
+                batch_sizes=[1000], text_length=args.text_length
+            )
+        finally:
+            await provider.shutdown()
+            del provider
+            torch.cuda.empty_cache()
+
+        within_target = [bs for bs, r in memory.items() if r["peak_gb"] < 11.0]
+        results[dtype] = {
+            "peak_gb": max(r["peak_gb"] for r in memory.values()),
+            "throughput_texts_per_sec": throughput[1000]["throughput_texts_per_sec"],
+            "max_batch_under_target": max(within_target, default=None),
+        }
+
+    return results
+
+
 async def run_benchmarks(args):
     """Run selected benchmarks."""
     print_header("Local Embedding Service Performance Benchmark")
@@ -498,6 +869,18 @@ async def run_benchmarks(args):
     print(f"  Device: {args.device}")
     print(f"  Model: {args.model}")
     print(f"  Mode: {args.mode}")
+    print(f"  Dtype: {args.dtype_sweep or args.dtype}")
+    print(f"  Dedup: {args.dedup}")
+    print(f"  Max batch tokens: {args.max_batch_tokens}")
+
+    if args.dtype_sweep:
+        dtypes = [d.strip() for d in args.dtype_sweep.split(",") if d.strip()]
+        unknown = sorted(set(dtypes) - set(SWEEP_DTYPES))
+        if unknown:
+            raise ValueError(f"Unsupported dtype(s) in --dtype-sweep: {unknown}")
+        results = {"dtype_sweep": await run_dtype_sweep(args, dtypes)}
+        print_summary(results, args.mode)
+        return results
 
     # Initialize provider for non-e2e tests
     provider = None
@@ -506,49 +889,52 @@ async def run_benchmarks(args):
     if args.mode != "e2e":
         print("\nInitializing embedding provider...")
 
-        from backend.config import ModelConfig, ModelType, ProviderType
-        from backend.providers.local_embedding import LocalEmbeddingProvider
-
-        embedding_config = ModelConfig(
-            provider=ProviderType.LOCAL_GPU,
-            model_name=args.model,
-            model_type=ModelType.EMBEDDING,
-            embedding_dim=2560,
-            extra_params={
-                "device": args.device,
-                "dtype": "float16",
-                "attn_implementation": "sdpa",
-                "max_batch_size": args.batch_size,
-                "max_wait_time": args.max_wait_time,
-                "encode_batch_size": args.encode_batch_size,
-            },
-        )
-
-        provider = LocalEmbeddingProvider(embedding_config)
+        provider = build_provider(args, args.dtype)
         monitor = GPUMemoryMonitor(args.device)
 
         print("  ✓ Provider initialized")
 
+        print("\nWarming up...")
+        await warmup(provider, monitor, max(MEMORY_BATCH_SIZES + [args.batch_size]))
+        print("  ✓ Warmup complete")
+
+    # Throughput/latency optionally go through the dedup cache; memory always
+    # hits the model so its peak reflects a real forward pass.
+    bench_provider = provider
+    if provider is not None and args.dedup:
+        bench_provider = CachedProvider(provider)
+
     # Run selected tests
     results = {}
 
     try:
         if args.mode in ["throughput", "all"]:
-            benchmark = ThroughputBenchmark(provider)
+            benchmark = ThroughputBenchmark(bench_provider)
             results["throughput"] = await benchmark.run(
-                batch_sizes=[100, 500, 1000], text_length="medium"
+                batch_sizes=[100, 500, 1000],
+                text_length=args.text_length,
+                bucket_by_length=args.bucket_by_length,
+                max_in_flight=args.max_in_flight,
             )
+            if args.duration_s:
+                results["sustained"] = await benchmark.run_sustained(
+                    duration_s=args.duration_s,
+                    arrival_rate=args.arrival_rate,
+                    text_length=args.text_length,
+                )
 
         if args.mode in ["latency", "all"]:
-            benchmark = LatencyBenchmark(provider)
+            benchmark = LatencyBenchmark(bench_provider)
             results["latency"] = await benchmark.run(
-                num_requests=100, text_length="medium"
+                num_requests=args.latency_requests,
+                text_length=args.text_length,
+                concurrency=args.concurrency,
             )
 
         if args.mode in ["memory", "all"]:
             benchmark = MemoryBenchmark(provider, monitor)
             results["memory"] = await benchmark.run(
-                batch_sizes=[32, 64, 128], text_length="medium"
+                batch_sizes=MEMORY_BATCH_SIZES, text_length=args.text_length
             )
 
         if args.mode in ["e2e", "all"]:
@@ -581,9 +967,19 @@ def print_summary(results: Dict[str, Any], mode: str):
             throughput = result["throughput_texts_per_sec"]
             status = "✓" if throughput >= 100 else "✗"
             print(f"  {status} {batch_size} texts: {throughput:.1f} texts/sec")
+            if "bucketed_throughput_texts_per_sec" in result:
+                bucketed = result["bucketed_throughput_texts_per_sec"]
+                print(f"      bucketed by length: {bucketed:.1f} texts/sec")
             if throughput < 100:
                 all_passed = False
 
+    if "sustained" in results:
+        sustained = results["sustained"]
+        print(
+            f"  Sustained ({sustained['arrival_rate']:.1f} req/s): "
+            f"{sustained['steady_throughput_texts_per_sec']:.1f} texts/sec steady-state"
+        )
+
     # Latency summary
     if "latency" in results:
         print("\nLatency Test:")
@@ -603,6 +999,21 @@ def print_summary(results: Dict[str, Any], mode: str):
             if peak_gb >= 11.0:
                 all_passed = False
 
+    # Dtype sweep summary
+    if "dtype_sweep" in results:
+        print("Dtype Sweep:")
+        print(f"  {'dtype':<10} {'peak GB':>8} {'texts/sec':>10} {'max batch < 11GB':>17}")
+        for dtype, result in results["dtype_sweep"].items():
+            peak_gb = result["peak_gb"]
+            max_batch = result["max_batch_under_target"]
+            print(
+                f"  {dtype:<10} {peak_gb:>8.2f} "
+                f"{result['throughput_texts_per_sec']:>10.1f} "
+                f"{max_batch if max_batch is not None else '-':>17}"
+            )
+            if peak_gb >= 11.0:
+                all_passed = False
+
     # E2E summary
     if "e2e" in results:
         print("\nEnd-to-End Test:")
@@ -640,6 +1051,20 @@ def main():
         default="Qwen/Qwen3-Embedding-4B",
         help="Model name (default: Qwen/Qwen3-Embedding-4B)",
     )
+    parser.add_argument(
+        "--dtype",
+        choices=SWEEP_DTYPES,
+        default="float16",
+        help="Model precision (default: float16; int8 requires bitsandbytes)",
+    )
+    parser.add_argument(
+        "--dtype-sweep",
+        default=None,
+        help=(
+            "Comma-separated dtypes (e.g. float16,bfloat16,int8) to compare; "
+            "runs the memory and throughput benchmarks once per dtype"
+        ),
+    )
     parser.add_argument(
         "--batch-size",
         type=int,
@@ -652,12 +1077,73 @@ def main():
         default=128,
         help="Internal encode() batch size for sentence-transformers (default: 128)",
     )
+    parser.add_argument(
+        "--max-batch-tokens",
+        type=int,
+        default=None,
+        help="Token budget per dynamic batch; unset batches by request count only",
+    )
     parser.add_argument(
         "--max-wait-time",
         type=float,
         default=0.1,
         help="Max wait time (seconds) for dynamic batching (default: 0.1)",
     )
+    parser.add_argument(
+        "--latency-requests",
+        type=int,
+        default=100,
+        help="Number of requests in the latency benchmark (default: 100)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="In-flight requests during the latency benchmark (default: 1)",
+    )
+    parser.add_argument(
+        "--text-length",
+        choices=["short", "medium", "long", "mixed"],
+        default="medium",
+        help="Test text pool for throughput/latency/memory (default: medium)",
+    )
+    parser.add_argument(
+        "--bucket-by-length",
+        action="store_true",
+        help=(
+            "Also report throughput with requests sorted by text length "
+            "(needs --text-length mixed to have lengths to sort)"
+        ),
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="Cap on pending requests in the throughput test (default: no cap)",
+    )
+    parser.add_argument(
+        "--duration-s",
+        type=float,
+        default=0.0,
+        help="Also run a sustained Poisson-arrival throughput test for this long",
+    )
+    parser.add_argument(
+        "--arrival-rate",
+        type=float,
+        default=100.0,
+        help="Mean request arrival rate (req/s) for --duration-s (default: 100)",
+    )
+    parser.add_argument(
+        "--cuda-events",
+        action="store_true",
+        help="Time encode() with CUDA events and report device-side throughput",
+    )
+    parser.add_argument(
+        "--dedup",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Memoize embeddings by text in throughput/latency tests (default: off)",
+    )
 
     args = parser.parse_args()
 
@@ -4,13 +4,46 @@ Parser Performance Benchmark Script
 Compares MinerU (CPU/GPU, different backends) vs Docling
 """
 
+import os
 import sys
 import time
 import argparse
+import contextlib
+import gc
+import inspect
+import shutil
+import statistics
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import json
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from raganything.parser import MineruParser, DoclingParser
+
+# Serializes console output from concurrently running device groups
+_print_lock = threading.Lock()
+
+# One parser instance per parser class, shared by every configuration
+_PARSER_CACHE: Dict[type, Any] = {}
+
+# In-memory scratch space for per-run parser output (None: not available)
+_TMPFS_DIR = "/dev/shm" if os.path.ismount("/dev/shm") else None
+
 
 def print_header(title: str):
     """Print formatted header"""
@@ -19,94 +52,439 @@ def print_header(title: str):
     print(f"{'='*80}\n")
 
 
+def _emit(*lines: str):
+    """Print a block of lines atomically with respect to other workers"""
+    with _print_lock:
+        print("\n".join(lines), flush=True)
+
+
+def _parser_class(parser_name: str) -> type:
+    """Parser class used for a benchmark configuration name"""
+    return DoclingParser if "docling" in parser_name.lower() else MineruParser
+
+
+def _get_parser(cls: type) -> Any:
+    """Return the cached parser instance for ``cls``, creating it once"""
+    parser = _PARSER_CACHE.get(cls)
+    if parser is None:
+        parser = _PARSER_CACHE.setdefault(cls, cls())
+    return parser
+
+
+def _accepts_pdf_bytes(parser: Any) -> bool:
+    """Whether ``parser.parse_pdf`` takes the document as in-memory bytes"""
+    return "pdf_bytes" in inspect.signature(parser.parse_pdf).parameters
+
+
+@contextlib.contextmanager
+def _run_output_dir(final_dir: Path, keep: bool) -> Iterator[str]:
+    """
+    Output directory for one timed run
+
+    On tmpfs every run writes to a fresh in-memory directory, so disk and
+    page-cache state cannot differ between repetitions; the run marked
+    ``keep`` is copied to ``final_dir`` afterwards, outside the timing.
+    Without tmpfs, runs write to ``final_dir`` directly.
+    """
+    if _TMPFS_DIR is None:
+        yield str(final_dir)
+        return
+    with tempfile.TemporaryDirectory(dir=_TMPFS_DIR) as run_dir:
+        yield run_dir
+        if keep:
+            shutil.copytree(run_dir, final_dir, dirs_exist_ok=True)
+
+
 def benchmark_parser(
-    parser_name: str, file_path: str, output_dir: str, **kwargs
+    parser_name: str,
+    file_path: str,
+    output_dir: str,
+    repeats: int = 3,
+    pdf_bytes: Optional[bytes] = None,
+    profile_memory: bool = False,
+    **kwargs,
 ) -> Dict[str, Any]:
     """
     Benchmark a parser configuration
 
+    The parse is repeated ``repeats`` times and timed with
+    ``time.perf_counter_ns``; median, p95 and min are reported so a single
+    noisy run does not decide the ranking. When ``pdf_bytes`` is given and
+    the parser accepts a ``pdf_bytes`` argument, every run parses from memory
+    instead of re-reading the file; otherwise the path-based API is used.
+    With ``profile_memory``, the peak RSS of the parser's child processes and,
+    on GPU configs, their peak GPU memory are recorded; the RSS figure is the
+    lifetime high-water mark of this process's children, so it is only
+    per-configuration in a fresh process (``--single-run``).
+
+    MinerU and Docling parse in CLI subprocesses, so no GPU work happens in
+    this process and the runs are not bracketed with CUDA synchronization;
+    doing so would only create a CUDA context competing for the parser's VRAM.
+
     Returns:
         Dict with timing and result information
     """
-    from raganything.parser import MineruParser, DoclingParser
-
-    print(f"\n{'─'*80}")
-    print(f"Testing: {parser_name}")
-    print(f"{'─'*80}")
-
     # Print configuration
-    print("Configuration:")
-    for key, value in kwargs.items():
-        print(f"  {key}: {value}")
+    _emit(
+        f"\n{'─'*80}",
+        f"Testing: {parser_name}",
+        f"{'─'*80}",
+        "Configuration:",
+        *(f"  {key}: {value}" for key, value in kwargs.items()),
+    )
 
-    # Select parser
-    if "docling" in parser_name.lower():
-        parser = DoclingParser()
-    else:
-        parser = MineruParser()
+    # Select parser (instances are created once and reused)
+    parser = _get_parser(_parser_class(parser_name))
 
     # Prepare output directory
     test_output_dir = Path(output_dir) / parser_name.replace(" ", "_").replace("/", "_")
     test_output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Parse from memory when the parser supports it, else from the path
+    if pdf_bytes is not None and _accepts_pdf_bytes(parser):
+        source = {"pdf_path": file_path, "pdf_bytes": pdf_bytes}
+    else:
+        source = {"pdf_path": file_path}
+
     # Run benchmark
-    start_time = time.time()
+    times_ns: List[int] = []
+    start_ns = None
     success = False
     error_msg = None
     content_count = 0
+    peak_rss_bytes = peak_gpu_bytes = None
+    gpu_sampler = (
+        _ChildGpuSampler() if profile_memory and _is_gpu_config(kwargs) else None
+    )
 
     try:
-        content_list = parser.parse_pdf(
-            pdf_path=file_path, output_dir=str(test_output_dir), **kwargs
-        )
-        end_time = time.time()
+        if gpu_sampler is not None:
+            gpu_sampler.start()
+
+        runs = max(repeats, 1)
+        for run in range(runs):
+            with _run_output_dir(test_output_dir, keep=run == runs - 1) as run_dir:
+                start_ns = time.perf_counter_ns()
+                content_list = parser.parse_pdf(
+                    **source, output_dir=run_dir, **kwargs
+                )
+                times_ns.append(time.perf_counter_ns() - start_ns)
+                start_ns = None
         success = True
         content_count = len(content_list)
 
     except Exception as e:
-        end_time = time.time()
+        if start_ns is not None:
+            times_ns.append(time.perf_counter_ns() - start_ns)
         error_msg = str(e)
-        print(f"\n❌ Error: {error_msg}")
 
-    elapsed_time = end_time - start_time
+    finally:
+        if gpu_sampler is not None:
+            gpu_sampler.stop()
+            peak_gpu_bytes = gpu_sampler.peak_bytes
+        if profile_memory:
+            peak_rss_bytes = _child_peak_rss_bytes()
+
+    stats = _timing_stats(times_ns)
 
     # Print results
     if success:
-        print("\n✅ Success")
-        print(f"   Time: {elapsed_time:.2f}s")
-        print(f"   Content blocks: {content_count}")
+        _emit(
+            f"\n✅ Success: {parser_name}",
+            f"   Time: {stats['time_median_s']:.2f}s median, "
+            f"{stats['time_p95_s']:.2f}s p95, {stats['time_min_s']:.2f}s min "
+            f"({len(times_ns)} runs)",
+            f"   Content blocks: {content_count}",
+            *_memory_lines(peak_rss_bytes, peak_gpu_bytes),
+        )
+    else:
+        _emit(
+            f"\n❌ Failed: {parser_name}",
+            f"   Error: {error_msg}",
+            f"   Time: {stats['time_median_s']:.2f}s",
+        )
+
+    return {
+        "parser": parser_name,
+        "success": success,
+        **stats,
+        "peak_rss_bytes": peak_rss_bytes,
+        "peak_gpu_bytes": peak_gpu_bytes,
+        "content_count": content_count,
+        "error": error_msg,
+        "config": kwargs,
+    }
+
+
+def benchmark_parser_isolated(
+    parser_name: str,
+    file_path: str,
+    output_dir: str,
+    repeats: int = 3,
+    timeout: float = 1800.0,
+    profile_memory: bool = False,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Benchmark a parser configuration with one fresh process per timed run
+
+    Each repetition re-invokes this script in ``--single-run`` mode, so CUDA
+    allocator state and parser-side caches cannot carry over from earlier
+    runs. The interpreter startup of each child is reported separately as
+    ``startup_median_s``.
+    """
+    _emit(f"\n🧪 Isolated runs: {parser_name} ({max(repeats, 1)} processes)")
+
+    times_ns: List[int] = []
+    startup_ns: List[int] = []
+    peaks: Dict[str, Optional[int]] = {"peak_rss_bytes": None, "peak_gpu_bytes": None}
+    content_count = 0
+    error_msg = None
+
+    for _ in range(max(repeats, 1)):
+        config = {
+            "name": parser_name,
+            "file": file_path,
+            "output_dir": output_dir,
+            "kwargs": kwargs,
+            "profile_memory": profile_memory,
+            "launched_at_ns": time.time_ns(),
+        }
+        try:
+            proc = subprocess.run(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "--single-run",
+                    json.dumps(config),
+                ],
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            error_msg = f"Run timed out after {timeout:.0f}s"
+            break
+        if proc.returncode != 0:
+            error_msg = proc.stderr.strip()[-500:] or f"exit code {proc.returncode}"
+            break
+
+        result = json.loads(proc.stdout)
+        times_ns.extend(result["times_ns"])
+        startup_ns.append(result["startup_ns"])
+        for key, peak in peaks.items():
+            if result[key] is not None:
+                peaks[key] = max(peak or 0, result[key])
+        if not result["success"]:
+            error_msg = result["error"]
+            break
+        content_count = result["content_count"]
+
+    success = error_msg is None
+    stats = _timing_stats(times_ns)
+    startup_median_s = statistics.median(startup_ns) / 1e9 if startup_ns else 0.0
+
+    if success:
+        _emit(
+            f"\n✅ Success: {parser_name}",
+            f"   Time: {stats['time_median_s']:.2f}s median, "
+            f"{stats['time_p95_s']:.2f}s p95, {stats['time_min_s']:.2f}s min "
+            f"({len(times_ns)} runs)",
+            f"   Process startup: {startup_median_s:.2f}s median (not included)",
+            f"   Content blocks: {content_count}",
+            *_memory_lines(peaks["peak_rss_bytes"], peaks["peak_gpu_bytes"]),
+        )
     else:
-        print("\n❌ Failed")
-        print(f"   Time: {elapsed_time:.2f}s")
+        _emit(f"\n❌ Failed: {parser_name}", f"   Error: {error_msg}")
 
     return {
         "parser": parser_name,
         "success": success,
-        "time": elapsed_time,
+        **stats,
+        "startup_median_s": startup_median_s,
+        **peaks,
         "content_count": content_count,
         "error": error_msg,
         "config": kwargs,
     }
 
 
-def run_benchmarks(file_path: str, output_dir: str) -> List[Dict[str, Any]]:
-    """Run all benchmark configurations"""
+def _single_run(config_json: str):
+    """Child side of ``--single-run``: one timed run, JSON result on stdout"""
+    config = json.loads(config_json)
+    startup_ns = time.time_ns() - config["launched_at_ns"]
+
+    # Reason: stdout carries only the JSON result; progress output goes to
+    # stderr so the parent can parse stdout as-is.
+    with contextlib.redirect_stdout(sys.stderr):
+        result = benchmark_parser(
+            parser_name=config["name"],
+            file_path=config["file"],
+            output_dir=config["output_dir"],
+            repeats=1,
+            profile_memory=config["profile_memory"],
+            **config["kwargs"],
+        )
+
+    result["startup_ns"] = startup_ns
+    sys.stdout.write(json.dumps(result))
+    sys.stdout.flush()
+
+
+def _format_bytes(num_bytes: Optional[int]) -> str:
+    """Human-readable MiB, or "-" when not measured"""
+    return "-" if num_bytes is None else f"{num_bytes / (1 << 20):.1f} MiB"
+
+
+def _memory_lines(
+    peak_rss_bytes: Optional[int], peak_gpu_bytes: Optional[int]
+) -> List[str]:
+    """Per-configuration memory report lines (empty when not profiled)"""
+    if peak_rss_bytes is None:
+        return []
+    lines = [f"   Peak parser RSS: {_format_bytes(peak_rss_bytes)}"]
+    if peak_gpu_bytes is not None:
+        lines.append(f"   Peak parser GPU: {_format_bytes(peak_gpu_bytes)}")
+    return lines
+
+
+def _child_peak_rss_bytes() -> Optional[int]:
+    """Largest peak RSS of any waited-for child process, or None if unknown"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _is_descendant(pid: int, ancestor: int) -> bool:
+    """Whether ``pid`` is ``ancestor`` or one of its descendants (Linux /proc)"""
+    while pid > 1:
+        if pid == ancestor:
+            return True
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            return False
+        # The command name may contain spaces; ppid follows it after the state
+        pid = int(stat.rsplit(b")", 1)[1].split()[1])
+    return False
+
+
+class _ChildGpuSampler:
+    """
+    Peak GPU memory used by this process's descendants
+
+    The parsers run their models in CLI subprocesses, so the memory is read
+    from NVML's per-process accounting (nvidia-ml-py) on a background thread
+    rather than from torch in this process. ``peak_bytes`` stays None when
+    NVML is unavailable or never reports one of our descendants.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_bytes: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        try:
+            import pynvml
+        except ImportError:
+            return
+        try:
+            pynvml.nvmlInit()
+        except pynvml.NVMLError:
+            return
+        self._thread = threading.Thread(target=self._run, args=(pynvml,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, pynvml):
+        me = os.getpid()
+        try:
+            handles = [
+                pynvml.nvmlDeviceGetHandleByIndex(i)
+                for i in range(pynvml.nvmlDeviceGetCount())
+            ]
+            while True:
+                used = 0
+                for handle in handles:
+                    for proc in pynvml.nvmlDeviceGetComputeRunningProcesses(handle):
+                        # usedGpuMemory is None where the driver hides it
+                        if proc.usedGpuMemory and _is_descendant(proc.pid, me):
+                            used += proc.usedGpuMemory
+                if used:
+                    self.peak_bytes = max(self.peak_bytes or 0, used)
+                if self._stop.wait(self.interval):
+                    break
+        except pynvml.NVMLError:
+            pass
+        finally:
+            pynvml.nvmlShutdown()
+
+
+def _timing_stats(times_ns: List[int]) -> Dict[str, Any]:
+    """Median / p95 / min (seconds) of per-run nanosecond timings"""
+    if not times_ns:
+        return {
+            "time_median_s": 0.0,
+            "time_p95_s": 0.0,
+            "time_min_s": 0.0,
+            "times_ns": [],
+        }
+    if len(times_ns) > 1:
+        p95_ns = statistics.quantiles(times_ns, n=20, method="inclusive")[18]
+    else:
+        p95_ns = times_ns[0]
+    return {
+        "time_median_s": statistics.median(times_ns) / 1e9,
+        "time_p95_s": p95_ns / 1e9,
+        "time_min_s": min(times_ns) / 1e9,
+        "times_ns": times_ns,
+    }
+
+
+def run_benchmarks(
+    file_path: str,
+    output_dir: str,
+    repeats: int = 3,
+    isolate: bool = False,
+    run_timeout: float = 1800.0,
+    profile_memory: bool = False,
+    parallel_groups: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Run all benchmark configurations (one process per run if ``isolate``)
+
+    ``profile_memory`` implies ``isolate``: the child-process RSS high-water
+    mark is only attributable to one configuration in a fresh process.
+    Configurations run serially unless ``parallel_groups`` is set, in which
+    case the GPU and CPU groups overlap and every result is marked
+    ``concurrent``.
+    """
 
     results = []
+    isolate = isolate or profile_memory
 
-    # Check if GPU is available
-    try:
-        import torch
+    # Read the document once; parsers that accept bytes reuse this buffer, and
+    # path-based parsers at least start from a warm page cache
+    pdf_bytes = Path(file_path).read_bytes()
 
-        has_gpu = torch.cuda.is_available()
-        if has_gpu:
-            gpu_name = torch.cuda.get_device_name(0)
-            print(f"\n🎮 GPU detected: {gpu_name}")
-        else:
-            print("\n💻 No GPU detected, will test CPU only")
-    except ImportError:
-        has_gpu = False
-        print("\n💻 PyTorch not available, will test CPU only")
+    # Check if GPU is available
+    gpu_name = _detect_gpu()
+    has_gpu = gpu_name is not None
+    if has_gpu:
+        print(f"\n🎮 GPU detected: {gpu_name}")
+    else:
+        print("\n💻 No GPU detected, will test CPU only")
 
     # Test configurations
     configs = [
@@ -139,86 +517,248 @@ def run_benchmarks(file_path: str, output_dir: str) -> List[Dict[str, Any]]:
     # Add Docling
     configs.append({"name": "Docling", "method": "auto"})
 
+    # Warmup: construct every parser up front so one-time initialization is
+    # never counted in a configuration's elapsed time (isolated runs construct
+    # their own parser in the child process)
+    if not isolate:
+        for cls in {_parser_class(config["name"]) for config in configs}:
+            _get_parser(cls)
+
     # Run benchmarks
     print_header("Running Benchmarks")
 
-    for config in configs:
-        name = config.pop("name")
-        result = benchmark_parser(
-            parser_name=name, file_path=file_path, output_dir=output_dir, **config
-        )
-        results.append(result)
+    # Reason: the MinerU GPU pipeline is itself CPU-heavy (PDF rendering,
+    # layout pre/post-processing), so GPU and CPU configs contend when they
+    # overlap; serial runs are the default and overlap is opt-in.
+    gpu_queue: List[Tuple[int, Dict[str, Any]]] = []
+    cpu_queue: List[Tuple[int, Dict[str, Any]]] = []
+    if parallel_groups:
+        for index, config in enumerate(configs):
+            if _is_gpu_config(config):
+                gpu_queue.append((index, config))
+            else:
+                cpu_queue.append((index, config))
+    else:
+        cpu_queue = list(enumerate(configs))
+
+    def drain(queue: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict]]:
+        tagged = []
+        previous = None
+        for index, config in queue:
+            if previous is not None:
+                # Cooldown only between consecutive runs in one queue, sized
+                # by what the previous configuration ran on
+                _cooldown(previous)
+            previous = config
+            config = dict(config)
+            name = config.pop("name")
+            if isolate:
+                result = benchmark_parser_isolated(
+                    parser_name=name,
+                    file_path=file_path,
+                    output_dir=output_dir,
+                    repeats=repeats,
+                    timeout=run_timeout,
+                    profile_memory=profile_memory,
+                    **config,
+                )
+                result["concurrent"] = parallel_groups
+                tagged.append((index, result))
+                continue
+            result = benchmark_parser(
+                parser_name=name,
+                file_path=file_path,
+                output_dir=output_dir,
+                repeats=repeats,
+                pdf_bytes=pdf_bytes,
+                profile_memory=profile_memory,
+                **config,
+            )
+            result["concurrent"] = parallel_groups
+            tagged.append((index, result))
+        return tagged
+
+    queues = [queue for queue in (gpu_queue, cpu_queue) if queue]
+    workers = max(len(queues), 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        tagged_results = [item for group in pool.map(drain, queues) for item in group]
 
-        # Small delay between tests
-        time.sleep(2)
+    # Preserve the original configuration order
+    results.extend(result for _, result in sorted(tagged_results, key=lambda t: t[0]))
 
     return results
 
 
-def print_summary(results: List[Dict[str, Any]]):
-    """Print benchmark summary"""
+def _detect_gpu() -> Optional[str]:
+    """
+    Name of the first GPU, or None if there is none
+
+    Queries the driver through NVML (nvidia-ml-py) when installed, which does
+    not import torch or create a CUDA context; falls back to torch otherwise.
+    """
+    try:
+        import pynvml
+    except ImportError:
+        pynvml = None
+
+    if pynvml is not None:
+        try:
+            pynvml.nvmlInit()
+        except pynvml.NVMLError:
+            return None
+        try:
+            if not pynvml.nvmlDeviceGetCount():
+                return None
+            name = pynvml.nvmlDeviceGetName(pynvml.nvmlDeviceGetHandleByIndex(0))
+            # Older nvidia-ml-py releases return bytes
+            return name.decode() if isinstance(name, bytes) else name
+        finally:
+            pynvml.nvmlShutdown()
+
+    torch = _cuda_torch()
+    return torch.cuda.get_device_name(0) if torch is not None else None
+
+
+def _is_gpu_config(config: Dict[str, Any]) -> bool:
+    """Whether a benchmark configuration runs on a CUDA device"""
+    return str(config.get("device", "")).startswith("cuda")
+
+
+def _cuda_torch():
+    """Return the torch module if CUDA is usable, else None"""
+    try:
+        import torch
+    except ImportError:
+        return None
+    return torch if torch.cuda.is_available() else None
+
+
+def _cooldown_seconds(config: Dict[str, Any]) -> float:
+    """
+    Pause after a configuration before the next one in its group
+
+    GPU runs wait for CUDA memory to be released, CPU pipeline runs give the
+    model pool time to be collected, and CPU/API-only parsers need no pause.
+    """
+    if _is_gpu_config(config):
+        return 2.0
+    if config.get("device") == "cpu":
+        return 1.0
+    return 0.0
+
+
+def _cooldown(config: Dict[str, Any]):
+    """Reclaim memory after ``config`` ran, then pause if its device needs it"""
+    delay = _cooldown_seconds(config)
+    if not delay:
+        return
+    # GPU memory lives in the parser's child process and is freed when it
+    # exits; nothing here touches CUDA
+    gc.collect()
+    time.sleep(delay)
+
 
-    print_header("Benchmark Summary")
+def print_summary(results: List[Dict[str, Any]], full_table: bool = True):
+    """Print benchmark summary (ranking table only when ``full_table``)"""
+
+    # Reason: build the whole summary first and write it once, instead of
+    # flushing stdout for every row.
+    lines = [f"\n{'='*80}", "  Benchmark Summary", f"{'='*80}\n"]
 
     # Sort by time (successful ones first)
     successful = [r for r in results if r["success"]]
     failed = [r for r in results if not r["success"]]
 
-    successful.sort(key=lambda x: x["time"])
-
-    if successful:
-        print("Successful Tests (sorted by speed):\n")
-        print(f"{'Rank':<6} {'Parser':<30} {'Time':<12} {'Blocks':<10} {'Speed':<15}")
-        print("─" * 80)
+    if successful and full_table:
+        successful.sort(key=lambda x: x["time_median_s"])
+        # Memory columns only when the run was profiled (--profile-memory)
+        profiled = any(r.get("peak_rss_bytes") is not None for r in successful)
+        header = (
+            f"{'Rank':<6} {'Parser':<30} {'Median':<12} {'p95':<12} "
+            f"{'Blocks':<10} {'Speed':<15}"
+        )
+        if profiled:
+            header += f" {'Peak RSS':<14} {'Peak GPU':<14}"
+        lines.append("Successful Tests (sorted by speed):\n")
+        lines.append(header)
+        lines.append("─" * max(92, len(header)))
 
-        fastest_time = successful[0]["time"]
+        fastest_time = successful[0]["time_median_s"]
 
         for i, result in enumerate(successful, 1):
-            speedup = fastest_time / result["time"]
-            speedup_str = f"{speedup:.2f}x" if i > 1 else "baseline"
-
-            print(
-                f"{i:<6} {result['parser']:<30} {result['time']:>8.2f}s   "
+            speedup_str = (
+                f"{fastest_time / result['time_median_s']:.2f}x"
+                if i > 1
+                else "baseline"
+            )
+            row = (
+                f"{i:<6} {result['parser']:<30} {result['time_median_s']:>8.2f}s   "
+                f"{result['time_p95_s']:>8.2f}s   "
                 f"{result['content_count']:>6}     {speedup_str:<15}"
             )
+            if profiled:
+                row += (
+                    f" {_format_bytes(result.get('peak_rss_bytes')):<14}"
+                    f" {_format_bytes(result.get('peak_gpu_bytes')):<14}"
+                )
+            lines.append(row)
+
+    if any(r.get("concurrent") for r in results):
+        lines.append(
+            "\n⚠️  Timings were taken with GPU and CPU configurations running "
+            "concurrently (--parallel-groups); they include contention."
+        )
 
     if failed:
-        print("\n\nFailed Tests:\n")
+        lines.append("\n\nFailed Tests:\n")
         for result in failed:
-            print(f"❌ {result['parser']}")
-            print(f"   Error: {result['error'][:100]}...")
+            lines.append(f"❌ {result['parser']}")
+            lines.append(f"   Error: {result['error'][:100]}...")
 
     # Recommendations
-    print("\n\nRecommendations:\n")
+    lines.append("\n\nRecommendations:\n")
 
     if successful:
-        best = successful[0]
-        print(f"✅ Fastest configuration: {best['parser']}")
-        print(f"   Time: {best['time']:.2f}s")
-        print(f"   Content blocks: {best['content_count']}")
-
-        # Check if GPU helped
-        gpu_results = [r for r in successful if "GPU" in r["parser"]]
-        cpu_results = [r for r in successful if "CPU" in r["parser"]]
-
-        if gpu_results and cpu_results:
-            gpu_time = min(r["time"] for r in gpu_results)
-            cpu_time = min(r["time"] for r in cpu_results)
+        best = min(successful, key=lambda x: x["time_median_s"])
+        lines.append(f"✅ Fastest configuration: {best['parser']}")
+        lines.append(f"   Time: {best['time_median_s']:.2f}s (median)")
+        lines.append(f"   Content blocks: {best['content_count']}")
+
+        # Check if GPU helped (fastest GPU and CPU runs in one pass)
+        gpu_time = cpu_time = float("inf")
+        for r in successful:
+            if "GPU" in r["parser"]:
+                gpu_time = min(gpu_time, r["time_median_s"])
+            elif "CPU" in r["parser"]:
+                cpu_time = min(cpu_time, r["time_median_s"])
+
+        if gpu_time != float("inf") and cpu_time != float("inf"):
             speedup = cpu_time / gpu_time
 
-            print(f"\n   GPU Speedup: {speedup:.2f}x faster than CPU")
+            lines.append(f"\n   GPU Speedup: {speedup:.2f}x faster than CPU")
 
             if speedup < 1.5:
-                print("   ⚠️  GPU speedup is minimal (<1.5x)")
-                print("      This may indicate:")
-                print("      - GPU architecture limitations (Pascal vs Volta)")
-                print("      - Small document size (GPU overhead dominates)")
-                print("      - CPU-bound operations in the pipeline")
+                lines.extend(
+                    [
+                        "   ⚠️  GPU speedup is minimal (<1.5x)",
+                        "      This may indicate:",
+                        "      - GPU architecture limitations (Pascal vs Volta)",
+                        "      - Small document size (GPU overhead dominates)",
+                        "      - CPU-bound operations in the pipeline",
+                    ]
+                )
     else:
-        print("❌ All tests failed. Please check:")
-        print("   1. MinerU/Docling installation")
-        print("   2. Model files availability")
-        print("   3. CUDA/GPU configuration")
+        lines.extend(
+            [
+                "❌ All tests failed. Please check:",
+                "   1. MinerU/Docling installation",
+                "   2. Model files availability",
+                "   3. CUDA/GPU configuration",
+            ]
+        )
+
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def save_results(results: List[Dict[str, Any]], output_file: str):
@@ -226,8 +766,15 @@ def save_results(results: List[Dict[str, Any]], output_file: str):
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w") as f:
-        json.dump(results, f, indent=2)
+    if ORJSON_AVAILABLE:
+        output_path.write_bytes(
+            orjson.dumps(
+                results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            )
+        )
+    else:
+        with open(output_path, "w") as f:
+            json.dump(results, f, indent=2)
 
     print(f"\n📊 Results saved to: {output_path}")
 
@@ -235,7 +782,7 @@ def save_results(results: List[Dict[str, Any]], output_file: str):
 def main():
     """Main benchmark function"""
     parser = argparse.ArgumentParser(description="Benchmark MinerU and Docling parsers")
-    parser.add_argument("file", help="PDF file to test")
+    parser.add_argument("file", nargs="?", help="PDF file to test")
     parser.add_argument(
         "--output-dir",
         "-o",
@@ -249,8 +796,61 @@ def main():
         help="JSON file to save benchmark results",
     )
 
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Timed runs per configuration (default: 3)",
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Single timed run per configuration (overrides --repeats)",
+    )
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run every timed repetition in a fresh Python process",
+    )
+    parser.add_argument(
+        "--run-timeout",
+        type=float,
+        default=1800.0,
+        help="Per-process timeout in seconds for --isolate (default: 1800)",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help=(
+            "Record the parser subprocesses' peak RSS and, via NVML, peak GPU "
+            "memory per run (implies --isolate)"
+        ),
+    )
+    parser.add_argument(
+        "--parallel-groups",
+        action="store_true",
+        help=(
+            "Run GPU and CPU configurations concurrently (faster, but the "
+            "timings include contention between the groups)"
+        ),
+    )
+    parser.add_argument("--single-run", metavar="CONFIG_JSON", help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--no-table",
+        dest="full_table",
+        action="store_false",
+        help="Skip the ranked results table and only print recommendations",
+    )
+
     args = parser.parse_args()
 
+    if args.single_run:
+        _single_run(args.single_run)
+        return
+
+    if args.file is None:
+        parser.error("the following arguments are required: file")
+
     # Check file exists
     if not Path(args.file).exists():
         print(f"❌ Error: File not found: {args.file}")
@@ -263,10 +863,18 @@ def main():
     print(f"Output directory: {args.output_dir}")
 
     # Run benchmarks
-    results = run_benchmarks(args.file, args.output_dir)
+    results = run_benchmarks(
+        args.file,
+        args.output_dir,
+        repeats=1 if args.quick else args.repeats,
+        isolate=args.isolate,
+        run_timeout=args.run_timeout,
+        profile_memory=args.profile_memory,
+        parallel_groups=args.parallel_groups,
+    )
 
     # Print summary
-    print_summary(results)
+    print_summary(results, full_table=args.full_table)
 
     # Save results
     save_results(results, args.results_file)
@@ -5,7 +5,23 @@ Checks GPU availability, CUDA compatibility, and parser configurations
 """
 
 import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
+
+# Version probes run concurrently; checks then await them in report order, so
+# the wall time is the slowest probe instead of the sum of all of them
+PROBE_COMMANDS = (
+    ["nvidia-smi"],
+    ["nvcc", "--version"],
+    ["mineru", "--version"],
+    ["docling", "--version"],
+)
+_probe_pool = ThreadPoolExecutor(
+    max_workers=len(PROBE_COMMANDS), thread_name_prefix="probe"
+)
+_probes: dict[tuple, Future] = {}
 
 
 def print_section(title: str):
@@ -15,21 +31,52 @@ def print_section(title: str):
     print(f"{'='*70}\n")
 
 
-def run_command(cmd: list, description: str) -> tuple[bool, str]:
+def _run(cmd: list, timeout: float) -> tuple[bool, str]:
     """Run a command and return success status and output"""
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
         return result.returncode == 0, result.stdout + result.stderr
     except Exception as e:
         return False, str(e)
 
 
+def run_command(cmd: list, description: str, timeout: float = 60.0) -> Future:
+    """
+    Start a command in the background and return a Future of (success, output)
+
+    Each distinct command runs once; later calls share the same Future.
+    """
+    key = tuple(cmd)
+    future = _probes.get(key)
+    if future is None:
+        future = _probe_pool.submit(_run, cmd, timeout)
+        _probes[key] = future
+    return future
+
+
+@lru_cache(maxsize=1)
+def cuda_device_properties() -> Optional[list]:
+    """
+    Properties of every visible CUDA device, or None without CUDA
+
+    Cached so the report and the recommendations share one CUDA initialization.
+    Raises ImportError when PyTorch is not installed.
+    """
+    import torch
+
+    if not torch.cuda.is_available():
+        return None
+    return [
+        torch.cuda.get_device_properties(i) for i in range(torch.cuda.device_count())
+    ]
+
+
 def check_nvidia_gpu():
     """Check NVIDIA GPU availability and details"""
     print_section("1. NVIDIA GPU Detection")
 
     # Check nvidia-smi
-    success, output = run_command(["nvidia-smi"], "nvidia-smi")
+    success, output = run_command(["nvidia-smi"], "nvidia-smi").result()
     if success:
         print("✅ NVIDIA GPU detected")
         print("\nGPU Information:")
@@ -57,7 +104,7 @@ def check_cuda():
     print_section("2. CUDA Installation")
 
     # Check nvcc
-    success, output = run_command(["nvcc", "--version"], "nvcc")
+    success, output = run_command(["nvcc", "--version"], "nvcc").result()
     if success:
         print("✅ CUDA Toolkit installed")
         for line in output.split("\n"):
@@ -72,15 +119,15 @@ def check_cuda():
     try:
         import torch
 
+        devices = cuda_device_properties()
         print(f"   PyTorch version: {torch.__version__}")
-        print(f"   CUDA available: {torch.cuda.is_available()}")
+        print(f"   CUDA available: {devices is not None}")
 
-        if torch.cuda.is_available():
+        if devices is not None:
             print(f"   CUDA version (PyTorch): {torch.version.cuda}")
-            print(f"   Number of GPUs: {torch.cuda.device_count()}")
+            print(f"   Number of GPUs: {len(devices)}")
 
-            for i in range(torch.cuda.device_count()):
-                props = torch.cuda.get_device_properties(i)
+            for i, props in enumerate(devices):
                 print(f"\n   GPU {i}: {props.name}")
                 print(f"      Compute Capability: {props.major}.{props.minor}")
                 print(f"      Total Memory: {props.total_memory / 1024**3:.2f} GB")
@@ -129,7 +176,7 @@ def check_mineru_installation():
     print_section("3. MinerU Installation")
 
     # Check mineru command
-    success, output = run_command(["mineru", "--version"], "mineru")
+    success, output = run_command(["mineru", "--version"], "mineru").result()
     if success:
         print("✅ MinerU installed")
         print(f"   Version: {output.strip()}")
@@ -178,7 +225,7 @@ def check_docling_installation():
     print_section("4. Docling Installation")
 
     # Check docling command
-    success, output = run_command(["docling", "--version"], "docling")
+    success, output = run_command(["docling", "--version"], "docling").result()
     if success:
         print("✅ Docling installed")
         print(f"   Version: {output.strip()}")
@@ -236,7 +283,8 @@ def test_mineru_gpu():
         "cuda:0",
     ]
 
-    success, output = run_command(cmd, "MinerU pipeline test")
+    # A full parse takes far longer than a version probe
+    success, output = run_command(cmd, "MinerU pipeline test", timeout=600).result()
     if success:
         print("   ✅ Pipeline backend test successful")
     else:
@@ -257,11 +305,10 @@ def print_recommendations():
     print_section("6. Recommendations")
 
     try:
-        import torch
+        devices = cuda_device_properties()
 
-        if torch.cuda.is_available():
-            props = torch.cuda.get_device_properties(0)
-            cc_major = props.major
+        if devices:
+            cc_major = devices[0].major
 
             if cc_major < 7:
                 print("⚠️  Your GPU has compute capability < 7.0 (pre-Volta)")
@@ -310,6 +357,10 @@ def main():
     print("  MinerU & Docling GPU Diagnostic Tool")
     print("=" * 70)
 
+    # Start the slow version probes together; each check awaits its own
+    for cmd in PROBE_COMMANDS:
+        run_command(cmd, cmd[0])
+
     # Run all checks
     gpu_ok = check_nvidia_gpu()
     cuda_ok = check_cuda()
@@ -3,7 +3,7 @@
 Download and verify local embedding/reranker models for Task 7.
 
 This script downloads Qwen3-Embedding-4B, Qwen3-Reranker-4B, and optionally
-GME-Qwen2-VL-2B-Instruct models from HuggingFace, verifies FP16 loading,
+GME-Qwen2-VL-2B-Instruct models from HuggingFace, verifies FP16/BF16 loading,
 tests simple inference, and measures GPU memory usage.
 
 Usage:
@@ -16,10 +16,16 @@ Usage:
     # Download without verification (faster)
     python scripts/download_local_models.py --model Qwen/Qwen3-Embedding-4B --no-verify
 
+Faster downloads:
+    pip install hf_transfer
+    With hf_transfer installed, shards are fetched by its Rust backend over
+    parallel connections; --workers controls how many files download at once.
+
 Environment Variables:
     HF_HOME: HuggingFace cache directory (default: ~/.huggingface)
     HF_HUB_CACHE: HuggingFace Hub cache directory (default: $HF_HOME/hub)
     HF_ENDPOINT: HuggingFace mirror endpoint (e.g., https://hf-mirror.com)
+    HF_HUB_ENABLE_HF_TRANSFER: Set to 0 to disable hf_transfer
 """
 
 import argparse
@@ -27,7 +33,17 @@ import json
 import os
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+# huggingface_hub reads HF_HUB_ENABLE_HF_TRANSFER at import time, so decide
+# before it is imported; leaving it set without hf_transfer installed makes
+# every download fail.
+try:
+    import hf_transfer  # noqa: F401
+
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+except ImportError:
+    os.environ.pop("HF_HUB_ENABLE_HF_TRANSFER", None)
 
 # Supported models for Plan B
 SUPPORTED_MODELS = {
@@ -51,6 +67,70 @@ SUPPORTED_MODELS = {
 }
 
 
+# Official Qwen3-Reranker prompt wrapped around each "<Instruct>/<Query>/<Document>" pair
+RERANKER_PREFIX = (
+    "<|im_start|>system\n"
+    "Judge whether the Document meets the requirements based on the Query and the Instruct provided. "
+    'Note that the answer can only be "yes" or "no".'
+    "<|im_end|>\n<|im_start|>user\n"
+)
+RERANKER_SUFFIX = "<|im_end|>\n<|im_start|>assistant\n<think>\n\n</think>\n\n"
+
+
+# Tokenized reranker prompt templates, keyed by model ID
+_RERANKER_TEMPLATES: Dict[str, Tuple[List[int], List[int], int, int]] = {}
+
+
+def _reranker_template(
+    model_id: str, tokenizer
+) -> Tuple[List[int], List[int], int, int]:
+    """
+    Tokenize the constant parts of the reranker prompt once per model.
+
+    Keyed by ``model_id`` rather than the tokenizer object, since every
+    verification loads a fresh tokenizer; no tokenizer is kept alive.
+
+    Returns:
+        (prefix_tokens, suffix_tokens, token_yes_id, token_no_id)
+    """
+    template = _RERANKER_TEMPLATES.get(model_id)
+    if template is None:
+        template = _RERANKER_TEMPLATES[model_id] = _tokenize_reranker_template(
+            tokenizer
+        )
+    return template
+
+
+def _tokenize_reranker_template(tokenizer) -> Tuple[List[int], List[int], int, int]:
+    """Tokenize the reranker prompt prefix/suffix and the yes/no answer IDs."""
+    yes_ids = tokenizer("yes", add_special_tokens=False).input_ids
+    no_ids = tokenizer("no", add_special_tokens=False).input_ids
+    if len(yes_ids) != 1 or len(no_ids) != 1:
+        raise RuntimeError(
+            f'Expected "yes"/"no" to be single tokens, got yes={yes_ids}, no={no_ids}'
+        )
+    prefix_tokens = tokenizer.encode(RERANKER_PREFIX, add_special_tokens=False)
+    suffix_tokens = tokenizer.encode(RERANKER_SUFFIX, add_special_tokens=False)
+    return prefix_tokens, suffix_tokens, yes_ids[0], no_ids[0]
+
+
+def _reranker_inputs(tokenizer, rows: List[List[int]], device: str):
+    """
+    Build model inputs for fully templated reranker rows.
+
+    Several rows are left-padded into one batch (the tokenizer is loaded with
+    padding_side="left", so the last position is every row's next token); a
+    single row needs no padding and is turned into tensors directly.
+    """
+    import torch
+
+    if len(rows) == 1:
+        input_ids = torch.as_tensor(rows, dtype=torch.long, device=device)
+        return {"input_ids": input_ids, "attention_mask": torch.ones_like(input_ids)}
+    batch = tokenizer.pad({"input_ids": rows}, padding=True, return_tensors="pt")
+    return {k: v.to(device) for k, v in batch.items()}
+
+
 def print_section(title: str) -> None:
     """Print a formatted section header."""
     print(f"\n{'=' * 80}")
@@ -105,13 +185,30 @@ def check_cuda_available() -> bool:
         return False
 
 
-def download_model(model_id: str, cache_dir: str) -> Optional[str]:
+def pick_dtype(device: str):
+    """
+    Pick the half-precision dtype for a CUDA device.
+
+    Ampere and newer GPUs (compute capability 8.x+) get bfloat16, which runs
+    as fast as float16 on tensor cores without its overflow range; older
+    GPUs such as Pascal need float16.
+    """
+    import torch
+
+    major, _ = torch.cuda.get_device_capability(device)
+    return torch.bfloat16 if major >= 8 else torch.float16
+
+
+def download_model(
+    model_id: str, cache_dir: str, max_workers: int = 8
+) -> Optional[str]:
     """
     Download a model from HuggingFace using snapshot_download.
 
     Args:
         model_id: HuggingFace model ID (e.g., "Qwen/Qwen3-Embedding-4B")
         cache_dir: Cache directory for downloaded models
+        max_workers: Number of files downloaded concurrently
 
     Returns:
         Path to downloaded model directory, or None if failed
@@ -121,7 +218,15 @@ def download_model(model_id: str, cache_dir: str) -> Optional[str]:
     try:
         from huggingface_hub import snapshot_download
 
-        print(f"Downloading {model_id} to {cache_dir}...")
+        backend = (
+            "hf_transfer"
+            if os.environ.get("HF_HUB_ENABLE_HF_TRANSFER") == "1"
+            else "default"
+        )
+        print(
+            f"Downloading {model_id} to {cache_dir} "
+            f"({max_workers} workers, {backend} backend)..."
+        )
         print("This may take a while depending on your network speed...")
 
         model_path = snapshot_download(
@@ -129,6 +234,8 @@ def download_model(model_id: str, cache_dir: str) -> Optional[str]:
             repo_type="model",
             cache_dir=cache_dir,
             resume_download=True,
+            max_workers=max_workers,
+            etag_timeout=30,
         )
 
         print(f"✓ Model downloaded successfully to: {model_path}")
@@ -155,7 +262,7 @@ def verify_model_loading(
     device: str = "cuda:0",
 ) -> Dict[str, Any]:
     """
-    Verify model can be loaded in FP16 and perform simple inference.
+    Verify model can be loaded in half precision and perform simple inference.
 
     Args:
         model_id: HuggingFace model ID
@@ -188,8 +295,9 @@ def verify_model_loading(
         initial_reserved = torch.cuda.memory_reserved(device) / 1024**3
 
         model_type = model_info["type"]
+        dtype = pick_dtype(device)
         print(f"Model type: {model_type}")
-        print(f"Loading to device: {device}")
+        print(f"Loading to device: {device} ({dtype})")
         print(f"Initial GPU memory: {initial_memory:.2f} GB")
 
         if model_type == "embedding" or model_type == "multimodal":
@@ -201,17 +309,18 @@ def verify_model_loading(
                 model_id,
                 device=device,
                 model_kwargs={
-                    "torch_dtype": torch.float16,
+                    "torch_dtype": dtype,
                     "attn_implementation": "sdpa",  # Pascal-compatible
                 },
             )
 
             # Verify dtype and attention backend if available
             if hasattr(model[0], "auto_model"):
+                model[0].auto_model.eval()
                 actual_dtype = model[0].auto_model.dtype
                 print(f"Model dtype: {actual_dtype}")
-                if actual_dtype != torch.float16:
-                    print(f"⚠ Warning: Expected float16, got {actual_dtype}")
+                if actual_dtype != dtype:
+                    print(f"⚠ Warning: Expected {dtype}, got {actual_dtype}")
                 attn_backend = getattr(
                     getattr(model[0].auto_model, "config", None),
                     "attn_implementation",
@@ -220,19 +329,21 @@ def verify_model_loading(
                 if attn_backend:
                     print(f"Attention backend: {attn_backend}")
 
-            # Test simple inference
+            # Test batched inference; encode() length-sorts a list internally,
+            # so varied lengths are padded per batch rather than per sentence
             print("Testing inference...")
-            test_text = "This is a test sentence for embedding."
-            embedding = model.encode(test_text)
-            if hasattr(embedding, "cpu"):
-                embedding = embedding.cpu().numpy()
-            import numpy as np
-
-            if not isinstance(embedding, np.ndarray):
-                embedding = np.array(embedding)
+            base = "This is a test sentence for embedding."
+            test_texts = [" ".join([base] * (i % 8 + 1)) for i in range(16)]
+            with torch.inference_mode():
+                embeddings = model.encode(
+                    test_texts,
+                    batch_size=16,
+                    convert_to_numpy=True,
+                    show_progress_bar=False,
+                )
 
             expected_dim = model_info.get("embedding_dim")
-            actual_dim = embedding.shape[0]
+            actual_dim = embeddings.shape[1]
             print(f"Embedding dimension: {actual_dim}")
 
             if expected_dim and actual_dim != expected_dim:
@@ -257,19 +368,14 @@ def verify_model_loading(
             if tokenizer.pad_token_id is None:
                 tokenizer.pad_token_id = tokenizer.eos_token_id
 
-            # Resolve yes/no token IDs (must be single tokens)
-            yes_ids = tokenizer("yes", add_special_tokens=False).input_ids
-            no_ids = tokenizer("no", add_special_tokens=False).input_ids
-            if len(yes_ids) != 1 or len(no_ids) != 1:
-                raise RuntimeError(
-                    f'Expected "yes"/"no" to be single tokens, got yes={yes_ids}, no={no_ids}'
-                )
-            token_yes_id = yes_ids[0]
-            token_no_id = no_ids[0]
+            # Prompt template and yes/no token IDs (must be single tokens)
+            prefix_tokens, suffix_tokens, token_yes_id, token_no_id = (
+                _reranker_template(model_id, tokenizer)
+            )
 
             model = AutoModelForCausalLM.from_pretrained(
                 model_id,
-                torch_dtype=torch.float16,
+                torch_dtype=dtype,
                 attn_implementation="sdpa",  # Pascal-compatible
                 trust_remote_code=True,
             ).to(device)
@@ -286,46 +392,42 @@ def verify_model_loading(
             if attn_backend:
                 print(f"Attention backend: {attn_backend}")
 
-            # Test simple inference
+            # Test inference: score every (query, document) pair in one forward
             print("Testing inference...")
             query = "What is the capital of France?"
-            document = "Paris is the capital and largest city of France."
+            documents = [
+                "Paris is the capital and largest city of France.",
+                "The Eiffel Tower is a famous landmark.",
+                "France is a country in Europe.",
+                "The weather is nice today.",
+            ]
 
             instruction = "Given a web search query, retrieve relevant passages that answer the query"
-            pair = (
+            pairs = [
                 f"<Instruct>: {instruction}\n"
                 f"<Query>: {query}\n"
                 f"<Document>: {document}"
-            )
+                for document in documents
+            ]
 
-            prefix = (
-                "<|im_start|>system\n"
-                "Judge whether the Document meets the requirements based on the Query and the Instruct provided. "
-                'Note that the answer can only be "yes" or "no".'
-                "<|im_end|>\n<|im_start|>user\n"
-            )
-            suffix = "<|im_end|>\n<|im_start|>assistant\n<think>\n\n</think>\n\n"
-
-            prefix_tokens = tokenizer.encode(prefix, add_special_tokens=False)
-            suffix_tokens = tokenizer.encode(suffix, add_special_tokens=False)
             max_length = 8192
             max_pair_len = max_length - len(prefix_tokens) - len(suffix_tokens)
             if max_pair_len <= 0:
                 raise RuntimeError("Reranker template too long for max_length=8192")
 
-            enc = tokenizer(
-                [pair],
+            pair_ids = tokenizer(
+                pairs,
                 padding=False,
                 truncation="longest_first",
                 return_attention_mask=False,
+                return_tensors=None,
                 max_length=max_pair_len,
                 add_special_tokens=False,
-            )
-            enc["input_ids"] = [prefix_tokens + enc["input_ids"][0] + suffix_tokens]
-            inputs = tokenizer.pad(enc, padding=True, return_tensors="pt")
-            inputs = {k: v.to(device) for k, v in inputs.items() if hasattr(v, "to")}
+            )["input_ids"]
+            rows = [prefix_tokens + ids + suffix_tokens for ids in pair_ids]
+            inputs = _reranker_inputs(tokenizer, rows, device)
 
-            with torch.no_grad():
+            with torch.inference_mode():
                 outputs = model(**inputs)
                 next_logits = outputs.logits[:, -1, :]
                 yes_logits = next_logits[:, token_yes_id]
@@ -333,10 +435,13 @@ def verify_model_loading(
                 probs_yes = torch.softmax(
                     torch.stack([no_logits, yes_logits], dim=1).float(), dim=1
                 )[:, 1]
-                score = float(probs_yes[0].item())
+                scores = probs_yes.tolist()
 
-            print(f"Reranker score (P(yes)): {score:.4f}")
-            results["test_score"] = score
+            for document, doc_score in zip(documents, scores):
+                print(f"Reranker score (P(yes)): {doc_score:.4f}  {document}")
+            # The first document is the relevant one
+            results["test_score"] = scores[0]
+            results["test_scores"] = scores
 
         else:
             results["error"] = f"Unknown model type: {model_type}"
@@ -403,6 +508,12 @@ def main():
         type=str,
         help="CUDA device to use for verification (e.g., cuda:0). If not specified, uses model's default device.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Files downloaded concurrently per model (default: 8)",
+    )
     parser.add_argument(
         "--no-verify",
         action="store_true",
@@ -445,12 +556,18 @@ def main():
         "models": {},
     }
 
+    # Download models one after another; each download already fetches
+    # --workers files in parallel (or via hf_transfer)
+    model_paths = {
+        model_id: download_model(model_id, env_config["hf_hub_cache"], args.workers)
+        for model_id in models_to_download
+    }
+
+    # Verify one model at a time so GPU memory measurements don't overlap
     for model_id in models_to_download:
         model_info = SUPPORTED_MODELS[model_id]
         device = args.device or model_info["default_device"]
-
-        # Download model
-        model_path = download_model(model_id, env_config["hf_hub_cache"])
+        model_path = model_paths[model_id]
 
         model_report = {
             "model_id": model_id,
@@ -18,6 +18,19 @@ from backend.config import ModelConfig, ProviderType, ModelType, RerankerConfig
 from backend.services.model_factory import ModelFactory
 
 
+def embedding_dtype(device: str = "cuda:0") -> str:
+    """bfloat16 on Ampere+ GPUs (compute capability 8.x), float16 otherwise.
+
+    Relies on LocalEmbeddingProvider upcasting bf16 embeddings to float32
+    before the numpy copy; numpy itself has no bfloat16 type.
+    """
+    import torch
+
+    if torch.cuda.is_available() and torch.cuda.get_device_capability(device)[0] >= 8:
+        return "bfloat16"
+    return "float16"
+
+
 async def example_embedding():
     """Example: Using LocalEmbeddingProvider."""
     print("\n=== Example: Local Embedding ===\n")
@@ -30,7 +43,7 @@ async def example_embedding():
         embedding_dim=2560,
         extra_params={
             "device": "cuda:0",
-            "dtype": "float16",
+            "dtype": embedding_dtype("cuda:0"),
             "attn_implementation": "sdpa",
         },
     )
@@ -114,7 +127,7 @@ async def example_embedding_func():
         embedding_dim=2560,
         extra_params={
             "device": "cuda:0",
-            "dtype": "float16",
+            "dtype": embedding_dtype("cuda:0"),
             "attn_implementation": "sdpa",
             "max_token_size": 8192,
         },